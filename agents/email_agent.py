@@ -3,18 +3,186 @@ Email Agent for Sending Notifications
 Handles email notifications using SMTP
 """
 
+import asyncio
 import smtplib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+from concurrent.futures import Future, ThreadPoolExecutor
+from string import Template
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, List, Any, Optional
+from email.policy import compat32
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
+import aiosmtplib
 from config.config_manager import ConfigManager
+from agents.smtp_pool import SMTPConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# Serialization policy matching what smtplib.send_message puts on the wire
+_SMTP_POLICY = compat32.clone(linesep="\r\n")
 
-@dataclass
+# Maximum number of notifications waiting for a background worker
+_MAX_PENDING_SENDS = 1024
+
+# Identical messages sent within this many seconds are only delivered once
+DEDUP_WINDOW_SECONDS = 60.0
+DEDUP_CACHE_SIZE = 256
+
+# Notification bodies, parsed once at import and filled in per send
+
+_CONTACT_TEXT_TMPL = Template("""
+Hello,
+
+A new contact has been created in your CRM system.
+
+Contact Details:
+- Email: $contact_email
+- Name: $contact_name
+
+This contact was automatically added to your HubSpot CRM.
+
+Best regards,
+AI Agent Workflow System
+""".strip())
+
+_CONTACT_HTML_TMPL = Template("""
+<html>
+<body>
+    <h2>New Contact Created in CRM</h2>
+    <p>Hello,</p>
+    <p>A new contact has been created in your CRM system.</p>
+    
+    <h3>Contact Details:</h3>
+    <ul>
+        <li><strong>Email:</strong> $contact_email</li>
+        <li><strong>Name:</strong> $contact_name</li>
+    </ul>
+    
+    <p>This contact was automatically added to your HubSpot CRM.</p>
+    
+    <p>Best regards,<br>
+    AI Agent Workflow System</p>
+</body>
+</html>
+""".strip())
+
+_DEAL_TEXT_TMPL = Template("""
+Hello,
+
+A new deal has been created in your CRM system.
+
+Deal Details:
+- Deal Name: $deal_name
+- Amount: $amount_text
+- Associated Contact: $contact_email
+
+This deal was automatically added to your HubSpot CRM.
+
+Best regards,
+AI Agent Workflow System
+""".strip())
+
+_DEAL_HTML_TMPL = Template("""
+<html>
+<body>
+    <h2>New Deal Created in CRM</h2>
+    <p>Hello,</p>
+    <p>A new deal has been created in your CRM system.</p>
+    
+    <h3>Deal Details:</h3>
+    <ul>
+        <li><strong>Deal Name:</strong> $deal_name</li>
+        <li><strong>Amount:</strong> $amount_text</li>
+        <li><strong>Associated Contact:</strong> $contact_email</li>
+    </ul>
+    
+    <p>This deal was automatically added to your HubSpot CRM.</p>
+    
+    <p>Best regards,<br>
+    AI Agent Workflow System</p>
+</body>
+</html>
+""".strip())
+
+_WORKFLOW_TEXT_TMPL = Template("""
+Hello,
+
+A workflow has been completed successfully.
+
+Workflow Details:
+- Type: $workflow_type
+$details_text
+
+The workflow was executed by the AI Agent Workflow System.
+
+Best regards,
+AI Agent Workflow System
+""".strip())
+
+_WORKFLOW_HTML_TMPL = Template("""
+<html>
+<body>
+    <h2>Workflow Completed: $workflow_type</h2>
+    <p>Hello,</p>
+    <p>A workflow has been completed successfully.</p>
+    
+    <h3>Workflow Details:</h3>
+    <ul>
+        <li><strong>Type:</strong> $workflow_type</li>
+        $details_html
+    </ul>
+    
+    <p>The workflow was executed by the AI Agent Workflow System.</p>
+    
+    <p>Best regards,<br>
+    AI Agent Workflow System</p>
+</body>
+</html>
+""".strip())
+
+_ERROR_TEXT_TMPL = Template("""
+Hello,
+
+An error has occurred in the AI Agent Workflow System.
+
+Error Details:
+- Message: $error_message
+- Context: $context
+
+Please check the system logs for more details.
+
+Best regards,
+AI Agent Workflow System
+""".strip())
+
+_ERROR_HTML_TMPL = Template("""
+<html>
+<body>
+    <h2>Error in AI Agent Workflow System</h2>
+    <p>Hello,</p>
+    <p>An error has occurred in the AI Agent Workflow System.</p>
+    
+    <h3>Error Details:</h3>
+    <ul>
+        <li><strong>Message:</strong> $error_message</li>
+        <li><strong>Context:</strong> $context</li>
+    </ul>
+    
+    <p>Please check the system logs for more details.</p>
+    
+    <p>Best regards,<br>
+    AI Agent Workflow System</p>
+</body>
+</html>
+""".strip())
+
+
+@dataclass(slots=True, frozen=True)
 class EmailMessage:
     """Represents an email message"""
     to: str
@@ -46,6 +214,139 @@ class EmailAgent:
         
         if self.username.startswith("your-") or self.password.startswith("your-"):
             raise ValueError("Email credentials not configured")
+        
+        # Pooled SMTP connections, reused across sends
+        self.pool = SMTPConnectionPool(
+            self.smtp_server,
+            self.smtp_port,
+            self.username,
+            self.password,
+            size=int(config_manager.get("email.pool_size", 5)),
+            max_messages_per_connection=int(
+                config_manager.get("email.max_messages_per_connection", 100)
+            )
+        )
+        
+        # Optional background delivery: one worker per pooled connection, with a
+        # bounded backlog. Off by default, since a queued send can't report failure
+        background_send = config_manager.get("email.background_send", False)
+        if isinstance(background_send, str):
+            background_send = background_send.lower() not in ("false", "0", "no")
+        self.background_send = bool(background_send)
+        self._executor = ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="email-send")
+        self._backlog = threading.BoundedSemaphore(_MAX_PENDING_SENDS)
+        
+        # Recently sent message digests -> send time, oldest first
+        self.dedup_window = float(config_manager.get("email.dedup_window_seconds", DEDUP_WINDOW_SECONDS))
+        self._recent: "OrderedDict[str, float]" = OrderedDict()
+        self._recent_lock = threading.Lock()
+        
+        # Shared asyncio SMTP connection and its lock, tied to the event loop
+        # they were created on and replaced when a later asyncio.run() starts
+        self._aio_smtp: Optional[aiosmtplib.SMTP] = None
+        self._aio_lock: Optional[asyncio.Lock] = None
+        self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def close(self) -> None:
+        """Wait for queued background sends, then close all pooled SMTP connections"""
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+    
+    async def aclose(self) -> None:
+        """Close the asyncio SMTP connection, if any"""
+        async with self._get_aio_lock():
+            server, self._aio_smtp = self._aio_smtp, None
+            if server is not None and server.is_connected:
+                try:
+                    await server.quit()
+                except aiosmtplib.SMTPException:
+                    server.close()
+    
+    def __del__(self):
+        # __init__ may have raised before the pool was created
+        if getattr(self, "pool", None) is not None:
+            self.close()
+    
+    @staticmethod
+    def _recipients(message: EmailMessage) -> Tuple[str, ...]:
+        """Envelope recipients for a message: To, then Cc, then Bcc, without repeats"""
+        if not message.cc and not message.bcc:
+            return (message.to,)
+        # One envelope lists every recipient, so the message goes out in a single DATA
+        return tuple(dict.fromkeys((message.to, *(message.cc or ()), *(message.bcc or ()))))
+    
+    @staticmethod
+    def _dedup_key(message: EmailMessage) -> str:
+        """Digest identifying a message by its recipients and content"""
+        parts = (
+            "\x1f".join(EmailAgent._recipients(message)),
+            message.subject,
+            message.body,
+            message.html_body or ""
+        )
+        return blake2b("\x1e".join(parts).encode(), digest_size=16).hexdigest()
+    
+    def _claim_send(self, key: str) -> bool:
+        """
+        Record a message as being sent, unless it was sent within the dedup window
+        
+        Args:
+            key: Message digest from _dedup_key
+            
+        Returns:
+            False if an identical message was sent recently, True otherwise
+        """
+        now = time.monotonic()
+        with self._recent_lock:
+            # Entries are in send order, so expired ones are at the front
+            while self._recent:
+                oldest_key, sent_at = next(iter(self._recent.items()))
+                if now - sent_at < self.dedup_window:
+                    break
+                del self._recent[oldest_key]
+            
+            if key in self._recent:
+                return False
+            
+            self._recent[key] = now
+            if len(self._recent) > DEDUP_CACHE_SIZE:
+                self._recent.popitem(last=False)
+            return True
+    
+    def _release_send(self, key: str) -> None:
+        """Forget a claimed message so a failed send can be retried"""
+        with self._recent_lock:
+            self._recent.pop(key, None)
+    
+    def _build_mime(self, message: EmailMessage) -> bytes:
+        """
+        Build and serialize the MIME message for an email
+        
+        The message is flattened once here with CRLF line endings, so it can
+        be handed to ``sendmail`` as-is instead of having ``send_message``
+        copy and re-flatten it on every send.
+        
+        Args:
+            message: EmailMessage object to serialize
+            
+        Returns:
+            The RFC 5322 message as bytes
+        """
+        msg = MIMEMultipart('alternative')
+        msg['From'] = self.username
+        msg['To'] = message.to
+        msg['Subject'] = message.subject
+        
+        if message.cc:
+            msg['Cc'] = ', '.join(message.cc)
+        
+        # Create text and HTML parts
+        msg.attach(MIMEText(message.body, 'plain'))
+        
+        if message.html_body:
+            msg.attach(MIMEText(message.html_body, 'html'))
+        
+        return msg.as_bytes(policy=_SMTP_POLICY)
     
     def send_email(self, message: EmailMessage) -> bool:
         """
@@ -59,105 +360,219 @@ class EmailAgent:
         """
         logger.info(f"Sending email to: {message.to}")
         
+        key = self._dedup_key(message)
+        if self.dedup_window > 0 and not self._claim_send(key):
+            logger.info(f"Skipping duplicate email to: {message.to}")
+            return True
+        
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.username
-            msg['To'] = message.to
-            msg['Subject'] = message.subject
-            
-            if message.cc:
-                msg['Cc'] = ', '.join(message.cc)
-            
-            # Create text and HTML parts
-            text_part = MIMEText(message.body, 'plain')
-            msg.attach(text_part)
+            raw_message = self._build_mime(message)
             
-            if message.html_body:
-                html_part = MIMEText(message.html_body, 'html')
-                msg.attach(html_part)
+            recipients = self._recipients(message)
             
-            # Connect to server and send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                
-                # Prepare recipients
-                recipients = [message.to]
-                if message.cc:
-                    recipients.extend(message.cc)
-                if message.bcc:
-                    recipients.extend(message.bcc)
-                
-                server.send_message(msg, to_addrs=recipients)
+            # Send the pre-serialized message over a pooled connection
+            with self.pool.acquire() as server:
+                server.sendmail(self.username, recipients, raw_message)
             
             logger.info(f"Email sent successfully to: {message.to}")
             return True
             
         except smtplib.SMTPException as e:
             logger.error(f"SMTP error sending email: {e}")
+            self._release_send(key)
             return False
         except Exception as e:
             logger.error(f"Error sending email: {e}")
+            self._release_send(key)
             return False
     
-    def send_contact_created_notification(self, contact_email: str, contact_name: str = None) -> bool:
+    def send_email_background(self, message: EmailMessage) -> "Future[bool]":
         """
-        Send notification when a new contact is created
+        Queue an email to be sent by a background worker
+        
+        Blocks only when the backlog of pending sends is full.
         
         Args:
-            contact_email: Email address of the new contact
-            contact_name: Name of the new contact
+            message: EmailMessage object to send
+            
+        Returns:
+            Future resolving to the send_email result
+        """
+        self._backlog.acquire()
+        try:
+            future = self._executor.submit(self.send_email, message)
+        except BaseException:
+            self._backlog.release()
+            raise
+        future.add_done_callback(lambda _: self._backlog.release())
+        return future
+    
+    def _deliver(self, message: EmailMessage) -> bool:
+        """
+        Send a notification, in the background when enabled
+        
+        Args:
+            message: EmailMessage object to send
+            
+        Returns:
+            The send result; with background delivery, True once the message is
+            queued, whether or not it is later delivered
+        """
+        if not self.background_send:
+            return self.send_email(message)
+        
+        self.send_email_background(message)
+        return True
+    
+    def _get_aio_lock(self) -> asyncio.Lock:
+        """
+        Get the lock guarding the asyncio SMTP connection on the running loop
+        
+        A lock or connection left from another (possibly closed) event loop
+        can't be used on this one, so both are replaced when the loop changes.
+        
+        Returns:
+            The asyncio.Lock for the current event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._aio_loop is not loop:
+            self._aio_loop = loop
+            self._aio_lock = asyncio.Lock()
+            self._aio_smtp = None
+        return self._aio_lock
+    
+    async def _get_aio_smtp(self) -> aiosmtplib.SMTP:
+        """
+        Get the shared asyncio SMTP connection, reconnecting if needed
+        
+        Must be called with the lock from ``_get_aio_lock`` held.
+        
+        Returns:
+            A connected and authenticated aiosmtplib.SMTP client
+        """
+        if self._aio_smtp is None or not self._aio_smtp.is_connected:
+            self._aio_smtp = aiosmtplib.SMTP(
+                hostname=self.smtp_server,
+                port=int(self.smtp_port),
+                username=self.username,
+                password=self.password,
+                start_tls=True
+            )
+            await self._aio_smtp.connect()
+        
+        return self._aio_smtp
+    
+    async def send_email_async(self, message: EmailMessage) -> bool:
+        """
+        Send an email message without blocking the event loop
+        
+        Args:
+            message: EmailMessage object to send
             
         Returns:
             True if email sent successfully, False otherwise
         """
-        subject = "New Contact Created in CRM"
+        logger.info(f"Sending email to: {message.to}")
         
-        body = f"""
-Hello,
-
-A new contact has been created in your CRM system.
-
-Contact Details:
-- Email: {contact_email}
-- Name: {contact_name or 'Not provided'}
-
-This contact was automatically added to your HubSpot CRM.
-
-Best regards,
-AI Agent Workflow System
-        """.strip()
+        key = self._dedup_key(message)
+        if self.dedup_window > 0 and not self._claim_send(key):
+            logger.info(f"Skipping duplicate email to: {message.to}")
+            return True
         
-        html_body = f"""
-<html>
-<body>
-    <h2>New Contact Created in CRM</h2>
-    <p>Hello,</p>
-    <p>A new contact has been created in your CRM system.</p>
+        try:
+            raw_message = self._build_mime(message)
+            
+            recipients = self._recipients(message)
+            
+            # SMTP is a sequential dialog, so sends share the connection in turn
+            async with self._get_aio_lock():
+                try:
+                    server = await self._get_aio_smtp()
+                    await server.sendmail(self.username, recipients, raw_message)
+                except Exception:
+                    # Don't reuse a connection in an unknown state
+                    server, self._aio_smtp = self._aio_smtp, None
+                    if server is not None:
+                        server.close()
+                    raise
+            
+            logger.info(f"Email sent successfully to: {message.to}")
+            return True
+            
+        except aiosmtplib.SMTPException as e:
+            logger.error(f"SMTP error sending email: {e}")
+            self._release_send(key)
+            return False
+        except Exception as e:
+            logger.error(f"Error sending email: {e}")
+            self._release_send(key)
+            return False
     
-    <h3>Contact Details:</h3>
-    <ul>
-        <li><strong>Email:</strong> {contact_email}</li>
-        <li><strong>Name:</strong> {contact_name or 'Not provided'}</li>
-    </ul>
+    async def send_many(self, messages: List[EmailMessage]) -> List[bool]:
+        """
+        Send several email messages over the shared asyncio connection
+        
+        Messages are prepared concurrently, but SMTP is a sequential dialog,
+        so they are transmitted one at a time on the single connection. Use
+        send_email_background for parallel delivery over the pool.
+        
+        Args:
+            messages: EmailMessage objects to send
+            
+        Returns:
+            List of send results, in the same order as ``messages``
+        """
+        return list(await asyncio.gather(
+            *(self.send_email_async(message) for message in messages)
+        ))
     
-    <p>This contact was automatically added to your HubSpot CRM.</p>
+    def _contact_created_message(self, contact_email: str, contact_name: str = None) -> EmailMessage:
+        """Build the notification for a newly created contact"""
+        fields = {
+            "contact_email": contact_email,
+            "contact_name": contact_name or 'Not provided'
+        }
+        
+        return EmailMessage(
+            to=self.username,  # Send to the configured email address
+            subject="New Contact Created in CRM",
+            body=_CONTACT_TEXT_TMPL.substitute(fields),
+            html_body=_CONTACT_HTML_TMPL.substitute(fields)
+        )
     
-    <p>Best regards,<br>
-    AI Agent Workflow System</p>
-</body>
-</html>
-        """.strip()
+    def _deal_created_message(self, deal_name: str, amount: float = None,
+                              contact_email: str = None) -> EmailMessage:
+        """Build the notification for a newly created deal"""
+        fields = {
+            "deal_name": deal_name,
+            "amount_text": f"${amount:,.2f}" if amount else "Not specified",
+            "contact_email": contact_email or 'Not specified'
+        }
         
-        message = EmailMessage(
+        return EmailMessage(
             to=self.username,  # Send to the configured email address
-            subject=subject,
-            body=body,
-            html_body=html_body
+            subject="New Deal Created in CRM",
+            body=_DEAL_TEXT_TMPL.substitute(fields),
+            html_body=_DEAL_HTML_TMPL.substitute(fields)
         )
+    
+    def send_contact_created_notification(self, contact_email: str, contact_name: str = None) -> bool:
+        """
+        Send notification when a new contact is created
         
-        return self.send_email(message)
+        Args:
+            contact_email: Email address of the new contact
+            contact_name: Name of the new contact
+            
+        Returns:
+            True if email sent (or queued, when email.background_send is on), False otherwise
+        """
+        return self._deliver(self._contact_created_message(contact_email, contact_name))
+    
+    async def asend_contact_created_notification(self, contact_email: str,
+                                                 contact_name: str = None) -> bool:
+        """Send the new-contact notification without blocking the event loop"""
+        return await self.send_email_async(self._contact_created_message(contact_email, contact_name))
     
     def send_deal_created_notification(self, deal_name: str, amount: float = None, 
                                      contact_email: str = None) -> bool:
@@ -170,119 +585,45 @@ AI Agent Workflow System
             contact_email: Associated contact email
             
         Returns:
-            True if email sent successfully, False otherwise
+            True if email sent (or queued, when email.background_send is on), False otherwise
         """
-        subject = "New Deal Created in CRM"
-        
-        amount_text = f"${amount:,.2f}" if amount else "Not specified"
-        
-        body = f"""
-Hello,
-
-A new deal has been created in your CRM system.
-
-Deal Details:
-- Deal Name: {deal_name}
-- Amount: {amount_text}
-- Associated Contact: {contact_email or 'Not specified'}
-
-This deal was automatically added to your HubSpot CRM.
-
-Best regards,
-AI Agent Workflow System
-        """.strip()
-        
-        html_body = f"""
-<html>
-<body>
-    <h2>New Deal Created in CRM</h2>
-    <p>Hello,</p>
-    <p>A new deal has been created in your CRM system.</p>
-    
-    <h3>Deal Details:</h3>
-    <ul>
-        <li><strong>Deal Name:</strong> {deal_name}</li>
-        <li><strong>Amount:</strong> {amount_text}</li>
-        <li><strong>Associated Contact:</strong> {contact_email or 'Not specified'}</li>
-    </ul>
+        return self._deliver(self._deal_created_message(deal_name, amount, contact_email))
     
-    <p>This deal was automatically added to your HubSpot CRM.</p>
-    
-    <p>Best regards,<br>
-    AI Agent Workflow System</p>
-</body>
-</html>
-        """.strip()
-        
-        message = EmailMessage(
-            to=self.username,  # Send to the configured email address
-            subject=subject,
-            body=body,
-            html_body=html_body
-        )
-        
-        return self.send_email(message)
+    async def asend_deal_created_notification(self, deal_name: str, amount: float = None,
+                                              contact_email: str = None) -> bool:
+        """Send the new-deal notification without blocking the event loop"""
+        return await self.send_email_async(self._deal_created_message(deal_name, amount, contact_email))
     
     def send_workflow_completion_notification(self, workflow_type: str, 
-                                            details: Dict[str, Any]) -> bool:
+                                            details: Dict[str, Any],
+                                            recipients: Optional[List[str]] = None) -> bool:
         """
         Send notification when a workflow is completed
         
         Args:
             workflow_type: Type of workflow completed
             details: Additional details about the workflow
+            recipients: Extra stakeholders to Bcc on the notification
             
         Returns:
-            True if email sent successfully, False otherwise
+            True if email sent (or queued, when email.background_send is on), False otherwise
         """
-        subject = f"Workflow Completed: {workflow_type}"
-        
-        details_text = "\n".join([f"- {k}: {v}" for k, v in details.items()])
-        
-        body = f"""
-Hello,
-
-A workflow has been completed successfully.
-
-Workflow Details:
-- Type: {workflow_type}
-{details_text}
-
-The workflow was executed by the AI Agent Workflow System.
-
-Best regards,
-AI Agent Workflow System
-        """.strip()
-        
-        html_body = f"""
-<html>
-<body>
-    <h2>Workflow Completed: {workflow_type}</h2>
-    <p>Hello,</p>
-    <p>A workflow has been completed successfully.</p>
-    
-    <h3>Workflow Details:</h3>
-    <ul>
-        <li><strong>Type:</strong> {workflow_type}</li>
-        {''.join([f'<li><strong>{k}:</strong> {v}</li>' for k, v in details.items()])}
-    </ul>
-    
-    <p>The workflow was executed by the AI Agent Workflow System.</p>
-    
-    <p>Best regards,<br>
-    AI Agent Workflow System</p>
-</body>
-</html>
-        """.strip()
+        items = details.items()
+        fields = {
+            "workflow_type": workflow_type,
+            "details_text": "\n".join([f"- {k}: {v}" for k, v in items]),
+            "details_html": "".join([f"<li><strong>{k}:</strong> {v}</li>" for k, v in items])
+        }
         
         message = EmailMessage(
             to=self.username,  # Send to the configured email address
-            subject=subject,
-            body=body,
-            html_body=html_body
+            subject=f"Workflow Completed: {workflow_type}",
+            body=_WORKFLOW_TEXT_TMPL.substitute(fields),
+            html_body=_WORKFLOW_HTML_TMPL.substitute(fields),
+            bcc=list(recipients) if recipients else None
         )
         
-        return self.send_email(message)
+        return self._deliver(message)
     
     def send_error_notification(self, error_message: str, context: str = None) -> bool:
         """
@@ -293,51 +634,18 @@ AI Agent Workflow System
             context: Additional context about the error
             
         Returns:
-            True if email sent successfully, False otherwise
+            True if email sent (or queued, when email.background_send is on), False otherwise
         """
-        subject = "Error in AI Agent Workflow System"
-        
-        body = f"""
-Hello,
-
-An error has occurred in the AI Agent Workflow System.
-
-Error Details:
-- Message: {error_message}
-- Context: {context or 'Not provided'}
-
-Please check the system logs for more details.
-
-Best regards,
-AI Agent Workflow System
-        """.strip()
-        
-        html_body = f"""
-<html>
-<body>
-    <h2>Error in AI Agent Workflow System</h2>
-    <p>Hello,</p>
-    <p>An error has occurred in the AI Agent Workflow System.</p>
-    
-    <h3>Error Details:</h3>
-    <ul>
-        <li><strong>Message:</strong> {error_message}</li>
-        <li><strong>Context:</strong> {context or 'Not provided'}</li>
-    </ul>
-    
-    <p>Please check the system logs for more details.</p>
-    
-    <p>Best regards,<br>
-    AI Agent Workflow System</p>
-</body>
-</html>
-        """.strip()
+        fields = {
+            "error_message": error_message,
+            "context": context or 'Not provided'
+        }
         
         message = EmailMessage(
             to=self.username,  # Send to the configured email address
-            subject=subject,
-            body=body,
-            html_body=html_body
+            subject="Error in AI Agent Workflow System",
+            body=_ERROR_TEXT_TMPL.substitute(fields),
+            html_body=_ERROR_HTML_TMPL.substitute(fields)
         )
         
-        return self.send_email(message)
+        return self._deliver(message)
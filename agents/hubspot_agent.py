@@ -3,16 +3,82 @@ HubSpot Agent for CRM Operations
 Handles contact and deal management in HubSpot
 """
 
+import asyncio
+import orjson
 import requests
+import httpx
 import logging
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from config.config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of inputs HubSpot accepts per batch request
+BATCH_LIMIT = 100
 
-@dataclass
+# Maximum number of contact email -> ID mappings kept in memory
+CONTACT_ID_CACHE_SIZE = 1024
+
+# Maximum number of deal/contact associations remembered as already made
+ASSOCIATION_CACHE_SIZE = 1024
+
+# HubSpot-defined association type for deal -> contact
+DEAL_TO_CONTACT_ASSOCIATION_TYPE_ID = 3
+
+# API paths, relative to the configured base URL
+_CONTACTS_PATH = "/crm/v3/objects/contacts"
+_CONTACT_PATH = _CONTACTS_PATH + "/{}"
+_CONTACTS_SEARCH_PATH = _CONTACTS_PATH + "/search"
+_CONTACTS_BATCH_CREATE_PATH = _CONTACTS_PATH + "/batch/create"
+_CONTACTS_BATCH_UPDATE_PATH = _CONTACTS_PATH + "/batch/update"
+_DEALS_PATH = "/crm/v3/objects/deals"
+_DEAL_PATH = _DEALS_PATH + "/{}"
+_DEALS_BATCH_CREATE_PATH = _DEALS_PATH + "/batch/create"
+_DEALS_BATCH_UPDATE_PATH = _DEALS_PATH + "/batch/update"
+_DEAL_CONTACT_ASSOCIATION_PATH = _DEAL_PATH + "/associations/contacts/{}/deal_to_contact"
+_DEAL_CONTACT_BATCH_ASSOCIATION_PATH = "/crm/v4/associations/deals/contacts/batch/associate/default"
+
+
+class _HubSpotRetry(Retry):
+    """
+    Retry policy for HubSpot calls
+    
+    POSTs create objects, so they are only retried when HubSpot cannot have
+    processed them: on 429, where it rejected the request, and on errors
+    opening the connection, before anything was sent. A read error or a
+    reset after sending may follow a successful create, so it is raised.
+    Other methods are idempotent and are retried on any status in the
+    forcelist and on any error.
+    """
+    
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == "POST" and status_code != 429:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if error is not None and method and method.upper() == "POST" and not self._is_connection_error(error):
+            raise error.with_traceback(_stacktrace)
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+# Shared by the sync session's adapter and the async client's request loop
+_RETRY_POLICY = _HubSpotRetry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(["GET", "PUT", "PATCH", "POST", "DELETE"]),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+
+@dataclass(slots=True, frozen=True)
 class Contact:
     """Represents a HubSpot contact"""
     email: str
@@ -23,7 +89,7 @@ class Contact:
     properties: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Deal:
     """Represents a HubSpot deal"""
     deal_name: str
@@ -32,6 +98,7 @@ class Deal:
     close_date: Optional[str] = None
     contact_email: Optional[str] = None
     properties: Optional[Dict[str, Any]] = None
+    contact_id: Optional[str] = None
 
 
 class HubSpotAgent:
@@ -65,19 +132,108 @@ class HubSpotAgent:
                 "Content-Type": "application/json"
             }
             self.api_key_param = {"hapikey": self.api_key}
+        
+        # Full endpoint URLs, bound once
+        self._url_contacts = self.base_url + _CONTACTS_PATH
+        self._url_contact = self.base_url + _CONTACT_PATH
+        self._url_contacts_search = self.base_url + _CONTACTS_SEARCH_PATH
+        self._url_contacts_batch_create = self.base_url + _CONTACTS_BATCH_CREATE_PATH
+        self._url_contacts_batch_update = self.base_url + _CONTACTS_BATCH_UPDATE_PATH
+        self._url_deals = self.base_url + _DEALS_PATH
+        self._url_deal = self.base_url + _DEAL_PATH
+        self._url_deals_batch_create = self.base_url + _DEALS_BATCH_CREATE_PATH
+        self._url_deals_batch_update = self.base_url + _DEALS_BATCH_UPDATE_PATH
+        self._url_deal_contact_association = self.base_url + _DEAL_CONTACT_ASSOCIATION_PATH
+        self._url_deal_contact_batch_association = self.base_url + _DEAL_CONTACT_BATCH_ASSOCIATION_PATH
+        
+        # Shared session so every call reuses pooled keep-alive connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.session.params = self.api_key_param
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=_RETRY_POLICY
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # LRU memo of contact email -> HubSpot contact ID
+        self._contact_id_cache: "OrderedDict[str, str]" = OrderedDict()
+        
+        # Bounded record of (deal_id, contact_id) pairs already associated
+        self._associations: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        
+        # HTTP/2 client for the async methods, created on first use in each
+        # event loop, since its connections can't be shared across loops
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
     
-    def create_contact(self, contact: Contact) -> Dict[str, Any]:
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections"""
+        self.session.close()
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was opened on this event loop"""
+        client, self._aclient = self._aclient, None
+        if client is not None and self._aclient_loop is asyncio.get_running_loop():
+            await client.aclose()
+    
+    def _get_aclient(self) -> httpx.AsyncClient:
+        """Get the async HTTP/2 client for the running event loop, creating it if needed"""
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient.is_closed or self._aclient_loop is not loop:
+            self._aclient_loop = loop
+            self._aclient = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                params=self.api_key_param,
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+        return self._aclient
+    
+    async def _arequest(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
         """
-        Create a new contact in HubSpot
+        Send a request on the async client, retrying as the sync session does
         
-        Args:
-            contact: Contact object to create
-            
-        Returns:
-            Dict containing the created contact data
+        Statuses are retried per _RETRY_POLICY (so a POST only on 429), waiting
+        for Retry-After when HubSpot sends it and backing off otherwise. A POST
+        is only resent after an error opening the connection.
         """
-        logger.info(f"Creating contact: {contact.email}")
+        client = self._get_aclient()
+        retryable_errors = (httpx.ConnectError, httpx.ConnectTimeout) if method == "POST" else httpx.TransportError
         
+        for attempt in range(_RETRY_POLICY.total + 1):
+            last_attempt = attempt == _RETRY_POLICY.total
+            try:
+                response = await client.request(method, url, **kwargs)
+            except retryable_errors as e:
+                if last_attempt:
+                    raise
+                logger.warning(f"HubSpot {method} {url} failed ({e}), retrying")
+                delay = None
+            else:
+                retry_after = response.headers.get("Retry-After")
+                if last_attempt or not _RETRY_POLICY.is_retry(method, response.status_code, retry_after is not None):
+                    return response
+                logger.warning(f"HubSpot {method} {url} returned {response.status_code}, retrying")
+                delay = None
+                if retry_after is not None:
+                    try:
+                        delay = _RETRY_POLICY.parse_retry_after(retry_after)
+                    except InvalidHeader:
+                        pass
+            
+            if delay is None:
+                delay = min(_RETRY_POLICY.backoff_factor * (2 ** attempt), _RETRY_POLICY.backoff_max)
+            await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _contact_properties(contact: Contact) -> Dict[str, Any]:
+        """Build the HubSpot property dict for a contact"""
         properties = {
             "email": contact.email
         }
@@ -95,14 +251,196 @@ class HubSpotAgent:
         if contact.properties:
             properties.update(contact.properties)
         
+        return properties
+    
+    @staticmethod
+    def _deal_properties(deal: Deal) -> Dict[str, Any]:
+        """Build the HubSpot property dict for a deal"""
+        properties = {
+            "dealname": deal.deal_name
+        }
+        
+        if deal.amount:
+            properties["amount"] = str(deal.amount)
+        if deal.stage:
+            properties["dealstage"] = deal.stage
+        if deal.close_date:
+            properties["closedate"] = deal.close_date
+        
+        # Add any additional properties
+        if deal.properties:
+            properties.update(deal.properties)
+        
+        return properties
+    
+    @staticmethod
+    def _email_search_payload(email: str) -> Dict[str, Any]:
+        """Build the search body for an exact email match"""
+        return {
+            "filterGroups": [{
+                "filters": [{
+                    "propertyName": "email",
+                    "operator": "EQ",
+                    "value": email
+                }]
+            }],
+            "sorts": [],
+            "limit": 1
+        }
+    
+    @staticmethod
+    def _query_search_payload(query: str, properties: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Build the search body for a free-text contact query"""
+        payload = {
+            "query": query,
+            "filterGroups": [],
+            "sorts": [],
+            "limit": 10
+        }
+        
+        # Let HubSpot project the results down to the properties we need
+        if properties:
+            payload["properties"] = properties
+        
+        return payload
+    
+    @staticmethod
+    def _pick_contact_id(contacts: List[Dict[str, Any]], email: str) -> Optional[str]:
+        """Pick the contact whose email matches exactly, or None if none does"""
+        wanted = email.strip().lower()
+        for contact in contacts:
+            # HubSpot returns null for contacts without an email
+            if ((contact.get("properties") or {}).get("email") or "").lower() == wanted:
+                return contact["id"]
+        # A fuzzy search hit is a different contact; never associate or cache it
+        return None
+    
+    def _cache_contact_id(self, email: Optional[str], contact_id: Optional[str]) -> None:
+        """Remember the HubSpot ID for a contact email"""
+        if not email or not contact_id:
+            return
+        
+        key = email.strip().lower()
+        self._contact_id_cache[key] = contact_id
+        self._contact_id_cache.move_to_end(key)
+        if len(self._contact_id_cache) > CONTACT_ID_CACHE_SIZE:
+            self._contact_id_cache.popitem(last=False)
+    
+    def _remember_contact(self, contact: Dict[str, Any]) -> None:
+        """Cache the email -> ID mapping from a HubSpot contact record"""
+        email = (contact.get("properties") or {}).get("email")
+        self._cache_contact_id(email, contact.get("id"))
+    
+    def _forget_contact_id(self, contact_id: str) -> None:
+        """Drop any cached email that maps to the given contact ID"""
+        stale = [email for email, cached_id in self._contact_id_cache.items() if cached_id == contact_id]
+        for email in stale:
+            del self._contact_id_cache[email]
+    
+    def _cached_contact_id(self, email: Optional[str]) -> Optional[str]:
+        """Look up a contact ID in the memo only, without searching HubSpot"""
+        if not email:
+            return None
+        
+        key = email.strip().lower()
+        contact_id = self._contact_id_cache.get(key)
+        if contact_id is not None:
+            self._contact_id_cache.move_to_end(key)
+        return contact_id
+    
+    def _remember_association(self, deal_id: str, contact_id: str) -> None:
+        """Record that a deal and contact are associated"""
+        self._associations[(deal_id, contact_id)] = None
+        if len(self._associations) > ASSOCIATION_CACHE_SIZE:
+            self._associations.popitem(last=False)
+    
+    def _deal_input(self, deal: Deal) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Build the create body for a deal, associating it on create when possible
+        
+        Args:
+            deal: Deal object to create
+            
+        Returns:
+            Tuple of (request body, contact ID associated in that body or None)
+        """
+        payload: Dict[str, Any] = {"properties": self._deal_properties(deal)}
+        
+        contact_id = deal.contact_id or self._cached_contact_id(deal.contact_email)
+        if contact_id:
+            payload["associations"] = [{
+                "to": {"id": contact_id},
+                "types": [{
+                    "associationCategory": "HUBSPOT_DEFINED",
+                    "associationTypeId": DEAL_TO_CONTACT_ASSOCIATION_TYPE_ID
+                }]
+            }]
+        
+        return payload, contact_id
+    
+    def _resolve_contact_id(self, email: str) -> Optional[str]:
+        """
+        Resolve a contact email to its HubSpot ID, searching only on a cache miss
+        
+        Args:
+            email: Contact email address
+            
+        Returns:
+            The contact ID, or None if no contact matches
+        """
+        contact_id = self._cached_contact_id(email)
+        if contact_id is not None:
+            return contact_id
+        
+        # Only the email is needed to confirm the match
+        contacts = self.search_contacts(email, properties=["email"])
+        contact_id = self._pick_contact_id(contacts, email)
+        if contact_id is not None:
+            self._cache_contact_id(email, contact_id)
+        return contact_id
+    
+    def _post_batch(self, url: str, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        POST inputs to a HubSpot batch endpoint in chunks of BATCH_LIMIT
+        
+        Args:
+            url: Batch endpoint URL
+            inputs: Batch inputs, in any number
+            
+        Returns:
+            Combined results from every chunk
+        """
+        results = []
+        
+        for start in range(0, len(inputs), BATCH_LIMIT):
+            response = self.session.post(
+                url,
+                data=orjson.dumps({"inputs": inputs[start:start + BATCH_LIMIT]})
+            )
+            response.raise_for_status()
+            results.extend(orjson.loads(response.content).get("results", []))
+        
+        return results
+    
+    def create_contact(self, contact: Contact) -> Dict[str, Any]:
+        """
+        Create a new contact in HubSpot
+        
+        Args:
+            contact: Contact object to create
+            
+        Returns:
+            Dict containing the created contact data
+        """
+        logger.info(f"Creating contact: {contact.email}")
+        
+        properties = self._contact_properties(contact)
         payload = {"properties": properties}
         
         try:
-            response = requests.post(
-                f"{self.base_url}/crm/v3/objects/contacts",
-                headers=self.headers,
-                params=self.api_key_param,
-                json=payload
+            response = self.session.post(
+                self._url_contacts,
+                data=orjson.dumps(payload)
             )
             
             # If contact already exists (409 conflict), update it instead
@@ -112,14 +450,17 @@ class HubSpotAgent:
                 existing_contact = self.search_contact_by_email(contact.email)
                 if existing_contact:
                     contact_id = existing_contact.get('id')
-                    return self.update_contact(contact_id, properties)
+                    result = self.update_contact(contact_id, properties)
+                    self._cache_contact_id(contact.email, contact_id)
+                    return result
                 else:
                     logger.error(f"Could not find existing contact to update: {contact.email}")
                     raise Exception(f"Contact {contact.email} already exists but could not be found for update")
             
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
+            self._cache_contact_id(contact.email, result.get('id'))
             logger.info(f"Contact created successfully: {result.get('id')}")
             return result
             
@@ -140,14 +481,10 @@ class HubSpotAgent:
         logger.info(f"Getting contact: {contact_id}")
         
         try:
-            response = requests.get(
-                f"{self.base_url}/crm/v3/objects/contacts/{contact_id}",
-                headers=self.headers,
-                params=self.api_key_param
-            )
+            response = self.session.get(self._url_contact.format(contact_id))
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             logger.info(f"Contact retrieved successfully: {result.get('properties', {}).get('email')}")
             return result
             
@@ -167,27 +504,13 @@ class HubSpotAgent:
         """
         try:
             # Search for contact by email
-            search_payload = {
-                "filterGroups": [{
-                    "filters": [{
-                        "propertyName": "email",
-                        "operator": "EQ",
-                        "value": email
-                    }]
-                }],
-                "sorts": [],
-                "limit": 1
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/crm/v3/objects/contacts/search",
-                headers=self.headers,
-                params=self.api_key_param,
-                json=search_payload
+            response = self.session.post(
+                self._url_contacts_search,
+                data=orjson.dumps(self._email_search_payload(email))
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             contacts = result.get("results", [])
             
             if contacts:
@@ -199,36 +522,28 @@ class HubSpotAgent:
             logger.error(f"Error searching for contact by email: {e}")
             return None
     
-    def search_contacts(self, query: str) -> List[Dict[str, Any]]:
+    def search_contacts(self, query: str, properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Search for contacts
         
         Args:
             query: Search query
+            properties: Contact properties to return (HubSpot's defaults if omitted)
             
         Returns:
             List of matching contacts
         """
         logger.info(f"Searching contacts: {query}")
         
-        # HubSpot search endpoint
-        search_payload = {
-            "query": query,
-            "filterGroups": [],
-            "sorts": [],
-            "limit": 10
-        }
-        
         try:
-            response = requests.post(
-                f"{self.base_url}/crm/v3/objects/contacts/search",
-                headers=self.headers,
-                params=self.api_key_param,
-                json=search_payload
+            # HubSpot search endpoint
+            response = self.session.post(
+                self._url_contacts_search,
+                data=orjson.dumps(self._query_search_payload(query, properties))
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             contacts = result.get("results", [])
             logger.info(f"Found {len(contacts)} contacts")
             return contacts
@@ -253,15 +568,19 @@ class HubSpotAgent:
         payload = {"properties": properties}
         
         try:
-            response = requests.patch(
-                f"{self.base_url}/crm/v3/objects/contacts/{contact_id}",
-                headers=self.headers,
-                params=self.api_key_param,
-                json=payload
+            response = self.session.patch(
+                self._url_contact.format(contact_id),
+                data=orjson.dumps(payload)
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
+            
+            # A changed email invalidates whatever we had cached for this contact
+            if "email" in properties:
+                self._forget_contact_id(contact_id)
+                self._cache_contact_id(properties["email"], contact_id)
+            
             logger.info(f"Contact updated successfully: {contact_id}")
             return result
             
@@ -281,37 +600,22 @@ class HubSpotAgent:
         """
         logger.info(f"Creating deal: {deal.deal_name}")
         
-        properties = {
-            "dealname": deal.deal_name
-        }
-        
-        if deal.amount:
-            properties["amount"] = str(deal.amount)
-        if deal.stage:
-            properties["dealstage"] = deal.stage
-        if deal.close_date:
-            properties["closedate"] = deal.close_date
-        
-        # Add any additional properties
-        if deal.properties:
-            properties.update(deal.properties)
-        
-        payload = {"properties": properties}
+        payload, contact_id = self._deal_input(deal)
         
         try:
-            response = requests.post(
-                f"{self.base_url}/crm/v3/objects/deals",
-                headers=self.headers,
-                params=self.api_key_param,
-                json=payload
+            response = self.session.post(
+                self._url_deals,
+                data=orjson.dumps(payload)
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             deal_id = result.get('id')
             
-            # Associate deal with contact if email provided
-            if deal.contact_email:
+            # Known contacts were associated by the create call itself; otherwise look one up
+            if contact_id:
+                self._remember_association(deal_id, contact_id)
+            elif deal.contact_email:
                 self.associate_deal_with_contact(deal_id, deal.contact_email)
             
             logger.info(f"Deal created successfully: {deal_id}")
@@ -321,54 +625,202 @@ class HubSpotAgent:
             logger.error(f"Error creating deal: {e}")
             raise
     
-    def associate_deal_with_contact(self, deal_id: str, contact_email: str) -> None:
+    def associate_deal_with_contact(self, deal_id: str, contact_email: Optional[str] = None,
+                                    contact_id: Optional[str] = None) -> None:
         """
         Associate a deal with a contact
         
         Args:
             deal_id: HubSpot deal ID
-            contact_email: Contact email address
+            contact_email: Contact email address, used to look up the contact
+            contact_id: HubSpot contact ID; skips the email lookup when given
         """
-        logger.info(f"Associating deal {deal_id} with contact {contact_email}")
+        logger.info(f"Associating deal {deal_id} with contact {contact_id or contact_email}")
         
-        # First, find the contact by email
-        contacts = self.search_contacts(contact_email)
-        if not contacts:
+        # Find the contact by email unless we already know its ID
+        if not contact_id and contact_email:
+            contact_id = self._resolve_contact_id(contact_email)
+        if not contact_id:
             logger.warning(f"Contact not found for email: {contact_email}")
             return
         
-        contact_id = contacts[0]['id']
-        
-        # Create association
-        association_payload = {
-            "inputs": [{
-                "from": {"id": deal_id},
-                "to": {"id": contact_id},
-                "type": "deal_to_contact"
-            }]
-        }
+        # Associating is idempotent, so skip pairs we have already linked
+        pair = (deal_id, contact_id)
+        if pair in self._associations:
+            logger.info(f"Deal {deal_id} already associated with contact {contact_id}")
+            return
         
         try:
-            response = requests.put(
-                f"{self.base_url}/crm/v3/objects/deals/{deal_id}/associations/contacts/{contact_id}",
-                headers=self.headers,
-                params=self.api_key_param,
-                json=association_payload
+            # Both IDs are in the path; the PUT needs no request body
+            response = self.session.put(
+                self._url_deal_contact_association.format(deal_id, contact_id)
             )
             response.raise_for_status()
             
+            self._remember_association(deal_id, contact_id)
+            
             logger.info(f"Deal {deal_id} associated with contact {contact_id}")
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error associating deal with contact: {e}")
             raise
     
-    def get_deals(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def create_contacts_batch(self, contacts: List[Contact]) -> List[Dict[str, Any]]:
+        """
+        Create many contacts with HubSpot's batch endpoint
+        
+        Unlike create_contact, existing contacts are not updated; HubSpot
+        rejects the chunk containing a duplicate email.
+        
+        Args:
+            contacts: Contact objects to create
+            
+        Returns:
+            List of created contacts (HubSpot does not guarantee input order)
+        """
+        logger.info(f"Creating {len(contacts)} contacts in batch")
+        
+        inputs = [{"properties": self._contact_properties(c)} for c in contacts]
+        
+        try:
+            results = self._post_batch(
+                self._url_contacts_batch_create,
+                inputs
+            )
+            for result in results:
+                self._remember_contact(result)
+            logger.info(f"Created {len(results)} contacts in batch")
+            return results
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error creating contacts in batch: {e}")
+            raise
+    
+    def update_contacts_batch(self, updates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Update many contacts with HubSpot's batch endpoint
+        
+        Args:
+            updates: Mapping of HubSpot contact ID to properties to update
+            
+        Returns:
+            List of updated contacts
+        """
+        logger.info(f"Updating {len(updates)} contacts in batch")
+        
+        inputs = [
+            {"id": contact_id, "properties": properties}
+            for contact_id, properties in updates.items()
+        ]
+        
+        try:
+            results = self._post_batch(
+                self._url_contacts_batch_update,
+                inputs
+            )
+            for contact_id, properties in updates.items():
+                if "email" in properties:
+                    self._forget_contact_id(contact_id)
+                    self._cache_contact_id(properties["email"], contact_id)
+            logger.info(f"Updated {len(results)} contacts in batch")
+            return results
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error updating contacts in batch: {e}")
+            raise
+    
+    def create_deals_batch(self, deals: List[Deal]) -> List[Dict[str, Any]]:
+        """
+        Create many deals with HubSpot's batch endpoint
+        
+        Deals whose contact ID is known (set on the Deal or cached from an
+        earlier lookup) are associated as part of the create. Others are not
+        looked up, since batch results come back unordered; use
+        associate_deals_with_contacts_batch for those.
+        
+        Args:
+            deals: Deal objects to create
+            
+        Returns:
+            List of created deals (HubSpot does not guarantee input order)
+        """
+        logger.info(f"Creating {len(deals)} deals in batch")
+        
+        inputs = [self._deal_input(d)[0] for d in deals]
+        
+        try:
+            results = self._post_batch(
+                self._url_deals_batch_create,
+                inputs
+            )
+            logger.info(f"Created {len(results)} deals in batch")
+            return results
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error creating deals in batch: {e}")
+            raise
+    
+    def update_deal_stages_batch(self, stages: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Update many deal stages with HubSpot's batch endpoint
+        
+        Args:
+            stages: Mapping of HubSpot deal ID to new deal stage
+            
+        Returns:
+            List of updated deals
+        """
+        logger.info(f"Updating {len(stages)} deal stages in batch")
+        
+        inputs = [
+            {"id": deal_id, "properties": {"dealstage": stage}}
+            for deal_id, stage in stages.items()
+        ]
+        
+        try:
+            results = self._post_batch(
+                self._url_deals_batch_update,
+                inputs
+            )
+            logger.info(f"Updated {len(results)} deal stages in batch")
+            return results
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error updating deal stages in batch: {e}")
+            raise
+    
+    def associate_deals_with_contacts_batch(self, pairs: List[Tuple[str, str]]) -> None:
+        """
+        Associate many deals with contacts using the default association type
+        
+        Args:
+            pairs: (deal_id, contact_id) tuples to associate
+        """
+        logger.info(f"Associating {len(pairs)} deals with contacts in batch")
+        
+        inputs = [
+            {"from": {"id": deal_id}, "to": {"id": contact_id}}
+            for deal_id, contact_id in pairs
+        ]
+        
+        try:
+            self._post_batch(
+                self._url_deal_contact_batch_association,
+                inputs
+            )
+            logger.info(f"Associated {len(pairs)} deals with contacts")
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error associating deals with contacts in batch: {e}")
+            raise
+    
+    def get_deals(self, limit: int = 10, properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Get recent deals
         
         Args:
             limit: Maximum number of deals to return
+            properties: Deal properties to return (HubSpot's defaults if omitted)
             
         Returns:
             List of deals
@@ -376,14 +828,7 @@ class HubSpotAgent:
         logger.info(f"Getting {limit} recent deals")
         
         try:
-            response = requests.get(
-                f"{self.base_url}/crm/v3/objects/deals?limit={limit}",
-                headers=self.headers,
-                params=self.api_key_param
-            )
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._get_deals_page(limit, properties=properties)
             deals = result.get("results", [])
             logger.info(f"Retrieved {len(deals)} deals")
             return deals
@@ -392,6 +837,49 @@ class HubSpotAgent:
             logger.error(f"Error getting deals: {e}")
             raise
     
+    def iter_deals(self, page_size: int = BATCH_LIMIT,
+                   properties: Optional[List[str]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page through all deals, following HubSpot's paging cursor
+        
+        Pages are fetched lazily, so callers can stop early.
+        
+        Args:
+            page_size: Deals per request (HubSpot caps this at 100)
+            properties: Deal properties to return (HubSpot's defaults if omitted)
+            
+        Yields:
+            Lists of deals, one per page
+        """
+        after = None
+        while True:
+            try:
+                result = self._get_deals_page(page_size, after=after, properties=properties)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error getting deals: {e}")
+                raise
+            
+            deals = result.get("results", [])
+            if deals:
+                yield deals
+            
+            after = ((result.get("paging") or {}).get("next") or {}).get("after")
+            if not after:
+                return
+    
+    def _get_deals_page(self, limit: int, after: Optional[str] = None,
+                        properties: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Fetch one page of deals; query params merge with the session defaults"""
+        params: Dict[str, Any] = {"limit": limit}
+        if after:
+            params["after"] = after
+        if properties:
+            params["properties"] = ",".join(properties)
+        
+        response = self.session.get(self._url_deals, params=params)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
     def update_deal_stage(self, deal_id: str, stage: str) -> Dict[str, Any]:
         """
         Update a deal's stage
@@ -408,18 +896,233 @@ class HubSpotAgent:
         payload = {"properties": {"dealstage": stage}}
         
         try:
-            response = requests.patch(
-                f"{self.base_url}/crm/v3/objects/deals/{deal_id}",
-                headers=self.headers,
-                params=self.api_key_param,
-                json=payload
+            response = self.session.patch(
+                self._url_deal.format(deal_id),
+                data=orjson.dumps(payload)
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             logger.info(f"Deal stage updated successfully: {deal_id}")
             return result
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error updating deal stage: {e}")
             raise
+    
+    async def acreate_contact(self, contact: Contact) -> Dict[str, Any]:
+        """
+        Create a new contact in HubSpot without blocking the event loop
+        
+        Args:
+            contact: Contact object to create
+            
+        Returns:
+            Dict containing the created contact data
+        """
+        logger.info(f"Creating contact: {contact.email}")
+        
+        properties = self._contact_properties(contact)
+        
+        try:
+            response = await self._arequest(
+                "POST",
+                _CONTACTS_PATH,
+                content=orjson.dumps({"properties": properties})
+            )
+            
+            # If contact already exists (409 conflict), update it instead
+            if response.status_code == 409:
+                logger.info(f"Contact already exists, updating instead: {contact.email}")
+                existing_contact = await self.asearch_contact_by_email(contact.email)
+                if existing_contact:
+                    contact_id = existing_contact.get('id')
+                    result = await self.aupdate_contact(contact_id, properties)
+                    self._cache_contact_id(contact.email, contact_id)
+                    return result
+                else:
+                    logger.error(f"Could not find existing contact to update: {contact.email}")
+                    raise Exception(f"Contact {contact.email} already exists but could not be found for update")
+            
+            response.raise_for_status()
+            
+            result = orjson.loads(response.content)
+            self._cache_contact_id(contact.email, result.get('id'))
+            logger.info(f"Contact created successfully: {result.get('id')}")
+            return result
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Error creating contact: {e}")
+            raise
+    
+    async def asearch_contact_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Search for a contact by email address without blocking the event loop
+        
+        Args:
+            email: Email address to search for
+            
+        Returns:
+            Dict containing the contact data if found, None otherwise
+        """
+        try:
+            response = await self._arequest(
+                "POST",
+                _CONTACTS_SEARCH_PATH,
+                content=orjson.dumps(self._email_search_payload(email))
+            )
+            response.raise_for_status()
+            
+            contacts = orjson.loads(response.content).get("results", [])
+            return contacts[0] if contacts else None
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Error searching for contact by email: {e}")
+            return None
+    
+    async def asearch_contacts(self, query: str, properties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search for contacts without blocking the event loop
+        
+        Args:
+            query: Search query
+            properties: Contact properties to return (HubSpot's defaults if omitted)
+            
+        Returns:
+            List of matching contacts
+        """
+        logger.info(f"Searching contacts: {query}")
+        
+        try:
+            response = await self._arequest(
+                "POST",
+                _CONTACTS_SEARCH_PATH,
+                content=orjson.dumps(self._query_search_payload(query, properties))
+            )
+            response.raise_for_status()
+            
+            contacts = orjson.loads(response.content).get("results", [])
+            logger.info(f"Found {len(contacts)} contacts")
+            return contacts
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Error searching contacts: {e}")
+            raise
+    
+    async def aupdate_contact(self, contact_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update a contact's properties without blocking the event loop
+        
+        Args:
+            contact_id: HubSpot contact ID
+            properties: Properties to update
+            
+        Returns:
+            Updated contact data
+        """
+        logger.info(f"Updating contact: {contact_id}")
+        
+        try:
+            response = await self._arequest(
+                "PATCH",
+                _CONTACT_PATH.format(contact_id),
+                content=orjson.dumps({"properties": properties})
+            )
+            response.raise_for_status()
+            
+            result = orjson.loads(response.content)
+            
+            # A changed email invalidates whatever we had cached for this contact
+            if "email" in properties:
+                self._forget_contact_id(contact_id)
+                self._cache_contact_id(properties["email"], contact_id)
+            
+            logger.info(f"Contact updated successfully: {contact_id}")
+            return result
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Error updating contact: {e}")
+            raise
+    
+    async def acreate_deal(self, deal: Deal) -> Dict[str, Any]:
+        """
+        Create a new deal in HubSpot without blocking the event loop
+        
+        Args:
+            deal: Deal object to create
+            
+        Returns:
+            Dict containing the created deal data
+        """
+        logger.info(f"Creating deal: {deal.deal_name}")
+        
+        payload, contact_id = self._deal_input(deal)
+        
+        try:
+            response = await self._arequest(
+                "POST",
+                _DEALS_PATH,
+                content=orjson.dumps(payload)
+            )
+            response.raise_for_status()
+            
+            result = orjson.loads(response.content)
+            deal_id = result.get('id')
+            
+            # Known contacts were associated by the create call itself; otherwise look one up
+            if contact_id:
+                self._remember_association(deal_id, contact_id)
+            elif deal.contact_email:
+                await self.aassociate_deal_with_contact(deal_id, deal.contact_email)
+            
+            logger.info(f"Deal created successfully: {deal_id}")
+            return result
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Error creating deal: {e}")
+            raise
+    
+    async def aassociate_deal_with_contact(self, deal_id: str, contact_email: Optional[str] = None,
+                                           contact_id: Optional[str] = None) -> None:
+        """
+        Associate a deal with a contact without blocking the event loop
+        
+        Args:
+            deal_id: HubSpot deal ID
+            contact_email: Contact email address, used to look up the contact
+            contact_id: HubSpot contact ID; skips the email lookup when given
+        """
+        logger.info(f"Associating deal {deal_id} with contact {contact_id or contact_email}")
+        
+        # Find the contact by email unless we already know (or have cached) its ID
+        if not contact_id and contact_email:
+            contact_id = self._cached_contact_id(contact_email)
+            if not contact_id:
+                contacts = await self.asearch_contacts(contact_email, properties=["email"])
+                contact_id = self._pick_contact_id(contacts, contact_email)
+                if contact_id:
+                    self._cache_contact_id(contact_email, contact_id)
+        if not contact_id:
+            logger.warning(f"Contact not found for email: {contact_email}")
+            return
+        
+        # Associating is idempotent, so skip pairs we have already linked
+        pair = (deal_id, contact_id)
+        if pair in self._associations:
+            logger.info(f"Deal {deal_id} already associated with contact {contact_id}")
+            return
+        
+        try:
+            response = await self._arequest(
+                "PUT",
+                _DEAL_CONTACT_ASSOCIATION_PATH.format(deal_id, contact_id)
+            )
+            response.raise_for_status()
+            
+            self._remember_association(deal_id, contact_id)
+            
+            logger.info(f"Deal {deal_id} associated with contact {contact_id}")
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Error associating deal with contact: {e}")
+            raise
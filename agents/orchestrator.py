@@ -3,18 +3,150 @@ Main Orchestrator using LangGraph for AI Agent Workflow
 Coordinates between different agents and manages the workflow
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional, TypedDict
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Literal, Optional, Tuple, TypedDict
 from dataclasses import dataclass
+from functools import cached_property
+import orjson
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 from config.config_manager import ConfigManager
 from agents.hubspot_agent import HubSpotAgent, Contact, Deal
 from agents.email_agent import EmailAgent
-from agents.preview_agent import PreviewAgent
+from agents.preview_agent import PreviewAgent, full_name, parse_amount
+from agents.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Parsed (intent, entities) kept for this many distinct user inputs
+PARSE_CACHE_SIZE = 256
+
+# The parse step only needs a short JSON reply, so it runs on a small,
+# deterministic model with a tight output budget
+PARSE_MODEL = "gemini-2.5-flash-lite"
+PARSE_TEMPERATURE = 0.0
+PARSE_MAX_OUTPUT_TOKENS = 256
+
+# Transient Gemini failures are retried with exponential backoff
+LLM_MAX_ATTEMPTS = 4
+_LLM_RETRYABLE_ERRORS = (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+)
+_LLM_BACKOFF = wait_exponential(multiplier=0.5, max=8)
+_MAX_RETRY_AFTER_SECONDS = 60.0
+
+# Client-side pacing to stay under Gemini's quota (free-tier Flash-Lite limits
+# by default); only this fraction of the quota is used, leaving headroom
+LLM_REQUESTS_PER_MINUTE = 15
+LLM_TOKENS_PER_MINUTE = 250_000
+RATE_LIMIT_HEADROOM = 0.8
+
+# Gemini calls allowed in flight at once from async workflows
+LLM_MAX_CONCURRENCY = 4
+
+# Instructions sent ahead of every user input in the parse step
+_PARSE_SYSTEM_PROMPT = """
+You are an AI assistant that helps parse user requests for CRM operations.
+
+Analyze the user input and determine:
+1. The intent (create_contact, create_deal, or unknown)
+2. Extract relevant entities (names, emails, phone numbers, companies, deal amounts, etc.)
+
+Return a JSON object with the intent and the entities you found. Leave out
+entities that are not mentioned.
+
+Example:
+{"intent": "create_contact", "entities": {"email": "john@example.com", "first_name": "John", "last_name": "Doe", "company": "Acme Corp"}}
+""".strip()
+
+# Fixed prompt prefix, so each request only appends its input
+_PARSE_PROMPT_PREFIX = _PARSE_SYSTEM_PROMPT + "\n\nUser input: "
+
+# Entity fields Gemini may fill in; all values are returned as strings
+_ENTITY_FIELDS = (
+    "email", "first_name", "last_name", "phone", "company",
+    "deal_name", "amount", "stage", "close_date", "contact_email", "contact_name"
+)
+
+# Structured output schema for the parse step
+_PARSE_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "intent": {"type": "string", "enum": ["create_contact", "create_deal", "unknown"]},
+        "entities": {
+            "type": "object",
+            "properties": {field: {"type": "string"} for field in _ENTITY_FIELDS}
+        }
+    },
+    "required": ["intent", "entities"]
+}
+
+# Structured commands like "create contact email=jane@example.com, company=Acme"
+# are parsed locally; anything looser goes to Gemini
+_FAST_INTENT_RE = re.compile(
+    r"^\s*(?:create|add)\s+(?:a\s+)?(?:new\s+)?(contact|deal)\b[\s:,-]*(.*?)\s*$",
+    re.IGNORECASE | re.DOTALL
+)
+# Values end at a comma or semicolon, except thousands separators inside numbers
+_FAST_FIELD_RE = re.compile(
+    r'(\w+)\s*[:=]\s*(?:"([^"]*)"|((?:[^,;"=]|(?<=\d),(?=\d{3}\b))+))\s*(?:[,;]\s*|$)'
+)
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_AMOUNT_RE = re.compile(r"^\$?\s*(\d[\d,]*(?:\.\d+)?)$")
+
+_FAST_FIELDS = {
+    "contact": frozenset({"email", "first_name", "last_name", "phone", "company"}),
+    "deal": frozenset({
+        "deal_name", "name", "amount", "stage", "close_date", "contact_email",
+        "email", "contact_name", "first_name", "last_name", "company"
+    }),
+}
+
+# Conditional edge targets, keyed by parsed intent
+ParseRoute = Literal["create_preview", "error"]
+PreviewRoute = Literal["create_contact", "create_deal", "handle_error"]
+
+_PARSE_ROUTES: Dict[str, ParseRoute] = {
+    "create_contact": "create_preview",
+    "create_deal": "create_preview",
+}
+_PREVIEW_ROUTES: Dict[str, PreviewRoute] = {
+    "create_contact": "create_contact",
+    "create_deal": "create_deal",
+}
+
+
+def _llm_retry_wait(retry_state) -> float:
+    """Wait as long as a 429's Retry-After asks, else back off exponentially"""
+    error = retry_state.outcome.exception()
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    retry_after = headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            return min(max(float(retry_after), 0.0), _MAX_RETRY_AFTER_SECONDS)
+        except ValueError:
+            pass
+    return _LLM_BACKOFF(retry_state)
+
+
+_llm_retry = retry(
+    retry=retry_if_exception_type(_LLM_RETRYABLE_ERRORS),
+    wait=_llm_retry_wait,
+    stop=stop_after_attempt(LLM_MAX_ATTEMPTS),
+    reraise=True
+)
+
 
 class WorkflowState(TypedDict):
     """State object for the workflow"""
@@ -51,14 +183,59 @@ class AIAgentOrchestrator:
             config_manager: Configuration manager instance
         """
         self.config_manager = config_manager
-        self.llm = self._initialize_llm()
-        self.hubspot_agent = HubSpotAgent(config_manager)
-        self.email_agent = EmailAgent(config_manager)
         self.preview_agent = PreviewAgent()
-        self.workflow_graph = self._build_workflow_graph()
+        
+        # LRU of normalized user input -> parsed (intent, entities)
+        self._parse_cache: "OrderedDict[str, Tuple[str, Dict[str, str]]]" = OrderedDict()
+        self._parse_cache_size = int(config_manager.get("gemini.parse_cache_size", PARSE_CACHE_SIZE))
+        self._parse_lock = threading.Lock()
+        
+        # Caps concurrent Gemini calls across aprocess_request invocations and batches;
+        # the async semaphore is made per event loop, as it can't outlive its loop
+        self._llm_max_concurrency = int(config_manager.get("gemini.max_concurrency", LLM_MAX_CONCURRENCY))
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+        self._llm_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Request and token buckets shared by every Gemini call (a limit of 0 disables it)
+        self._request_bucket = self._make_bucket("gemini.requests_per_minute", LLM_REQUESTS_PER_MINUTE)
+        self._token_bucket = self._make_bucket("gemini.tokens_per_minute", LLM_TOKENS_PER_MINUTE)
+    
+    # Clients and the graph are built on first use, so callers that only list
+    # actions don't pay for SDK setup or open connections
+    @cached_property
+    def llm(self) -> genai.GenerativeModel:
+        """Gemini model used by the parse step"""
+        return self._initialize_llm()
+    
+    @cached_property
+    def hubspot_agent(self) -> HubSpotAgent:
+        """HubSpot client"""
+        return HubSpotAgent(self.config_manager)
+    
+    @cached_property
+    def email_agent(self) -> EmailAgent:
+        """Email notification client"""
+        return EmailAgent(self.config_manager)
+    
+    @cached_property
+    def workflow_graph(self):
+        """Compiled LangGraph workflow"""
+        return self._build_workflow_graph()
+    
+    def _make_bucket(self, key: str, default: int) -> Optional[TokenBucket]:
+        """Build a per-minute token bucket from a quota setting, with headroom"""
+        limit = float(self.config_manager.get(key, default))
+        if limit <= 0:
+            return None
+        return TokenBucket(limit * RATE_LIMIT_HEADROOM, period=60.0)
+    
+    @staticmethod
+    def _estimate_tokens(prompt: str) -> int:
+        """Rough prompt size in tokens (about four characters each)"""
+        return len(prompt) // 4 + 1
     
     def _initialize_llm(self) -> genai.GenerativeModel:
-        """Initialize the Gemini LLM"""
+        """Initialize the Gemini LLM used by the parse step"""
         gemini_config = self.config_manager.get_gemini_config()
         
         # Configure the Gemini API
@@ -66,10 +243,12 @@ class AIAgentOrchestrator:
         
         # Initialize the model
         model = genai.GenerativeModel(
-            model_name=gemini_config.get("model", "gemini-2.5-flash"),
+            model_name=gemini_config.get("parse_model", PARSE_MODEL),
             generation_config=genai.types.GenerationConfig(
-                temperature=gemini_config.get("temperature", 0.7),
-                max_output_tokens=gemini_config.get("max_tokens", 1000)
+                temperature=float(gemini_config.get("parse_temperature", PARSE_TEMPERATURE)),
+                max_output_tokens=int(gemini_config.get("parse_max_tokens", PARSE_MAX_OUTPUT_TOKENS)),
+                response_mime_type="application/json",
+                response_schema=_PARSE_RESPONSE_SCHEMA
             )
         )
         
@@ -79,13 +258,11 @@ class AIAgentOrchestrator:
         """Build the LangGraph workflow"""
         workflow = StateGraph(WorkflowState)
         
-        # Add nodes
-        workflow.add_node("parse_input", self._parse_input)
+        # Add nodes; I/O-bound nodes get a coroutine twin used by ainvoke
+        workflow.add_node("parse_input", RunnableLambda(self._parse_input, afunc=self._aparse_input))
         workflow.add_node("create_preview", self._create_preview)
-        workflow.add_node("show_preview", self._show_preview)
-        workflow.add_node("create_contact", self._create_contact)
-        workflow.add_node("create_deal", self._create_deal)
-        workflow.add_node("send_notification", self._send_notification)
+        workflow.add_node("show_preview", RunnableLambda(self._show_preview, afunc=self._ashow_preview))
+        workflow.add_node("create_and_notify", RunnableLambda(self._create_and_notify, afunc=self._acreate_and_notify))
         workflow.add_node("handle_error", self._handle_error)
         
         # Set entry point
@@ -106,97 +283,229 @@ class AIAgentOrchestrator:
             "show_preview",
             self._route_after_preview,
             {
-                "create_contact": "create_contact",
-                "create_deal": "create_deal",
+                "create_contact": "create_and_notify",
+                "create_deal": "create_and_notify",
                 "handle_error": "handle_error"
             }
         )
         
-        workflow.add_edge("create_contact", "send_notification")
-        workflow.add_edge("create_deal", "send_notification")
-        workflow.add_edge("send_notification", END)
+        workflow.add_edge("create_and_notify", END)
         workflow.add_edge("handle_error", END)
         
         return workflow.compile()
     
-    def _parse_input(self, state: WorkflowState) -> WorkflowState:
-        """Parse user input to determine intent and extract entities"""
-        logger.info("Parsing user input")
+    @staticmethod
+    def _normalize_input(user_input: str) -> str:
+        """Collapse whitespace so trivially different inputs share a cache entry"""
+        return " ".join(user_input.split())
+    
+    @staticmethod
+    def _parse_llm_response(text: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Parse the JSON body of a Gemini response
         
-        try:
-            # Use LLM to parse the input
-            system_prompt = """
-            You are an AI assistant that helps parse user requests for CRM operations.
-            
-            Analyze the user input and determine:
-            1. The intent (create_contact, create_deal, or unknown)
-            2. Extract relevant entities (names, emails, phone numbers, companies, deal amounts, etc.)
-            
-            Return your analysis in this format:
-            INTENT: [intent]
-            ENTITIES: [key:value pairs separated by commas]
+        Args:
+            text: Raw response text
             
-            Example:
-            INTENT: create_contact
-            ENTITIES: email:john@example.com, first_name:John, last_name:Doe, company:Acme Corp
-            """
+        Returns:
+            Tuple of (intent, entities), with empty entity values dropped
+        """
+        data = orjson.loads(text)
+        intent = data.get("intent") or "unknown"
+        entities = {
+            key: str(value).strip()
+            for key, value in (data.get("entities") or {}).items()
+            if value not in (None, "")
+        }
+        return intent, entities
+    
+    @staticmethod
+    def _fast_parse(user_input: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """
+        Parse a structured key=value command without calling Gemini
+        
+        Args:
+            user_input: Raw user input
             
+        Returns:
+            Tuple of (intent, entities), or None if the input needs the LLM
+        """
+        match = _FAST_INTENT_RE.match(user_input)
+        if not match:
+            return None
+        
+        kind, rest = match.group(1).lower(), match.group(2)
+        allowed = _FAST_FIELDS[kind]
+        entities = {}
+        
+        # Every character after the intent must belong to a known key=value field
+        pos = 0
+        while pos < len(rest):
+            field = _FAST_FIELD_RE.match(rest, pos)
+            if not field:
+                return None
+            key = field.group(1).lower()
+            value = field.group(2) if field.group(2) is not None else field.group(3).strip()
+            if key not in allowed or not value:
+                return None
+            entities[key] = value
+            pos = field.end()
+        
+        for key in ("email", "contact_email"):
+            if key in entities and not _EMAIL_RE.fullmatch(entities[key]):
+                return None
+        
+        if kind == "contact":
+            if "email" not in entities:
+                return None
+        else:
+            if "deal_name" not in entities and "name" not in entities:
+                return None
+            if "amount" in entities:
+                amount = _AMOUNT_RE.match(entities["amount"])
+                if not amount:
+                    return None
+                entities["amount"] = amount.group(1).replace(",", "")
+        
+        return f"create_{kind}", entities
+    
+    def _remember_parse(self, key: str, intent: str, entities: Dict[str, str]) -> None:
+        """Store a parse result, evicting the least recently used entry when full"""
+        if self._parse_cache_size <= 0:
+            return
+        with self._parse_lock:
+            self._parse_cache[key] = (intent, entities)
+            self._parse_cache.move_to_end(key)
+            if len(self._parse_cache) > self._parse_cache_size:
+                self._parse_cache.popitem(last=False)
+    
+    def _cached_parse(self, key: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Look up a parse result, marking it as recently used"""
+        with self._parse_lock:
+            cached = self._parse_cache.get(key)
+            if cached is not None:
+                self._parse_cache.move_to_end(key)
+        if cached is not None:
+            logger.info("Using cached parse for repeated input")
+        return cached
+    
+    def _parse_and_remember(self, key: str, text: str) -> Tuple[str, Dict[str, str]]:
+        """Parse a Gemini response and cache it under the normalized input"""
+        intent, entities = self._parse_llm_response(text)
+        
+        # Only remember parses that lead somewhere; an unknown intent may be a fluke
+        if intent != "unknown":
+            self._remember_parse(key, intent, entities)
+        
+        return intent, entities
+    
+    @staticmethod
+    def _parse_update(intent: str, entities: Dict[str, str]) -> Dict[str, Any]:
+        """State update for a parse result"""
+        logger.info(f"Parsed intent: {intent}, entities: {entities}")
+        
+        # Hand out a copy so later nodes can't alter the cached entities
+        return {"intent": intent, "entities": dict(entities)}
+    
+    def _parse_text(self, user_input: str) -> Tuple[str, Dict[str, str]]:
+        """Parse a user input with Gemini, or from the cache when seen recently"""
+        parsed = self._fast_parse(user_input)
+        if parsed is not None:
+            return parsed
+        
+        key = self._normalize_input(user_input)
+        parsed = self._cached_parse(key)
+        
+        if parsed is None:
             # Create the prompt for Gemini
-            prompt = f"{system_prompt}\n\nUser input: {state['user_input']}"
-            
-            response = self.llm.generate_content(prompt)
-            result = response.text
+            prompt = _PARSE_PROMPT_PREFIX + user_input
             
-            # Parse the response
-            lines = result.strip().split('\n')
-            intent = "unknown"
-            entities = {}
+            response = self._call_llm(prompt)
+            parsed = self._parse_and_remember(key, response.text)
+        
+        return parsed
+    
+    @_llm_retry
+    def _call_llm(self, prompt: str):
+        """Call Gemini, pacing to the configured quota and retrying transient failures"""
+        if self._request_bucket is not None:
+            self._request_bucket.acquire()
+        if self._token_bucket is not None:
+            self._token_bucket.acquire(self._estimate_tokens(prompt))
+        
+        return self.llm.generate_content(prompt)
+    
+    @_llm_retry
+    async def _acall_llm(self, prompt: str):
+        """Call Gemini from the event loop, pacing to the configured quota and retrying transient failures"""
+        if self._request_bucket is not None:
+            await self._request_bucket.aacquire()
+        if self._token_bucket is not None:
+            await self._token_bucket.aacquire(self._estimate_tokens(prompt))
+        
+        async with self._get_llm_semaphore():
+            return await self.llm.generate_content_async(prompt)
+    
+    def _get_llm_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore capping concurrent async Gemini calls on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._llm_semaphore_loop is not loop:
+            self._llm_semaphore_loop = loop
+            self._llm_semaphore = asyncio.Semaphore(self._llm_max_concurrency)
+        return self._llm_semaphore
+    
+    def _parse_input(self, state: WorkflowState) -> Dict[str, Any]:
+        """Parse user input to determine intent and extract entities"""
+        # Batch runs parse ahead of time and start the graph with the intent filled in
+        if state.get("intent") is not None:
+            return {}
+        
+        logger.info("Parsing user input")
+        
+        try:
+            return self._parse_update(*self._parse_text(state['user_input']))
             
-            for line in lines:
-                if line.startswith("INTENT:"):
-                    intent = line.split(":", 1)[1].strip()
-                elif line.startswith("ENTITIES:"):
-                    entities_str = line.split(":", 1)[1].strip()
-                    if entities_str:
-                        for pair in entities_str.split(','):
-                            if ':' in pair:
-                                key, value = pair.strip().split(':', 1)
-                                entities[key.strip()] = value.strip()
+        except Exception as e:
+            logger.error(f"Error parsing input: {e}")
+            return {"error": f"Error parsing input: {str(e)}"}
+    
+    async def _aparse_input(self, state: WorkflowState) -> Dict[str, Any]:
+        """Parse user input without blocking the event loop"""
+        if state.get("intent") is not None:
+            return {}
+        
+        logger.info("Parsing user input")
+        
+        try:
+            parsed = self._fast_parse(state['user_input'])
+            key = self._normalize_input(state['user_input'])
+            if parsed is None:
+                parsed = self._cached_parse(key)
             
-            state["intent"] = intent
-            state["entities"] = entities
+            if parsed is None:
+                prompt = _PARSE_PROMPT_PREFIX + state['user_input']
+                
+                response = await self._acall_llm(prompt)
+                parsed = self._parse_and_remember(key, response.text)
             
-            logger.info(f"Parsed intent: {intent}, entities: {entities}")
+            return self._parse_update(*parsed)
             
         except Exception as e:
             logger.error(f"Error parsing input: {e}")
-            state["error"] = f"Error parsing input: {str(e)}"
-        
-        return state
+            return {"error": f"Error parsing input: {str(e)}"}
     
-    def _route_workflow(self, state: WorkflowState) -> str:
+    def _route_workflow(self, state: WorkflowState) -> ParseRoute:
         """Route the workflow based on parsed intent"""
-        intent = state.get("intent", "unknown")
-        
-        if intent in ["create_contact", "create_deal"]:
-            return "create_preview"
-        else:
-            return "error"
+        return _PARSE_ROUTES.get(state.get("intent"), "error")
     
-    def _route_after_preview(self, state: WorkflowState) -> str:
+    def _route_after_preview(self, state: WorkflowState) -> PreviewRoute:
         """Route after preview based on user confirmation and intent"""
         if not state.get("user_confirmed"):
             return "handle_error"
         
-        intent = state.get("intent", "unknown")
-        if intent == "create_contact":
-            return "create_contact"
-        elif intent == "create_deal":
-            return "create_deal"
-        else:
-            return "handle_error"
+        return _PREVIEW_ROUTES.get(state.get("intent"), "handle_error")
     
-    def _create_preview(self, state: WorkflowState) -> WorkflowState:
+    def _create_preview(self, state: WorkflowState) -> Dict[str, Any]:
         """Create a preview of what will be created"""
         logger.info("Creating preview")
         
@@ -210,26 +519,22 @@ class AIAgentOrchestrator:
             elif intent == "create_deal":
                 preview_item = self.preview_agent.create_deal_preview(entities, original_input)
             else:
-                state["error"] = f"Unknown intent: {intent}"
-                return state
+                return {"error": f"Unknown intent: {intent}"}
             
-            state["preview_item"] = preview_item
+            return {"preview_item": preview_item}
             
         except Exception as e:
             logger.error(f"Error creating preview: {e}")
-            state["error"] = f"Error creating preview: {str(e)}"
-        
-        return state
+            return {"error": f"Error creating preview: {str(e)}"}
     
-    def _show_preview(self, state: WorkflowState) -> WorkflowState:
+    def _show_preview(self, state: WorkflowState) -> Dict[str, Any]:
         """Show preview and get user confirmation"""
         logger.info("Showing preview to user")
         
         try:
             preview_item = state.get("preview_item")
             if not preview_item:
-                state["error"] = "No preview item found"
-                return state
+                return {"error": "No preview item found"}
             
             # Display the preview
             self.preview_agent.display_preview(preview_item)
@@ -240,80 +545,140 @@ class AIAgentOrchestrator:
                 
                 if confirmation is True:
                     # User confirmed, proceed
-                    state["user_confirmed"] = True
-                    break
+                    return {"preview_item": preview_item, "user_confirmed": True}
                 elif confirmation is False:
                     # User declined, cancel
-                    state["user_confirmed"] = False
-                    state["error"] = "User cancelled the operation"
-                    break
+                    return {
+                        "preview_item": preview_item,
+                        "user_confirmed": False,
+                        "error": "User cancelled the operation"
+                    }
                 elif confirmation == 'edit':
                     # User wants to edit, show edit mode
-                    edited_item = self.preview_agent.edit_preview(preview_item)
-                    state["preview_item"] = edited_item
+                    preview_item = self.preview_agent.edit_preview(preview_item)
                     # Show the updated preview
-                    self.preview_agent.display_preview(edited_item)
+                    self.preview_agent.display_preview(preview_item)
                     # Continue the loop to get confirmation again
             
         except Exception as e:
             logger.error(f"Error showing preview: {e}")
-            state["error"] = f"Error showing preview: {str(e)}"
+            return {"error": f"Error showing preview: {str(e)}"}
+    
+    async def _ashow_preview(self, state: WorkflowState) -> Dict[str, Any]:
+        """Show preview and wait for confirmation without blocking other workflows"""
+        logger.info("Showing preview to user")
         
-        return state
+        try:
+            preview_item = state.get("preview_item")
+            if not preview_item:
+                return {"error": "No preview item found"}
+            
+            self.preview_agent.display_preview(preview_item)
+            
+            while True:
+                confirmation = await self.preview_agent.aget_user_confirmation()
+                
+                if confirmation is True:
+                    return {"preview_item": preview_item, "user_confirmed": True}
+                elif confirmation is False:
+                    return {
+                        "preview_item": preview_item,
+                        "user_confirmed": False,
+                        "error": "User cancelled the operation"
+                    }
+                elif confirmation == 'edit':
+                    preview_item = await self.preview_agent.aedit_preview(preview_item)
+                    self.preview_agent.display_preview(preview_item)
+            
+        except Exception as e:
+            logger.error(f"Error showing preview: {e}")
+            return {"error": f"Error showing preview: {str(e)}"}
     
-    def _create_contact(self, state: WorkflowState) -> WorkflowState:
+    def _create_contact(self, state: WorkflowState) -> Dict[str, Any]:
         """Create a contact in HubSpot"""
         logger.info("Creating contact")
         
         try:
             preview_item = state.get("preview_item")
             if not preview_item:
-                state["error"] = "No preview item found for contact creation"
-                return state
+                return {"error": "No preview item found for contact creation"}
             
             # Create contact from preview data
             contact = self.preview_agent.create_contact_from_preview(preview_item)
             
             # Create contact in HubSpot
             result = self.hubspot_agent.create_contact(contact)
-            state["contact_data"] = result
-            state["hubspot_result"] = result
             
             logger.info(f"Contact created successfully: {result.get('id')}")
+            return {"contact_data": result, "hubspot_result": result}
             
         except Exception as e:
             logger.error(f"Error creating contact: {e}")
-            state["error"] = f"Error creating contact: {str(e)}"
+            return {"error": f"Error creating contact: {str(e)}"}
+    
+    async def _acreate_contact(self, state: WorkflowState) -> Dict[str, Any]:
+        """Create a contact in HubSpot without blocking the event loop"""
+        logger.info("Creating contact")
         
-        return state
+        try:
+            preview_item = state.get("preview_item")
+            if not preview_item:
+                return {"error": "No preview item found for contact creation"}
+            
+            contact = self.preview_agent.create_contact_from_preview(preview_item)
+            
+            result = await self.hubspot_agent.acreate_contact(contact)
+            
+            logger.info(f"Contact created successfully: {result.get('id')}")
+            return {"contact_data": result, "hubspot_result": result}
+            
+        except Exception as e:
+            logger.error(f"Error creating contact: {e}")
+            return {"error": f"Error creating contact: {str(e)}"}
     
-    def _create_deal(self, state: WorkflowState) -> WorkflowState:
+    def _create_deal(self, state: WorkflowState) -> Dict[str, Any]:
         """Create a deal in HubSpot"""
         logger.info("Creating deal")
         
         try:
             preview_item = state.get("preview_item")
             if not preview_item:
-                state["error"] = "No preview item found for deal creation"
-                return state
+                return {"error": "No preview item found for deal creation"}
             
             # Create deal from preview data
             deal = self.preview_agent.create_deal_from_preview(preview_item)
             
             # Create deal in HubSpot
             result = self.hubspot_agent.create_deal(deal)
-            state["deal_data"] = result
-            state["hubspot_result"] = result
             
             logger.info(f"Deal created successfully: {result.get('id')}")
+            return {"deal_data": result, "hubspot_result": result}
             
         except Exception as e:
             logger.error(f"Error creating deal: {e}")
-            state["error"] = f"Error creating deal: {str(e)}"
+            return {"error": f"Error creating deal: {str(e)}"}
+    
+    async def _acreate_deal(self, state: WorkflowState) -> Dict[str, Any]:
+        """Create a deal in HubSpot without blocking the event loop"""
+        logger.info("Creating deal")
         
-        return state
+        try:
+            preview_item = state.get("preview_item")
+            if not preview_item:
+                return {"error": "No preview item found for deal creation"}
+            
+            deal = self.preview_agent.create_deal_from_preview(preview_item)
+            
+            result = await self.hubspot_agent.acreate_deal(deal)
+            
+            logger.info(f"Deal created successfully: {result.get('id')}")
+            return {"deal_data": result, "hubspot_result": result}
+            
+        except Exception as e:
+            logger.error(f"Error creating deal: {e}")
+            return {"error": f"Error creating deal: {str(e)}"}
     
-    def _send_notification(self, state: WorkflowState) -> WorkflowState:
+    def _send_notification(self, state: WorkflowState) -> Dict[str, Any]:
         """Send email notification"""
         logger.info("Sending notification")
         
@@ -322,18 +687,13 @@ class AIAgentOrchestrator:
             entities = state.get("entities", {})
             
             if intent == "create_contact":
-                email = entities.get("email")
-                name = f"{entities.get('first_name', '')} {entities.get('last_name', '')}".strip()
-                success = self.email_agent.send_contact_created_notification(email, name)
+                success = self.email_agent.send_contact_created_notification(
+                    entities.get("email"), full_name(entities)
+                )
                 
             elif intent == "create_deal":
                 deal_name = entities.get("deal_name") or entities.get("name")
-                amount = None
-                if "amount" in entities:
-                    try:
-                        amount = float(entities["amount"].replace("$", "").replace(",", ""))
-                    except ValueError:
-                        pass
+                amount = parse_amount(entities.get("amount"))
                 
                 contact_email = entities.get("contact_email")
                 success = self.email_agent.send_deal_created_notification(
@@ -343,8 +703,6 @@ class AIAgentOrchestrator:
             else:
                 success = False
             
-            state["email_result"] = success
-            
             if success:
                 logger.info("Notification sent successfully")
             else:
@@ -352,14 +710,63 @@ class AIAgentOrchestrator:
             
         except Exception as e:
             logger.error(f"Error sending notification: {e}")
-            state["email_result"] = False
+            success = False
         
         # Mark workflow as completed
-        state["workflow_completed"] = True
+        return {"email_result": success, "workflow_completed": True}
+    
+    async def _asend_notification(self, state: WorkflowState) -> Dict[str, Any]:
+        """Send email notification without blocking the event loop"""
+        logger.info("Sending notification")
         
-        return state
+        try:
+            intent = state.get("intent")
+            entities = state.get("entities", {})
+            
+            if intent == "create_contact":
+                success = await self.email_agent.asend_contact_created_notification(
+                    entities.get("email"), full_name(entities)
+                )
+                
+            elif intent == "create_deal":
+                deal_name = entities.get("deal_name") or entities.get("name")
+                amount = parse_amount(entities.get("amount"))
+                
+                success = await self.email_agent.asend_deal_created_notification(
+                    deal_name, amount, entities.get("contact_email")
+                )
+            
+            else:
+                success = False
+            
+            if success:
+                logger.info("Notification sent successfully")
+            else:
+                logger.warning("Failed to send notification")
+            
+        except Exception as e:
+            logger.error(f"Error sending notification: {e}")
+            success = False
+        
+        return {"email_result": success, "workflow_completed": True}
     
-    def _handle_error(self, state: WorkflowState) -> WorkflowState:
+    def _create_and_notify(self, state: WorkflowState) -> Dict[str, Any]:
+        """Create the record in HubSpot, then send the notification"""
+        create = self._create_deal if state.get("intent") == "create_deal" else self._create_contact
+        update = create(state)
+        update.update(self._send_notification(state))
+        return update
+    
+    async def _acreate_and_notify(self, state: WorkflowState) -> Dict[str, Any]:
+        """Create the record in HubSpot while the notification is being sent"""
+        # The notification is built from the parsed entities, not the HubSpot
+        # response, so the two requests can run side by side
+        create = self._acreate_deal if state.get("intent") == "create_deal" else self._acreate_contact
+        update, notification = await asyncio.gather(create(state), self._asend_notification(state))
+        update.update(notification)
+        return update
+    
+    def _handle_error(self, state: WorkflowState) -> Dict[str, Any]:
         """Handle errors in the workflow"""
         logger.error(f"Workflow error: {state.get('error')}")
         
@@ -373,23 +780,12 @@ class AIAgentOrchestrator:
         except Exception as e:
             logger.error(f"Error sending error notification: {e}")
         
-        state["workflow_completed"] = True
-        return state
+        return {"workflow_completed": True}
     
-    def process_request(self, user_input: str) -> WorkflowResult:
-        """
-        Process a user request through the workflow
-        
-        Args:
-            user_input: User's request
-            
-        Returns:
-            WorkflowResult with the outcome
-        """
-        logger.info(f"Processing request: {user_input}")
-        
-        # Initialize state
-        initial_state = WorkflowState(
+    @staticmethod
+    def _initial_state(user_input: str) -> WorkflowState:
+        """Build the starting state for a request"""
+        return WorkflowState(
             user_input=user_input,
             intent=None,
             entities={},
@@ -402,45 +798,132 @@ class AIAgentOrchestrator:
             error=None,
             workflow_completed=False
         )
+    
+    @staticmethod
+    def _build_result(final_state: WorkflowState) -> WorkflowResult:
+        """Summarize a finished workflow state as a WorkflowResult"""
+        # Check for errors
+        if final_state.get("error"):
+            return WorkflowResult(
+                success=False,
+                message=f"Workflow failed: {final_state['error']}",
+                error=final_state["error"]
+            )
+        
+        # Determine success message based on intent
+        intent = final_state.get("intent")
+        if intent == "create_contact":
+            message = f"Contact created successfully for {final_state['entities'].get('email')}"
+        elif intent == "create_deal":
+            message = f"Deal created successfully: {final_state['entities'].get('deal_name', 'Unknown')}"
+        else:
+            message = "Workflow completed successfully"
+        
+        return WorkflowResult(
+            success=True,
+            message=message,
+            data={
+                "hubspot_result": final_state.get("hubspot_result"),
+                "email_sent": final_state.get("email_result", False),
+                "entities": final_state.get("entities")
+            }
+        )
+    
+    @staticmethod
+    def _failed_result(e: Exception) -> WorkflowResult:
+        """WorkflowResult for a workflow that raised"""
+        logger.error(f"Workflow execution failed: {e}")
+        return WorkflowResult(
+            success=False,
+            message=f"Workflow execution failed: {str(e)}",
+            error=str(e)
+        )
+    
+    def process_request(self, user_input: str) -> WorkflowResult:
+        """
+        Process a user request through the workflow
+        
+        Args:
+            user_input: User's request
+            
+        Returns:
+            WorkflowResult with the outcome
+        """
+        logger.info(f"Processing request: {user_input}")
         
         try:
             # Execute the workflow
-            final_state = self.workflow_graph.invoke(initial_state)
-            
-            # Check for errors
-            if final_state.get("error"):
-                return WorkflowResult(
-                    success=False,
-                    message=f"Workflow failed: {final_state['error']}",
-                    error=final_state["error"]
-                )
+            final_state = self.workflow_graph.invoke(self._initial_state(user_input))
+            return self._build_result(final_state)
             
-            # Determine success message based on intent
-            intent = final_state.get("intent")
-            if intent == "create_contact":
-                message = f"Contact created successfully for {final_state['entities'].get('email')}"
-            elif intent == "create_deal":
-                message = f"Deal created successfully: {final_state['entities'].get('deal_name', 'Unknown')}"
-            else:
-                message = "Workflow completed successfully"
+        except Exception as e:
+            return self._failed_result(e)
+    
+    def process_requests_batch(self, user_inputs: List[str]) -> List[WorkflowResult]:
+        """
+        Process many user requests, parsing them all up front
+        
+        Distinct inputs are parsed concurrently (up to ``gemini.max_concurrency``
+        Gemini calls at once), then each request runs through the workflow
+        from the preview step onward. Inputs that fail to parse are retried
+        by the workflow's own parse step so the error is reported as usual.
+        
+        Args:
+            user_inputs: User requests, e.g. rows from an import
             
-            return WorkflowResult(
-                success=True,
-                message=message,
-                data={
-                    "hubspot_result": final_state.get("hubspot_result"),
-                    "email_sent": final_state.get("email_result", False),
-                    "entities": final_state.get("entities")
-                }
-            )
+        Returns:
+            WorkflowResults in the same order as ``user_inputs``
+        """
+        logger.info(f"Processing batch of {len(user_inputs)} requests")
+        
+        unique_inputs = list(dict.fromkeys(user_inputs))
+        with ThreadPoolExecutor(max_workers=self._llm_max_concurrency,
+                                thread_name_prefix="gemini-parse") as executor:
+            parsed = dict(zip(unique_inputs, executor.map(self._try_parse_text, unique_inputs)))
+        
+        results = []
+        for user_input in user_inputs:
+            state = self._initial_state(user_input)
+            if parsed[user_input] is not None:
+                state.update(self._parse_update(*parsed[user_input]))
+            
+            try:
+                results.append(self._build_result(self.workflow_graph.invoke(state)))
+            except Exception as e:
+                results.append(self._failed_result(e))
+        
+        return results
+    
+    def _try_parse_text(self, user_input: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Parse a user input for a batch, returning None on failure"""
+        try:
+            return self._parse_text(user_input)
+        except Exception as e:
+            logger.warning(f"Batch parse failed, deferring to workflow: {e}")
+            return None
+    
+    async def aprocess_request(self, user_input: str) -> WorkflowResult:
+        """
+        Process a user request through the workflow without blocking the event loop
+        
+        Gemini and HubSpot calls are awaited; several requests can run
+        concurrently with ``asyncio.gather``, with Gemini calls capped by
+        ``gemini.max_concurrency``.
+        
+        Args:
+            user_input: User's request
+            
+        Returns:
+            WorkflowResult with the outcome
+        """
+        logger.info(f"Processing request: {user_input}")
+        
+        try:
+            final_state = await self.workflow_graph.ainvoke(self._initial_state(user_input))
+            return self._build_result(final_state)
             
         except Exception as e:
-            logger.error(f"Workflow execution failed: {e}")
-            return WorkflowResult(
-                success=False,
-                message=f"Workflow execution failed: {str(e)}",
-                error=str(e)
-            )
+            return self._failed_result(e)
     
     def get_available_actions(self) -> List[str]:
         """Get list of available actions"""
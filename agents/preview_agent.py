@@ -3,128 +3,194 @@ Preview Agent for Dynamic Overview and Editing
 Shows a preview of what will be created and allows editing before confirmation
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import re
+import sys
+from typing import Callable, Dict, List, Any, Optional, Union
+from dataclasses import dataclass, field, replace
 from agents.hubspot_agent import Contact, Deal
 
 logger = logging.getLogger(__name__)
 
+_BANNER = "=" * 60
 
-@dataclass
+# First number in a money string, with an optional k/m suffix: "$1,234.56", "1.2k", "USD 500"
+_AMOUNT_RE = re.compile(r"([-+]?\d[\d,]*(?:\.\d+)?|[-+]?\.\d+)\s*([kKmM])?\b")
+_AMOUNT_MULTIPLIERS = {"k": 1_000.0, "m": 1_000_000.0}
+
+# (label, field name, shown when the field is unset) for each preview line
+_CONTACT_FIELDS = (
+    ("Email:", "email", "Not provided"),
+    ("First Name:", "first_name", "Not provided"),
+    ("Last Name:", "last_name", "Not provided"),
+    ("Phone:", "phone", "Not provided"),
+    ("Company:", "company", "Not provided"),
+)
+_DEAL_FIELDS = (
+    ("Stage:", "stage", "appointmentscheduled"),
+    ("Close Date:", "close_date", "Not specified"),
+    ("Contact:", "contact_name", "Not specified"),
+    ("Contact Email:", "contact_email", "Not specified"),
+    ("Company:", "company", "Not specified"),
+)
+
+
+def parse_amount(value: Any) -> Optional[float]:
+    """
+    Parse a money amount from user or LLM text
+    
+    Args:
+        value: Amount as text (e.g. "$1,234.56", "1.2k", "USD 500") or a number
+        
+    Returns:
+        The amount as a float, or None if no number was found
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    
+    match = _AMOUNT_RE.search(value or "")
+    if not match:
+        return None
+    
+    amount = float(match.group(1).replace(",", ""))
+    suffix = match.group(2)
+    return amount * _AMOUNT_MULTIPLIERS[suffix.lower()] if suffix else amount
+
+
+def full_name(entities: Dict[str, Any]) -> str:
+    """Join parsed first and last names, skipping whichever is missing"""
+    return f"{entities.get('first_name', '')} {entities.get('last_name', '')}".strip()
+
+
+def default_deal_name(entities: Dict[str, Any]) -> str:
+    """Deal name to use when the request didn't give one"""
+    return f"Deal with {full_name(entities)} from {entities.get('company', '')}".strip()
+
+
+@dataclass(slots=True)
 class PreviewItem:
     """Represents a preview item that can be edited"""
     type: str  # "contact" or "deal"
-    data: Dict[str, Any]
     original_input: str
+    email: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    phone: Optional[str] = None
+    company: Optional[str] = None
+    deal_name: Optional[str] = None
+    amount: Optional[float] = None
+    stage: Optional[str] = None
+    close_date: Optional[str] = None
+    contact_email: Optional[str] = None
+    contact_name: Optional[str] = None
+    properties: Dict[str, Any] = field(default_factory=dict)
 
 
 class PreviewAgent:
     """Agent for handling dynamic previews and user confirmations"""
     
-    def __init__(self):
-        """Initialize the preview agent"""
+    def __init__(self, input_func: Optional[Callable[[str], str]] = None):
+        """
+        Initialize the preview agent
+        
+        Args:
+            input_func: Reads a line of user input given a prompt (defaults to
+                the built-in ``input``); front ends other than the CLI can
+                supply their own
+        """
         self.preview_items: List[PreviewItem] = []
+        self._input_func = input_func
+    
+    def _read(self, prompt: str) -> str:
+        """Read a line of user input"""
+        return (self._input_func or input)(prompt)
     
     def create_contact_preview(self, entities: Dict[str, Any], original_input: str) -> PreviewItem:
         """Create a preview for contact creation"""
-        preview_data = {
-            "email": entities.get("email", ""),
-            "first_name": entities.get("first_name", ""),
-            "last_name": entities.get("last_name", ""),
-            "phone": entities.get("phone", ""),
-            "company": entities.get("company", ""),
-            "properties": entities.get("properties", {})
-        }
-        
         return PreviewItem(
             type="contact",
-            data=preview_data,
-            original_input=original_input
+            original_input=original_input,
+            email=entities.get("email", ""),
+            first_name=entities.get("first_name", ""),
+            last_name=entities.get("last_name", ""),
+            phone=entities.get("phone", ""),
+            company=entities.get("company", ""),
+            properties=entities.get("properties", {})
         )
     
     def create_deal_preview(self, entities: Dict[str, Any], original_input: str) -> PreviewItem:
         """Create a preview for deal creation"""
-        amount = entities.get("amount")
-        if amount:
-            try:
-                amount = float(amount)
-            except (ValueError, TypeError):
-                amount = None
-        
-        preview_data = {
-            "deal_name": entities.get("deal_name") or entities.get("name") or f"Deal with {entities.get('first_name', '')} {entities.get('last_name', '')} from {entities.get('company', '')}".strip(),
-            "amount": amount,
-            "stage": entities.get("stage", "appointmentscheduled"),
-            "close_date": entities.get("close_date", ""),
-            "contact_email": entities.get("contact_email") or entities.get("email", ""),
-            "contact_name": entities.get("contact_name") or f"{entities.get('first_name', '')} {entities.get('last_name', '')}".strip(),
-            "company": entities.get("company", ""),
-            "properties": entities.get("properties", {})
-        }
+        amount = parse_amount(entities.get("amount"))
         
         return PreviewItem(
             type="deal",
-            data=preview_data,
-            original_input=original_input
+            original_input=original_input,
+            deal_name=entities.get("deal_name") or entities.get("name") or default_deal_name(entities),
+            amount=amount,
+            stage=entities.get("stage", "appointmentscheduled"),
+            close_date=entities.get("close_date", ""),
+            contact_email=entities.get("contact_email") or entities.get("email", ""),
+            contact_name=entities.get("contact_name") or full_name(entities),
+            company=entities.get("company", ""),
+            properties=entities.get("properties", {})
         )
     
     def display_preview(self, preview_item: PreviewItem) -> None:
         """Display a formatted preview of the item"""
-        print("\n" + "="*60)
-        print("PREVIEW - Review Before Creating")
-        print("="*60)
+        lines = ["", _BANNER, "PREVIEW - Review Before Creating", _BANNER]
         
         if preview_item.type == "contact":
-            self._display_contact_preview(preview_item)
+            lines += self._format_contact_preview(preview_item)
         elif preview_item.type == "deal":
-            self._display_deal_preview(preview_item)
+            lines += self._format_deal_preview(preview_item)
+        
+        lines.append(_BANNER)
         
-        print("="*60)
+        # One write for the whole preview
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
-    def _display_contact_preview(self, preview_item: PreviewItem) -> None:
-        """Display contact preview"""
-        print("CONTACT TO BE CREATED:")
-        print()
-        data = preview_item.data
-        
-        print(f"Email:          {data.get('email', 'Not provided')}")
-        print(f"First Name:     {data.get('first_name', 'Not provided')}")
-        print(f"Last Name:      {data.get('last_name', 'Not provided')}")
-        print(f"Phone:          {data.get('phone', 'Not provided')}")
-        print(f"Company:        {data.get('company', 'Not provided')}")
-        
-        if data.get('properties'):
-            print("\nAdditional Properties:")
-            for key, value in data['properties'].items():
-                print(f"   {key}: {value}")
-    
-    def _display_deal_preview(self, preview_item: PreviewItem) -> None:
-        """Display deal preview"""
-        print("DEAL TO BE CREATED:")
-        print()
-        data = preview_item.data
-        
-        print(f"Deal Name:      {data.get('deal_name', 'Not provided')}")
-        if data.get('amount'):
-            print(f"Amount:         ${data.get('amount', 0):,.2f}")
-        else:
-            print("Amount:         Not specified")
-        print(f"Stage:          {data.get('stage', 'appointmentscheduled')}")
-        print(f"Close Date:     {data.get('close_date', 'Not specified')}")
-        print(f"Contact:        {data.get('contact_name', 'Not specified')}")
-        print(f"Contact Email:  {data.get('contact_email', 'Not specified')}")
-        print(f"Company:        {data.get('company', 'Not specified')}")
-        
-        if data.get('properties'):
-            print("\nAdditional Properties:")
-            for key, value in data['properties'].items():
-                print(f"   {key}: {value}")
-    
-    def get_user_confirmation(self) -> bool:
+    @staticmethod
+    def _format_fields(item: PreviewItem, fields) -> List[str]:
+        """Format labelled preview lines"""
+        lines = []
+        for label, name, missing in fields:
+            value = getattr(item, name)
+            lines.append(f"{label:<16}{missing if value is None else value}")
+        return lines
+    
+    @staticmethod
+    def _format_properties(item: PreviewItem) -> List[str]:
+        """Format any additional properties"""
+        if not item.properties:
+            return []
+        return ["", "Additional Properties:"] + [
+            f"   {key}: {value}" for key, value in item.properties.items()
+        ]
+    
+    def _format_contact_preview(self, preview_item: PreviewItem) -> List[str]:
+        """Format contact preview lines"""
+        return (
+            ["CONTACT TO BE CREATED:", ""]
+            + self._format_fields(preview_item, _CONTACT_FIELDS)
+            + self._format_properties(preview_item)
+        )
+    
+    def _format_deal_preview(self, preview_item: PreviewItem) -> List[str]:
+        """Format deal preview lines"""
+        amount = f"${preview_item.amount:,.2f}" if preview_item.amount else "Not specified"
+        deal_name = preview_item.deal_name if preview_item.deal_name is not None else "Not provided"
+        return (
+            ["DEAL TO BE CREATED:", "", f"{'Deal Name:':<16}{deal_name}", f"{'Amount:':<16}{amount}"]
+            + self._format_fields(preview_item, _DEAL_FIELDS)
+            + self._format_properties(preview_item)
+        )
+    
+    def get_user_confirmation(self) -> Union[bool, str]:
         """Get user confirmation to proceed"""
         while True:
-            response = input("\nDo you want to create this? (y/n/edit): ").strip().lower()
+            response = self._read("\nDo you want to create this? (y/n/edit): ").strip().lower()
             if response in ['y', 'yes']:
                 return True
             elif response in ['n', 'no']:
@@ -134,120 +200,117 @@ class PreviewAgent:
             else:
                 print("Please enter 'y' for yes, 'n' for no, or 'edit' to modify")
     
+    async def aget_user_confirmation(self) -> Union[bool, str]:
+        """Get user confirmation on a worker thread, leaving the event loop free"""
+        return await asyncio.to_thread(self.get_user_confirmation)
+    
     def edit_preview(self, preview_item: PreviewItem) -> PreviewItem:
         """Allow user to edit the preview"""
         print("\nEDITING MODE")
         print("Enter new values or press Enter to keep current values")
         print()
         
-        data = preview_item.data
+        # Edit a copy so the original preview is left untouched
+        edited = replace(preview_item, properties=dict(preview_item.properties))
         
-        if preview_item.type == "contact":
-            data = self._edit_contact_data(data)
-        elif preview_item.type == "deal":
-            data = self._edit_deal_data(data)
+        if edited.type == "contact":
+            self._edit_contact_data(edited)
+        elif edited.type == "deal":
+            self._edit_deal_data(edited)
         
-        # Create new preview item with edited data
-        return PreviewItem(
-            type=preview_item.type,
-            data=data,
-            original_input=preview_item.original_input
-        )
+        return edited
     
-    def _edit_contact_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Edit contact data"""
+    async def aedit_preview(self, preview_item: PreviewItem) -> PreviewItem:
+        """Edit the preview on a worker thread, leaving the event loop free"""
+        return await asyncio.to_thread(self.edit_preview, preview_item)
+    
+    def _edit_contact_data(self, item: PreviewItem) -> None:
+        """Edit contact fields in place"""
         print("Email:")
-        new_email = input(f"   Current: {data.get('email', '')} → New: ").strip()
+        new_email = self._read(f"   Current: {item.email or ''} → New: ").strip()
         if new_email:
-            data['email'] = new_email
+            item.email = new_email
         
         print("\nFirst Name:")
-        new_first = input(f"   Current: {data.get('first_name', '')} → New: ").strip()
+        new_first = self._read(f"   Current: {item.first_name or ''} → New: ").strip()
         if new_first:
-            data['first_name'] = new_first
+            item.first_name = new_first
         
         print("\nLast Name:")
-        new_last = input(f"   Current: {data.get('last_name', '')} → New: ").strip()
+        new_last = self._read(f"   Current: {item.last_name or ''} → New: ").strip()
         if new_last:
-            data['last_name'] = new_last
+            item.last_name = new_last
         
         print("\nPhone:")
-        new_phone = input(f"   Current: {data.get('phone', '')} → New: ").strip()
+        new_phone = self._read(f"   Current: {item.phone or ''} → New: ").strip()
         if new_phone:
-            data['phone'] = new_phone
+            item.phone = new_phone
         
         print("\nCompany:")
-        new_company = input(f"   Current: {data.get('company', '')} → New: ").strip()
+        new_company = self._read(f"   Current: {item.company or ''} → New: ").strip()
         if new_company:
-            data['company'] = new_company
-        
-        return data
+            item.company = new_company
     
-    def _edit_deal_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Edit deal data"""
+    def _edit_deal_data(self, item: PreviewItem) -> None:
+        """Edit deal fields in place"""
         print("Deal Name:")
-        new_name = input(f"   Current: {data.get('deal_name', '')} → New: ").strip()
+        new_name = self._read(f"   Current: {item.deal_name or ''} → New: ").strip()
         if new_name:
-            data['deal_name'] = new_name
+            item.deal_name = new_name
         
         print("\nAmount:")
-        current_amount = f"${data.get('amount', 0):,.2f}" if data.get('amount') else "Not specified"
-        new_amount = input(f"   Current: {current_amount} → New: ").strip()
+        current_amount = f"${item.amount:,.2f}" if item.amount else "Not specified"
+        new_amount = self._read(f"   Current: {current_amount} → New: ").strip()
         if new_amount:
-            try:
-                # Remove currency symbols and parse
-                clean_amount = new_amount.replace('$', '').replace(',', '').strip()
-                data['amount'] = float(clean_amount)
-            except ValueError:
+            amount = parse_amount(new_amount)
+            if amount is None:
                 print("   Invalid amount format, keeping current value")
+            else:
+                item.amount = amount
         
         print("\nStage:")
-        new_stage = input(f"   Current: {data.get('stage', '')} → New: ").strip()
+        new_stage = self._read(f"   Current: {item.stage or ''} → New: ").strip()
         if new_stage:
-            data['stage'] = new_stage
+            item.stage = new_stage
         
         print("\nClose Date (YYYY-MM-DD):")
-        new_date = input(f"   Current: {data.get('close_date', '')} → New: ").strip()
+        new_date = self._read(f"   Current: {item.close_date or ''} → New: ").strip()
         if new_date:
-            data['close_date'] = new_date
+            item.close_date = new_date
         
         print("\nContact Name:")
-        new_contact = input(f"   Current: {data.get('contact_name', '')} → New: ").strip()
+        new_contact = self._read(f"   Current: {item.contact_name or ''} → New: ").strip()
         if new_contact:
-            data['contact_name'] = new_contact
+            item.contact_name = new_contact
         
         print("\nContact Email:")
-        new_email = input(f"   Current: {data.get('contact_email', '')} → New: ").strip()
+        new_email = self._read(f"   Current: {item.contact_email or ''} → New: ").strip()
         if new_email:
-            data['contact_email'] = new_email
+            item.contact_email = new_email
         
         print("\nCompany:")
-        new_company = input(f"   Current: {data.get('company', '')} → New: ").strip()
+        new_company = self._read(f"   Current: {item.company or ''} → New: ").strip()
         if new_company:
-            data['company'] = new_company
-        
-        return data
+            item.company = new_company
     
     def create_contact_from_preview(self, preview_item: PreviewItem) -> Contact:
         """Create a Contact object from preview data"""
-        data = preview_item.data
         return Contact(
-            email=data['email'],
-            first_name=data.get('first_name'),
-            last_name=data.get('last_name'),
-            phone=data.get('phone'),
-            company=data.get('company'),
-            properties=data.get('properties')
+            email=preview_item.email,
+            first_name=preview_item.first_name,
+            last_name=preview_item.last_name,
+            phone=preview_item.phone,
+            company=preview_item.company,
+            properties=preview_item.properties
         )
     
     def create_deal_from_preview(self, preview_item: PreviewItem) -> Deal:
         """Create a Deal object from preview data"""
-        data = preview_item.data
         return Deal(
-            deal_name=data['deal_name'],
-            amount=data.get('amount'),
-            stage=data.get('stage'),
-            close_date=data.get('close_date'),
-            contact_email=data.get('contact_email'),
-            properties=data.get('properties')
+            deal_name=preview_item.deal_name,
+            amount=preview_item.amount,
+            stage=preview_item.stage,
+            close_date=preview_item.close_date,
+            contact_email=preview_item.contact_email,
+            properties=preview_item.properties
         )
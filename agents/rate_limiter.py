@@ -0,0 +1,63 @@
+"""
+Token Bucket Rate Limiter
+Paces calls to rate-limited APIs from both threads and coroutines
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Token bucket that refills continuously at a fixed rate"""
+
+    def __init__(self, rate: float, period: float = 60.0, capacity: Optional[float] = None):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per period
+            period: Length of the period in seconds
+            capacity: Maximum tokens held at once (defaults to ``rate``)
+        """
+        if rate <= 0 or period <= 0:
+            raise ValueError("Token bucket rate and period must be positive")
+
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.fill_rate = rate / period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """
+        Take tokens from the bucket, borrowing against future refills if needed
+
+        Callers that borrow wait for their share to refill, so concurrent
+        callers are served in the order they reserved.
+
+        Returns:
+            Seconds the caller must wait before proceeding
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.fill_rate
+
+    def acquire(self, amount: float = 1) -> None:
+        """Block the calling thread until ``amount`` tokens are available"""
+        wait = self._reserve(amount)
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self, amount: float = 1) -> None:
+        """Wait without blocking the event loop until ``amount`` tokens are available"""
+        wait = self._reserve(amount)
+        if wait:
+            await asyncio.sleep(wait)
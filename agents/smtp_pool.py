@@ -0,0 +1,125 @@
+"""
+SMTP Connection Pool
+Keeps a bounded set of authenticated SMTP connections for concurrent sends
+"""
+
+import smtplib
+import logging
+import queue
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledConnection:
+    """An SMTP connection slot and the number of messages sent over it"""
+
+    def __init__(self):
+        self.server: Optional[smtplib.SMTP] = None
+        self.send_count = 0
+
+
+class SMTPConnectionPool:
+    """Pool of reusable SMTP connections with a per-connection message cap"""
+
+    def __init__(self, host: str, port: int, user: str, password: str,
+                 size: int = 5, max_messages_per_connection: int = 100):
+        """
+        Initialize the connection pool
+
+        Connections are opened lazily, the first time a slot is acquired.
+
+        Args:
+            host: SMTP server host
+            port: SMTP server port
+            user: SMTP username
+            password: SMTP password
+            size: Maximum number of open connections
+            max_messages_per_connection: Messages to send before a connection is recycled
+        """
+        if size < 1:
+            raise ValueError("SMTP pool size must be at least 1")
+
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.size = size
+        self.max_messages_per_connection = max_messages_per_connection
+
+        # LIFO so the most recently used (warmest) connection is handed out first
+        self._slots: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._slots.put(_PooledConnection())
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open a new authenticated SMTP connection"""
+        server = smtplib.SMTP(self.host, self.port)
+        server.starttls()
+        server.login(self.user, self.password)
+        return server
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        """Check a connection with NOOP"""
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _reset(slot: _PooledConnection) -> None:
+        """Close a slot's connection without raising"""
+        server, slot.server = slot.server, None
+        slot.send_count = 0
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[smtplib.SMTP]:
+        """
+        Borrow a connection from the pool
+
+        The connection is validated with NOOP and replaced if it is dead or
+        has reached the per-connection message cap. If the body of the
+        ``with`` block raises, the connection is discarded rather than reused.
+
+        Args:
+            timeout: Seconds to wait for a free connection (None waits forever)
+
+        Yields:
+            An authenticated SMTP connection
+        """
+        slot = self._slots.get(timeout=timeout)
+        try:
+            if (slot.server is None
+                    or slot.send_count >= self.max_messages_per_connection
+                    or not self._is_alive(slot.server)):
+                self._reset(slot)
+                slot.server = self._connect()
+
+            yield slot.server
+            slot.send_count += 1
+        except BaseException:
+            self._reset(slot)
+            raise
+        finally:
+            self._slots.put(slot)
+
+    def close(self) -> None:
+        """Close all idle connections in the pool"""
+        idle = []
+        while True:
+            try:
+                idle.append(self._slots.get_nowait())
+            except queue.Empty:
+                break
+
+        for slot in idle:
+            self._reset(slot)
+            self._slots.put(slot)
@@ -3,19 +3,82 @@ Configuration Manager for AI Agent Workflow System
 Handles loading and validation of configuration settings
 """
 
-import json
 import os
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 from pathlib import Path
 import logging
+import orjson
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
+# Extra environment variables checked, in order, after the dotted key's own
+# (e.g. EMAIL_USERNAME for "email.username")
+_ENV_ALIASES = {
+    "email.username": ("SMTP_USER", "EMAIL_USERNAME"),
+    "email.password": ("SMTP_PASS", "EMAIL_PASSWORD"),
+    "email.smtp_server": ("SMTP_HOST",),
+    "email.smtp_port": ("SMTP_PORT",),
+}
+
+# Settings that must hold real values, not the "your-..." template placeholders
+_CREDENTIAL_KEYS = ("gemini.api_key", "hubspot.api_key", "email.username")
+_PLACEHOLDER_PREFIX = "your-"
+
+# Cached marker for keys that resolved to nothing
+_MISSING = object()
+
+_dotenv_loaded = False
+
+# Written when no config file exists; every fresh config is parsed from the
+# serialized form so instances never share nested dicts
+_DEFAULT_CONFIG = {
+    "gemini": {
+        "api_key": "your-gemini-api-key-here",
+        "model": "gemini-2.5-flash",
+        "temperature": 0.7,
+        "max_tokens": 1000
+    },
+    "hubspot": {
+        "api_key": "your-hubspot-api-key-here",
+        "base_url": "https://api.hubapi.com"
+    },
+    "email": {
+        "smtp_server": "smtp.gmail.com",
+        "smtp_port": 587,
+        "username": "your-email@gmail.com",
+        "password": "your-app-password-here"
+    },
+    "logging": {
+        "level": "INFO",
+        "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    }
+}
+_DEFAULT_CONFIG_JSON = orjson.dumps(_DEFAULT_CONFIG, option=orjson.OPT_INDENT_2)
+
+# Config file contents by absolute path, with the (mtime_ns, size) they were read at
+_FILE_CACHE: Dict[str, Tuple[int, int, bytes]] = {}
+
+
+def _is_placeholder(value: Any) -> bool:
+    """Whether a credential is unset or still the template placeholder"""
+    return not value or str(value).startswith(_PLACEHOLDER_PREFIX)
+
+
+def _ensure_dotenv() -> None:
+    """Load the .env file into the environment once per process"""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
+
 
 class ConfigManager:
     """Manages configuration settings for the AI Agent Workflow System"""
     
+    __slots__ = ("config_path", "_config", "_flat", "_sections", "_configured")
+    
     def __init__(self, config_path: str = "config/config.json"):
         """
         Initialize the configuration manager
@@ -25,64 +88,102 @@ class ConfigManager:
         """
         self.config_path = Path(config_path)
         # Load environment variables from .env file
-        load_dotenv()
-        self.config: Dict[str, Any] = {}
-        self.load_config()
+        _ensure_dotenv()
+        # Parsed on first access, so callers that never read settings skip the file
+        self._config: Optional[Dict[str, Any]] = None
+        # Resolved view of the config by dotted key, built on first use and
+        # dropped whenever the config is reloaded
+        self._flat: Optional[Dict[str, Any]] = None
+        self._sections: Dict[str, Mapping[str, Any]] = {}
+        self._configured = False
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle/copy only the settings; the resolved views are rebuilt on use"""
+        return {
+            "config_path": self.config_path,
+            "_config": self._config,
+        }
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.config_path = state["config_path"]
+        self._config = state["_config"]
+        self._flat = None
+        self._sections = {}
+        self._configured = False
+    
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any], config_path: str = "config/config.json") -> "ConfigManager":
+        """
+        Create a configuration manager from settings already in memory
+        
+        Args:
+            config: Configuration settings, in the same layout as the JSON file
+            config_path: File read only if load_config() is called later
+        
+        Returns:
+            ConfigManager holding its own copy of the settings
+        """
+        manager = cls(config_path)
+        # Round-trip so the manager never shares (and mutates) the caller's dicts
+        manager._config = orjson.loads(orjson.dumps(config))
+        manager.validate_config()
+        return manager
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuration settings, loaded from the file on first access"""
+        if self._config is None:
+            self.load_config()
+        return self._config
     
     def load_config(self) -> None:
         """Load configuration from JSON file"""
+        self.invalidate()
         try:
-            if not self.config_path.exists():
+            try:
+                raw = self._read_config_file()
+            except FileNotFoundError:
                 logger.warning(f"Config file not found at {self.config_path}")
                 self.create_default_config()
                 return
             
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
+            # Parse per instance so callers never share (and mutate) one dict
+            self._config = orjson.loads(raw)
             
             logger.info("Configuration loaded successfully")
             self.validate_config()
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in config file: {e}")
+            self._config = None
             raise
         except Exception as e:
             logger.error(f"Error loading config: {e}")
+            self._config = None
             raise
     
+    def _read_config_file(self) -> bytes:
+        """Read the config file, reusing the last read if it hasn't changed"""
+        path = os.path.abspath(self.config_path)
+        st = os.stat(path)
+        
+        cached = _FILE_CACHE.get(path)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        
+        raw = self.config_path.read_bytes()
+        _FILE_CACHE[path] = (st.st_mtime_ns, st.st_size, raw)
+        return raw
+    
     def create_default_config(self) -> None:
         """Create a default configuration file"""
-        default_config = {
-            "gemini": {
-                "api_key": "your-gemini-api-key-here",
-                "model": "gemini-pro",
-                "temperature": 0.7,
-                "max_tokens": 1000
-            },
-            "hubspot": {
-                "api_key": "your-hubspot-api-key-here",
-                "base_url": "https://api.hubapi.com"
-            },
-            "email": {
-                "smtp_server": "smtp.gmail.com",
-                "smtp_port": 587,
-                "username": "your-email@gmail.com",
-                "password": "your-app-password-here"
-            },
-            "logging": {
-                "level": "INFO",
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            }
-        }
-        
         # Ensure config directory exists
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(default_config, f, indent=4)
+        self.config_path.write_bytes(_DEFAULT_CONFIG_JSON)
         
         logger.info(f"Default configuration created at {self.config_path}")
-        self.config = default_config
+        self._config = orjson.loads(_DEFAULT_CONFIG_JSON)
     
     def validate_config(self) -> None:
         """Validate that required configuration keys are present"""
@@ -94,21 +195,32 @@ class ConfigManager:
                 raise ValueError(f"Missing required configuration section: {section}")
         
         # Validate Gemini config
-        if not self.config["gemini"].get("api_key") or self.config["gemini"]["api_key"].startswith("your-"):
+        if _is_placeholder(self.config["gemini"].get("api_key")):
             logger.warning("Gemini API key not configured")
         
         # Validate HubSpot config
-        if not self.config["hubspot"].get("api_key") or self.config["hubspot"]["api_key"].startswith("your-"):
+        if _is_placeholder(self.config["hubspot"].get("api_key")):
             logger.warning("HubSpot API key not configured")
         
         # Validate email config
-        if not self.config["email"].get("username") or self.config["email"]["username"].startswith("your-"):
+        if _is_placeholder(self.config["email"].get("username")):
             logger.warning("Email credentials not configured")
     
+    def invalidate(self) -> None:
+        """Drop the resolved snapshot so edits made to ``config`` take effect"""
+        self._flat = None
+        self._sections = {}
+        self._configured = False
+    
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get a configuration value using dot notation with environment variable fallback
         
+        Values come from a flattened snapshot of the config, with environment
+        overrides applied, that is kept until the config is reloaded. Changes
+        made directly to ``config`` are not seen until load_config() or
+        invalidate() is called.
+        
         Args:
             key: Configuration key (e.g., 'gemini.api_key')
             default: Default value if key not found
@@ -116,64 +228,85 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
-        # First try to get from environment variables
-        env_key = key.upper().replace('.', '_')
-        env_value = os.getenv(env_key)
-        
-        # Handle special mappings for email configuration
-        if key == "email.username" and not env_value:
-            env_value = os.getenv("SMTP_USER") or os.getenv("EMAIL_USERNAME")
-        elif key == "email.password" and not env_value:
-            env_value = os.getenv("SMTP_PASS") or os.getenv("EMAIL_PASSWORD")
-        elif key == "email.smtp_server" and not env_value:
-            env_value = os.getenv("SMTP_HOST")
-        elif key == "email.smtp_port" and not env_value:
-            env_value = os.getenv("SMTP_PORT")
-        
-        if env_value:
-            return env_value
-        
-        # Fallback to config file
-        keys = key.split('.')
-        value = self.config
+        flat = self._flat
+        if flat is None:
+            flat = self._snapshot()
         
         try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+            value = flat[key]
+        except KeyError:
+            # Not in the config file, so only the environment can supply it
+            value = flat[key] = self._env_value(key)
+        return default if value is _MISSING else value
     
-    def get_gemini_config(self) -> Dict[str, Any]:
-        """Get Gemini configuration"""
-        gemini_config = self.config.get("gemini", {}).copy()
+    @staticmethod
+    def _env_value(key: str) -> Any:
+        """Environment override for a dotted key, or _MISSING"""
+        for env_key in (key.upper().replace('.', '_'),) + _ENV_ALIASES.get(key, ()):
+            env_value = os.getenv(env_key)
+            if env_value:
+                return env_value
+        return _MISSING
+    
+    def _snapshot(self) -> Dict[str, Any]:
+        """Flatten the config to dotted keys and apply environment overrides once"""
+        flat: Dict[str, Any] = {}
+        stack = [("", self.config)]
+        while stack:
+            prefix, section = stack.pop()
+            for name, value in section.items():
+                key = prefix + name
+                flat[key] = value
+                if isinstance(value, dict):
+                    stack.append((key + ".", value))
+        
+        for key in list(flat):
+            env_value = self._env_value(key)
+            if env_value is not _MISSING:
+                flat[key] = env_value
         
+        gemini_config = dict(self.config.get("gemini", {}))
         # Override with environment variables if available
-        if os.getenv("GEMINI_API_KEY"):
-            gemini_config["api_key"] = os.getenv("GEMINI_API_KEY")
+        gemini_api_key = self._env_value("gemini.api_key")
+        if gemini_api_key is not _MISSING:
+            gemini_config["api_key"] = gemini_api_key
         
-        return gemini_config
+        # Read-only views over copies, so they stay in step with the flat
+        # snapshot and callers can share them without copying
+        self._sections = {
+            "gemini": MappingProxyType(gemini_config),
+            "hubspot": MappingProxyType(dict(self.config.get("hubspot", {}))),
+            "email": MappingProxyType(dict(self.config.get("email", {}))),
+            "logging": MappingProxyType(dict(self.config.get("logging", {}))),
+        }
+        self._flat = flat
+        self._configured = not any(_is_placeholder(self.get(key)) for key in _CREDENTIAL_KEYS)
+        return flat
+    
+    def _section(self, name: str) -> Mapping[str, Any]:
+        """Resolved, read-only view of one config section"""
+        if self._flat is None:
+            self._snapshot()
+        return self._sections[name]
+    
+    def get_gemini_config(self) -> Mapping[str, Any]:
+        """Get Gemini configuration"""
+        return self._section("gemini")
     
-    def get_hubspot_config(self) -> Dict[str, Any]:
+    def get_hubspot_config(self) -> Mapping[str, Any]:
         """Get HubSpot configuration"""
-        return self.config.get("hubspot", {})
+        return self._section("hubspot")
     
-    def get_email_config(self) -> Dict[str, Any]:
+    def get_email_config(self) -> Mapping[str, Any]:
         """Get email configuration"""
-        return self.config.get("email", {})
+        return self._section("email")
     
-    def get_logging_config(self) -> Dict[str, Any]:
+    def get_logging_config(self) -> Mapping[str, Any]:
         """Get logging configuration"""
-        return self.config.get("logging", {})
+        return self._section("logging")
     
     def is_configured(self) -> bool:
         """Check if all required credentials are configured"""
-        gemini_key = self.get("gemini.api_key", "")
-        hubspot_key = self.get("hubspot.api_key", "")
-        email_user = self.get("email.username", "")
-        
-        return (
-            gemini_key and not gemini_key.startswith("your-") and
-            hubspot_key and not hubspot_key.startswith("your-") and
-            email_user and not email_user.startswith("your-")
-        )
+        if self._flat is None:
+            self._snapshot()
+        return self._configured
@@ -6,8 +6,6 @@ Shows the system capabilities with sample data
 
 import logging
 import sys
-from config.config_manager import ConfigManager
-from agents.orchestrator import AIAgentOrchestrator
 
 # Configure logging
 logging.basicConfig(
@@ -18,11 +16,60 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Static demo pages, built once at import
+_ARCHITECTURE_TEXT = """
+┌─────────────────┐    ┌──────────────────┐    ┌─────────────────┐
+│   User Input    │───▶│   Orchestrator   │───▶│   HubSpot API   │
+│                 │    │   (LangGraph)    │    │                 │
+└─────────────────┘    └──────────────────┘    └─────────────────┘
+                                │
+                                ▼
+                       ┌──────────────────┐
+                       │   Email Agent    │
+                       │   (SMTP/Gmail)   │
+                       └──────────────────┘
+
+Components:
+• Orchestrator: Main workflow engine using LangGraph
+• HubSpot Agent: Handles CRM operations (contacts, deals)
+• Email Agent: Manages email notifications
+• Config Manager: Handles configuration and API keys
+• Main App: CLI interface and application entry point
+    """
+
+_TECH_STACK_TEXT = """
+Backend:
+• Python 3.10+ - Core language
+• LangChain - LLM orchestration framework
+• LangGraph - Workflow execution engine
+• OpenAI API - GPT-4 for natural language processing
+• Requests - HTTP client for API calls
+
+Integrations:
+• HubSpot API - CRM operations
+• Gmail SMTP - Email notifications
+
+Testing & Tools:
+• Pytest - Testing framework
+• Git - Version control
+• Structlog - Structured logging
+    """
+
+
+def _write(lines):
+    """Write a block of output lines with a single write"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def _section(title, width=50):
+    """Lines for a section banner"""
+    return ["", "=" * width, title, "=" * width]
+
+
 def demo_contact_creation():
     """Demo contact creation workflow"""
-    print("\n" + "="*50)
-    print("📞 DEMO: Contact Creation")
-    print("="*50)
+    lines = _section("📞 DEMO: Contact Creation")
     
     demo_requests = [
         "Create a contact John Smith, john.smith@example.com, at TechCorp",
@@ -31,15 +78,15 @@ def demo_contact_creation():
     ]
     
     for request in demo_requests:
-        print(f"\n💬 Request: {request}")
-        print("   Expected: Contact created in HubSpot + Email notification")
+        lines.append(f"\n💬 Request: {request}")
+        lines.append("   Expected: Contact created in HubSpot + Email notification")
+    
+    _write(lines)
 
 
 def demo_deal_creation():
     """Demo deal creation workflow"""
-    print("\n" + "="*50)
-    print("💰 DEMO: Deal Creation")
-    print("="*50)
+    lines = _section("💰 DEMO: Deal Creation")
     
     demo_requests = [
         "Create a deal for $5,000 with John Smith from TechCorp",
@@ -48,15 +95,15 @@ def demo_deal_creation():
     ]
     
     for request in demo_requests:
-        print(f"\n💬 Request: {request}")
-        print("   Expected: Deal created in HubSpot + Email notification")
+        lines.append(f"\n💬 Request: {request}")
+        lines.append("   Expected: Deal created in HubSpot + Email notification")
+    
+    _write(lines)
 
 
 def demo_complex_workflows():
     """Demo complex workflow scenarios"""
-    print("\n" + "="*50)
-    print("🔄 DEMO: Complex Workflows")
-    print("="*50)
+    lines = _section("🔄 DEMO: Complex Workflows")
     
     demo_requests = [
         "Add new prospect Lisa Chen, lisa@enterprise.com, she's interested in our premium package worth $50,000",
@@ -65,67 +112,25 @@ def demo_complex_workflows():
     ]
     
     for request in demo_requests:
-        print(f"\n💬 Request: {request}")
-        print("   Expected: Contact + Deal created + Both associated + Email notifications")
+        lines.append(f"\n💬 Request: {request}")
+        lines.append("   Expected: Contact + Deal created + Both associated + Email notifications")
+    
+    _write(lines)
 
 
 def show_system_architecture():
     """Show system architecture"""
-    print("\n" + "="*50)
-    print("🏗️ SYSTEM ARCHITECTURE")
-    print("="*50)
-    
-    print("""
-┌─────────────────┐    ┌──────────────────┐    ┌─────────────────┐
-│   User Input    │───▶│   Orchestrator   │───▶│   HubSpot API   │
-│                 │    │   (LangGraph)    │    │                 │
-└─────────────────┘    └──────────────────┘    └─────────────────┘
-                                │
-                                ▼
-                       ┌──────────────────┐
-                       │   Email Agent    │
-                       │   (SMTP/Gmail)   │
-                       └──────────────────┘
-
-Components:
-• Orchestrator: Main workflow engine using LangGraph
-• HubSpot Agent: Handles CRM operations (contacts, deals)
-• Email Agent: Manages email notifications
-• Config Manager: Handles configuration and API keys
-• Main App: CLI interface and application entry point
-    """)
+    _write(_section("🏗️ SYSTEM ARCHITECTURE") + [_ARCHITECTURE_TEXT])
 
 
 def show_technology_stack():
     """Show technology stack"""
-    print("\n" + "="*50)
-    print("🛠️ TECHNOLOGY STACK")
-    print("="*50)
-    
-    print("""
-Backend:
-• Python 3.10+ - Core language
-• LangChain - LLM orchestration framework
-• LangGraph - Workflow execution engine
-• OpenAI API - GPT-4 for natural language processing
-• Requests - HTTP client for API calls
-
-Integrations:
-• HubSpot API - CRM operations
-• Gmail SMTP - Email notifications
-
-Testing & Tools:
-• Pytest - Testing framework
-• Git - Version control
-• Structlog - Structured logging
-    """)
+    _write(_section("🛠️ TECHNOLOGY STACK") + [_TECH_STACK_TEXT])
 
 
 def show_features():
     """Show system features"""
-    print("\n" + "="*50)
-    print("✨ FEATURES")
-    print("="*50)
+    lines = _section("✨ FEATURES")
     
     features = [
         "Natural Language Processing - Parse user requests in plain English",
@@ -139,17 +144,19 @@ def show_features():
         "Logging - Comprehensive logging throughout the system"
     ]
     
-    for i, feature in enumerate(features, 1):
-        print(f"{i:2}. {feature}")
+    lines += [f"{i:2}. {feature}" for i, feature in enumerate(features, 1)]
+    _write(lines)
 
 
 def main():
     """Main demo function"""
-    print("🤖 AI Agent Workflow System - Demo")
-    print("="*60)
-    print("This demo shows the capabilities of the AI Agent Workflow System")
-    print("without requiring actual API credentials.")
-    print()
+    _write([
+        "🤖 AI Agent Workflow System - Demo",
+        "=" * 60,
+        "This demo shows the capabilities of the AI Agent Workflow System",
+        "without requiring actual API credentials.",
+        ""
+    ])
     
     show_features()
     show_system_architecture()
@@ -158,21 +165,20 @@ def main():
     demo_deal_creation()
     demo_complex_workflows()
     
-    print("\n" + "="*60)
-    print("🚀 READY TO GET STARTED?")
-    print("="*60)
-    print()
-    print("1. Run the quick start script:")
-    print("   python quick_start.py")
-    print()
-    print("2. Update your API credentials in config/config.json")
-    print()
-    print("3. Start the system:")
-    print("   python main.py")
-    print()
-    print("4. Try some of the demo requests above!")
-    print()
-    print("📖 For detailed instructions, see README.md")
+    _write(_section("🚀 READY TO GET STARTED?", width=60) + [
+        "",
+        "1. Run the quick start script:",
+        "   python quick_start.py",
+        "",
+        "2. Update your API credentials in config/config.json",
+        "",
+        "3. Start the system:",
+        "   python main.py",
+        "",
+        "4. Try some of the demo requests above!",
+        "",
+        "📖 For detailed instructions, see README.md"
+    ])
 
 
 if __name__ == "__main__":
@@ -3,20 +3,39 @@ Main Entry Point for AI Agent Workflow System
 CLI application for interacting with the AI agent workflow
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import argparse
-from typing import Optional
-from config.config_manager import ConfigManager
-from agents.orchestrator import AIAgentOrchestrator, WorkflowResult
+from typing import List, Optional, TYPE_CHECKING
 
-# Configure logging
+# The orchestrator pulls in LangGraph and the Gemini SDK, so it is imported
+# only once the app initializes; --help and argument errors stay fast
+if TYPE_CHECKING:
+    from agents.orchestrator import WorkflowResult
+
+# Log file writes happen on a listener thread, so request handling never waits
+# on disk; the file is only created once something is logged
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.handlers.RotatingFileHandler(
+        'ai_agent_workflow.log', maxBytes=5 * 1024 * 1024, backupCount=3,
+        encoding='utf-8', delay=True
+    )
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Configure logging; the queue handler formats records before they are queued
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler('ai_agent_workflow.log')
+        logging.handlers.QueueHandler(_log_queue)
     ]
 )
 
@@ -42,6 +61,9 @@ class AIAgentWorkflowApp:
         try:
             logger.info("Initializing AI Agent Workflow System...")
             
+            from config.config_manager import ConfigManager
+            from agents.orchestrator import AIAgentOrchestrator
+            
             # Load configuration
             self.config_manager = ConfigManager()
             
@@ -67,19 +89,25 @@ class AIAgentWorkflowApp:
             logger.error("Application not initialized")
             return
         
-        print("\n" + "="*60)
-        print("🤖 AI Agent Workflow System")
-        print("="*60)
-        print("Welcome! I can help you manage your CRM operations.")
-        print("\nAvailable actions:")
-        for i, action in enumerate(self.orchestrator.get_available_actions(), 1):
-            print(f"  {i}. {action}")
-        
-        print("\nExamples:")
-        print("  • Create a contact: 'Add John Doe, john@example.com, to Acme Corp'")
-        print("  • Create a deal: 'Create a deal for $5000 with John from Acme Corp'")
-        print("  • Type 'quit' or 'exit' to stop")
-        print("="*60)
+        lines = [
+            "",
+            "=" * 60,
+            "🤖 AI Agent Workflow System",
+            "=" * 60,
+            "Welcome! I can help you manage your CRM operations.",
+            "\nAvailable actions:"
+        ]
+        lines += [f"  {i}. {action}" for i, action in enumerate(self.orchestrator.get_available_actions(), 1)]
+        lines += [
+            "\nExamples:",
+            "  • Create a contact: 'Add John Doe, john@example.com, to Acme Corp'",
+            "  • Create a deal: 'Create a deal for $5000 with John from Acme Corp'",
+            "  • Type 'quit' or 'exit' to stop",
+            "=" * 60
+        ]
+        # One write for the whole banner
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
         
         while True:
             try:
@@ -104,7 +132,7 @@ class AIAgentWorkflowApp:
                 logger.error(f"Error in interactive mode: {e}")
                 print(f"❌ Error: {e}")
     
-    def process_request(self, user_input: str) -> WorkflowResult:
+    def process_request(self, user_input: str) -> "WorkflowResult":
         """
         Process a user request
         
@@ -115,6 +143,7 @@ class AIAgentWorkflowApp:
             WorkflowResult with the outcome
         """
         if not self.initialized:
+            from agents.orchestrator import WorkflowResult
             return WorkflowResult(
                 success=False,
                 message="Application not initialized",
@@ -123,7 +152,30 @@ class AIAgentWorkflowApp:
         
         return self.orchestrator.process_request(user_input)
     
-    def display_result(self, result: WorkflowResult) -> None:
+    def process_requests_batch(self, user_inputs: List[str]) -> List["WorkflowResult"]:
+        """
+        Process many user requests, parsing them together up front
+        
+        Args:
+            user_inputs: User requests
+            
+        Returns:
+            WorkflowResults in the same order as ``user_inputs``
+        """
+        if not self.initialized:
+            from agents.orchestrator import WorkflowResult
+            return [
+                WorkflowResult(
+                    success=False,
+                    message="Application not initialized",
+                    error="Application not initialized"
+                )
+                for _ in user_inputs
+            ]
+        
+        return self.orchestrator.process_requests_batch(user_inputs)
+    
+    def display_result(self, result: "WorkflowResult") -> None:
         """
         Display the result of a workflow execution
         
@@ -154,6 +206,7 @@ Examples:
   python main.py                           # Run in interactive mode
   python main.py -q "Create contact John Doe, john@example.com"  # Single query
   python main.py --test                    # Run test mode
+  python main.py --batch requests.txt      # One query per line
         """
     )
     
@@ -163,6 +216,13 @@ Examples:
         help='Process a single query and exit'
     )
     
+    parser.add_argument(
+        '--batch',
+        type=str,
+        metavar='FILE',
+        help='Process queries from a file, one per line, and exit'
+    )
+    
     parser.add_argument(
         '--test',
         action='store_true',
@@ -200,6 +260,17 @@ Examples:
                 result = app.process_request(request)
                 app.display_result(result)
         
+        elif args.batch:
+            # Process queries from a file with one orchestrator
+            with open(args.batch, 'r', encoding='utf-8') as f:
+                batch_requests = [line.strip() for line in f if line.strip()]
+            
+            print(f"Processing {len(batch_requests)} queries from {args.batch}")
+            results = app.process_requests_batch(batch_requests)
+            for request, result in zip(batch_requests, results):
+                print(f"\nQuery: {request}")
+                app.display_result(result)
+        
         elif args.query:
             # Process single query
             print(f"Processing query: {args.query}")
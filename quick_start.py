@@ -6,17 +6,43 @@ This script helps users set up the system quickly
 
 import os
 import sys
-import json
 import subprocess
+from importlib import metadata
 from pathlib import Path
 
+_BANNER = "\n".join([
+    "=" * 60,
+    "AI Agent Workflow System - Quick Start",
+    "=" * 60,
+    "",
+    ""
+])
+
+_NEXT_STEPS = "\n".join([
+    "",
+    "=" * 60,
+    "Setup Complete!",
+    "=" * 60,
+    "",
+    "Next steps:",
+    "1. Your API credentials are already configured in config/config.json",
+    "",
+    "2. Run the system:",
+    "   python main.py",
+    "",
+    "3. Read the README.md for detailed instructions",
+    "",
+    "Example usage:",
+    '   python main.py -q "Create a contact John Doe, john@example.com, at Acme Corp"',
+    "",
+    ""
+])
+
 
 def print_banner():
     """Print the welcome banner"""
-    print("=" * 60)
-    print("AI Agent Workflow System - Quick Start")
-    print("=" * 60)
-    print()
+    sys.stdout.write(_BANNER)
+    sys.stdout.flush()
 
 
 def check_python_version():
@@ -30,11 +56,70 @@ def check_python_version():
     return True
 
 
+def _is_installed(requirement, extra=None):
+    """Whether a requirement is installed at a version it accepts"""
+    environment = {"extra": extra} if extra else None
+    if requirement.marker is not None and not requirement.marker.evaluate(environment):
+        return True
+    
+    try:
+        version = metadata.version(requirement.name)
+    except metadata.PackageNotFoundError:
+        return False
+    if not requirement.specifier.contains(version, prereleases=True):
+        return False
+    
+    # Extras such as httpx[http2] pull in further packages
+    if requirement.extras:
+        from packaging.requirements import Requirement
+        for dependency in metadata.requires(requirement.name) or []:
+            dependency = Requirement(dependency)
+            if dependency.marker is None:
+                continue
+            for requested in requirement.extras:
+                if dependency.marker.evaluate({"extra": requested}) and not _is_installed(dependency, requested):
+                    return False
+    
+    return True
+
+
+def missing_requirements(path="requirements.txt"):
+    """
+    List requirements that are not installed, without starting pip
+    
+    Returns:
+        The unsatisfied requirement lines, or None if they can't be checked
+    """
+    try:
+        from packaging.requirements import Requirement
+        
+        missing = []
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if not line or line.startswith("-"):
+                continue
+            if not _is_installed(Requirement(line)):
+                missing.append(line)
+        return missing
+    except Exception:
+        # No packaging module or an unusual requirements file; let pip decide
+        return None
+
+
 def install_dependencies():
     """Install required dependencies"""
+    missing = missing_requirements()
+    if missing == []:
+        print("OK: Dependencies already installed")
+        return True
+    
     print("Installing dependencies...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "install",
+            "--no-input", "--disable-pip-version-check", "--quiet",
+            "-r", "requirements.txt"
+        ])
         print("OK: Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError:
@@ -52,35 +137,11 @@ def setup_config():
     
     print("Setting up configuration...")
     
-    # Create config directory if it doesn't exist
-    config_path.parent.mkdir(exist_ok=True)
-    
-    # Create default config
-    default_config = {
-        "gemini": {
-            "api_key": "your-gemini-api-key-here",
-            "model": "gemini-2.5-flash",
-            "temperature": 0.7,
-            "max_tokens": 1000
-        },
-        "hubspot": {
-            "api_key": "your-hubspot-api-key-here",
-            "base_url": "https://api.hubapi.com"
-        },
-        "email": {
-            "smtp_server": "smtp.gmail.com",
-            "smtp_port": 587,
-            "username": "your-email@gmail.com",
-            "password": "your-app-password"
-        },
-        "logging": {
-            "level": "INFO",
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        }
-    }
-    
-    with open(config_path, 'w') as f:
-        json.dump(default_config, f, indent=4)
+    # Imported here because dependencies are installed earlier in this script
+    from config.config_manager import ConfigManager
+    
+    # Write the same defaults ConfigManager falls back to
+    ConfigManager(str(config_path)).create_default_config()
     
     print("OK: Configuration file created at config/config.json")
     print("NOTE: Configuration file contains your API credentials")
@@ -107,21 +168,8 @@ def run_tests():
 
 def print_next_steps():
     """Print next steps for the user"""
-    print("\n" + "=" * 60)
-    print("Setup Complete!")
-    print("=" * 60)
-    print()
-    print("Next steps:")
-    print("1. Your API credentials are already configured in config/config.json")
-    print()
-    print("2. Run the system:")
-    print("   python main.py")
-    print()
-    print("3. Read the README.md for detailed instructions")
-    print()
-    print("Example usage:")
-    print('   python main.py -q "Create a contact John Doe, john@example.com, at Acme Corp"')
-    print()
+    sys.stdout.write(_NEXT_STEPS)
+    sys.stdout.flush()
 
 
 def main():
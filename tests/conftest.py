@@ -0,0 +1,74 @@
+"""
+Shared fixtures for the AI Agent Workflow System tests
+Config files are written once per session and shared by every test
+"""
+
+import copy
+import json
+import pytest
+from config.config_manager import ConfigManager
+
+
+# Test credentials for every required section
+BASE_CONFIG = {
+    "gemini": {
+        "api_key": "test-gemini-key",
+        "model": "gemini-2.5-flash",
+        "temperature": 0.7,
+        "max_tokens": 1000
+    },
+    "hubspot": {
+        "api_key": "pat-test-hubspot-key",
+        "base_url": "https://api.hubapi.com"
+    },
+    "email": {
+        "smtp_server": "smtp.gmail.com",
+        "smtp_port": 587,
+        "username": "test@example.com",
+        "password": "test-password"
+    },
+    "logging": {
+        "level": "INFO",
+        "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    }
+}
+
+
+@pytest.fixture(scope="session")
+def config_dir(tmp_path_factory):
+    """One directory for every config file the session writes"""
+    return tmp_path_factory.mktemp("configs", numbered=False)
+
+
+def _write_config(config_dir, name, config_data):
+    """Write a config file into the shared session directory"""
+    config_path = config_dir / name
+    config_path.write_text(json.dumps(config_data), encoding="utf-8")
+    return config_path
+
+
+@pytest.fixture(scope="session")
+def base_config_path(config_dir):
+    """Config file with test credentials in every section"""
+    return _write_config(config_dir, "config.json", BASE_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def placeholder_config_path(config_dir):
+    """Config file whose Gemini key is still the template placeholder"""
+    config_data = copy.deepcopy(BASE_CONFIG)
+    config_data["gemini"]["api_key"] = "your-gemini-api-key-here"
+    return _write_config(config_dir, "config_placeholder.json", config_data)
+
+
+@pytest.fixture(scope="session")
+def _session_config(base_config_path):
+    """ConfigManager built from the shared test config once per session"""
+    # Built from memory; the file is only read if a test reloads the config
+    return ConfigManager.from_dict(BASE_CONFIG, str(base_config_path))
+
+
+@pytest.fixture
+def mock_config(_session_config):
+    """Per-test copy of the session ConfigManager, safe to mutate"""
+    return copy.deepcopy(_session_config)
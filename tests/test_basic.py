@@ -4,237 +4,325 @@ Tests individual components and basic functionality
 """
 
 import pytest
+import dataclasses
 import json
-import tempfile
 import os
-from unittest.mock import Mock, patch
+import asyncio
+import copy
+import pickle
+import smtplib
+import threading
+import requests
+import httpx
+import orjson
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
 from config.config_manager import ConfigManager
 from agents.hubspot_agent import HubSpotAgent, Contact, Deal
 from agents.email_agent import EmailAgent, EmailMessage
+from agents.smtp_pool import SMTPConnectionPool
+from agents.rate_limiter import TokenBucket
+from agents.preview_agent import PreviewAgent, default_deal_name, full_name, parse_amount
+
+
+@contextmanager
+def scripted_http_server(statuses):
+    """
+    Serve one scripted reply per request on localhost
+    
+    Each status is sent as an empty JSON response; None drops the
+    connection after reading the request. Yields the base URL and the
+    list of request methods received.
+    """
+    replies = list(statuses)
+    seen = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self):
+            seen.append(self.command)
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            status = replies.pop(0)
+            if status is None:
+                self.close_connection = True
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+        
+        do_GET = do_POST = do_PATCH = _reply
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}", seen
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def patch_async_client(handler):
+    """Route the HubSpot agent's httpx.AsyncClient through a mock transport, yielding the clients made"""
+    real_client = httpx.AsyncClient
+    clients = []
+    
+    def make_client(**kwargs):
+        clients.append(real_client(transport=httpx.MockTransport(handler), **kwargs))
+        return clients[-1]
+    
+    with patch('agents.hubspot_agent.httpx.AsyncClient', side_effect=make_client):
+        yield clients
 
 
 class TestConfigManager:
     """Test cases for ConfigManager"""
     
-    def test_config_manager_initialization(self):
+    def test_config_manager_initialization(self, base_config_path):
         """Test ConfigManager initialization with valid config"""
-        config_data = {
-            "openai": {"api_key": "test-key", "model": "gpt-4"},
-            "hubspot": {"api_key": "test-key", "base_url": "https://api.hubapi.com"},
-            "email": {"username": "test@example.com", "password": "test-pass"},
-            "logging": {"level": "INFO", "format": "test"}
-        }
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(config_data, f)
-            config_path = f.name
-        
-        try:
-            config_manager = ConfigManager(config_path)
-            assert config_manager is not None
-            assert config_manager.get("openai.api_key") == "test-key"
-            assert config_manager.get("hubspot.base_url") == "https://api.hubapi.com"
-        finally:
-            os.unlink(config_path)
+        config_manager = ConfigManager(str(base_config_path))
+        assert config_manager is not None
+        assert config_manager.get("gemini.api_key") == "test-gemini-key"
+        assert config_manager.get("hubspot.base_url") == "https://api.hubapi.com"
     
-    def test_config_manager_missing_file(self):
+    def test_config_manager_missing_file(self, tmp_path):
         """Test ConfigManager with missing config file"""
-        config_manager = ConfigManager("nonexistent_config.json")
+        config_manager = ConfigManager(str(tmp_path / "nonexistent_config.json"))
         assert config_manager is not None
         # Should create default config
         assert config_manager.config is not None
     
-    def test_config_manager_get_method(self):
-        """Test ConfigManager get method with dot notation"""
+    def test_config_manager_from_dict(self, tmp_path):
+        """Test building a ConfigManager from settings in memory"""
         config_data = {
-            "openai": {"api_key": "test-key", "model": "gpt-4"},
+            "gemini": {"api_key": "test-key"},
             "hubspot": {"api_key": "test-key"},
             "email": {"username": "test@example.com"},
             "logging": {"level": "INFO"}
         }
+        config_path = tmp_path / "config.json"
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(config_data, f)
-            config_path = f.name
+        config_manager = ConfigManager.from_dict(config_data, str(config_path))
+        config_data["hubspot"]["api_key"] = "changed-key"
         
-        try:
-            config_manager = ConfigManager(config_path)
-            
-            # Test valid keys
-            assert config_manager.get("openai.api_key") == "test-key"
-            assert config_manager.get("openai.model") == "gpt-4"
-            
-            # Test default values
-            assert config_manager.get("nonexistent.key", "default") == "default"
-            assert config_manager.get("openai.temperature", 0.7) == 0.7
-            
-        finally:
-            os.unlink(config_path)
+        assert config_manager.get("hubspot.api_key") == "test-key"
+        assert config_manager.is_configured() is True
+        assert not config_path.exists()
+        
+        with pytest.raises(ValueError):
+            ConfigManager.from_dict({"gemini": {}})
     
-    def test_config_manager_is_configured(self):
-        """Test configuration validation"""
-        # Test with valid config
+    def test_config_manager_loads_on_first_access(self, tmp_path):
+        """Test that the config file isn't read until a setting is needed"""
+        config_path = tmp_path / "config.json"
+        config_path.write_text("{not json")
+        
+        config_manager = ConfigManager(str(config_path))
+        
+        with pytest.raises(orjson.JSONDecodeError):
+            config_manager.get("hubspot.api_key")
+    
+    def test_config_file_read_once_until_changed(self, tmp_path):
+        """Test that an unchanged config file is read from disk only once"""
         config_data = {
-            "openai": {"api_key": "sk-real-key"},
-            "hubspot": {"api_key": "pat-real-key"},
-            "email": {"username": "real@example.com"},
+            "gemini": {"api_key": "test-key"},
+            "hubspot": {"api_key": "test-key"},
+            "email": {"username": "test@example.com"},
             "logging": {"level": "INFO"}
         }
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config_data))
+        
+        with patch.object(Path, "read_bytes", autospec=True, side_effect=Path.read_bytes) as mock_read:
+            first = ConfigManager(str(config_path))
+            second = ConfigManager(str(config_path))
+            assert first.get("hubspot.api_key") == second.get("hubspot.api_key") == "test-key"
+            assert mock_read.call_count == 1
+            
+            # Instances get their own copy of the settings
+            assert first.config is not second.config
+            
+            config_data["hubspot"]["api_key"] = "new-key"
+            config_path.write_text(json.dumps(config_data))
+            
+            assert ConfigManager(str(config_path)).get("hubspot.api_key") == "new-key"
+            assert mock_read.call_count == 2
+    
+    def test_config_manager_get_method(self, mock_config):
+        """Test ConfigManager get method with dot notation"""
+        # Test valid keys
+        assert mock_config.get("gemini.api_key") == "test-gemini-key"
+        assert mock_config.get("gemini.model") == "gemini-2.5-flash"
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(config_data, f)
-            config_path = f.name
-        
-        try:
-            config_manager = ConfigManager(config_path)
-            assert config_manager.is_configured() is True
-        finally:
-            os.unlink(config_path)
+        # Test default values
+        assert mock_config.get("nonexistent.key", "default") == "default"
+        assert mock_config.get("gemini.top_p", 0.9) == 0.9
+    
+    def test_dotenv_loaded_once(self, tmp_path):
+        """Test that .env is only read by the first ConfigManager"""
+        config_path = str(tmp_path / "nonexistent_config.json")
+        with patch('config.config_manager._dotenv_loaded', False), \
+             patch('config.config_manager.load_dotenv') as mock_load_dotenv:
+            ConfigManager(config_path)
+            ConfigManager(config_path)
+        
+        mock_load_dotenv.assert_called_once()
+    
+    def test_config_manager_get_caches_until_reload(self, mock_config):
+        """Test that get() results are cached and cleared by load_config"""
+        with patch.dict(os.environ, {"SMTP_USER": "env@example.com"}):
+            os.environ.pop("EMAIL_USERNAME", None)
+            assert mock_config.get("email.username") == "env@example.com"
         
-        # Test with placeholder config
-        config_data["openai"]["api_key"] = "your-openai-api-key-here"
+        # Cached, even though the environment has changed
+        assert mock_config.get("email.username") == "env@example.com"
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(config_data, f)
-            config_path = f.name
+        mock_config.load_config()
+        assert mock_config.get("email.username") == "test@example.com"
+    
+    def test_gemini_config_is_shared_read_only_view(self, mock_config):
+        """Test that section getters return one resolved, read-only mapping"""
+        with patch.dict(os.environ, {"GEMINI_API_KEY": "env-key"}):
+            gemini_config = mock_config.get_gemini_config()
+        
+        assert gemini_config["api_key"] == "env-key"
+        assert gemini_config["model"] == "gemini-2.5-flash"
+        assert mock_config.get_gemini_config() is gemini_config
+        with pytest.raises(TypeError):
+            gemini_config["api_key"] = "changed"
+    
+    def test_config_manager_copies_after_use(self, mock_config):
+        """Test that a manager can be copied and pickled once its snapshot is built"""
+        assert mock_config.get("email.username") == "test@example.com"
+        assert mock_config.is_configured() is True
+        
+        for clone in (copy.deepcopy(mock_config), pickle.loads(pickle.dumps(mock_config))):
+            assert clone.config == mock_config.config
+            assert clone.config is not mock_config.config
+            assert clone.get("email.username") == "test@example.com"
+            assert clone.get_hubspot_config()["api_key"] == "pat-test-hubspot-key"
+    
+    def test_config_manager_invalidate(self, mock_config):
+        """Test that direct edits show up in get() and section views after invalidate()"""
+        email_config = mock_config.get_email_config()
+        mock_config.config["email"]["username"] = "changed@example.com"
+        
+        # The snapshot, and the views built from it, still agree
+        assert mock_config.get("email.username") == "test@example.com"
+        assert email_config["username"] == "test@example.com"
+        
+        mock_config.invalidate()
+        assert mock_config.get("email.username") == "changed@example.com"
+        assert mock_config.get_email_config()["username"] == "changed@example.com"
+    
+    def test_config_manager_is_configured(self, base_config_path, placeholder_config_path):
+        """Test configuration validation"""
+        # Test with valid config
+        assert ConfigManager(str(base_config_path)).is_configured() is True
         
-        try:
-            config_manager = ConfigManager(config_path)
-            assert config_manager.is_configured() is False
-        finally:
-            os.unlink(config_path)
+        # Test with placeholder config
+        assert ConfigManager(str(placeholder_config_path)).is_configured() is False
 
 
 class TestContact:
     """Test cases for Contact dataclass"""
     
-    def test_contact_creation(self):
+    @pytest.mark.parametrize("kwargs,expected", [
+        (
+            {"email": "test@example.com", "first_name": "John", "last_name": "Doe",
+             "phone": "123-456-7890", "company": "TestCorp"},
+            {"email": "test@example.com", "first_name": "John", "last_name": "Doe",
+             "phone": "123-456-7890", "company": "TestCorp", "properties": None}
+        ),
+        (
+            {"email": "test@example.com"},
+            {"email": "test@example.com", "first_name": None, "last_name": None,
+             "phone": None, "company": None}
+        ),
+    ], ids=["full", "minimal"])
+    def test_contact_creation(self, kwargs, expected):
         """Test Contact object creation"""
-        contact = Contact(
-            email="test@example.com",
-            first_name="John",
-            last_name="Doe",
-            phone="123-456-7890",
-            company="TestCorp"
-        )
-        
-        assert contact.email == "test@example.com"
-        assert contact.first_name == "John"
-        assert contact.last_name == "Doe"
-        assert contact.phone == "123-456-7890"
-        assert contact.company == "TestCorp"
-        assert contact.properties is None
-    
-    def test_contact_creation_minimal(self):
-        """Test Contact object creation with minimal data"""
-        contact = Contact(email="test@example.com")
+        contact = Contact(**kwargs)
         
-        assert contact.email == "test@example.com"
-        assert contact.first_name is None
-        assert contact.last_name is None
-        assert contact.phone is None
-        assert contact.company is None
+        for name, value in expected.items():
+            assert getattr(contact, name) == value
 
 
 class TestDeal:
     """Test cases for Deal dataclass"""
     
-    def test_deal_creation(self):
+    @pytest.mark.parametrize("kwargs,expected", [
+        (
+            {"deal_name": "Test Deal", "amount": 5000.0, "stage": "appointmentscheduled",
+             "close_date": "2024-12-31", "contact_email": "test@example.com"},
+            {"deal_name": "Test Deal", "amount": 5000.0, "stage": "appointmentscheduled",
+             "close_date": "2024-12-31", "contact_email": "test@example.com", "properties": None}
+        ),
+        (
+            {"deal_name": "Test Deal"},
+            {"deal_name": "Test Deal", "amount": None, "stage": None, "close_date": None,
+             "contact_email": None, "contact_id": None}
+        ),
+    ], ids=["full", "minimal"])
+    def test_deal_creation(self, kwargs, expected):
         """Test Deal object creation"""
-        deal = Deal(
-            deal_name="Test Deal",
-            amount=5000.0,
-            stage="appointmentscheduled",
-            close_date="2024-12-31",
-            contact_email="test@example.com"
-        )
+        deal = Deal(**kwargs)
         
-        assert deal.deal_name == "Test Deal"
-        assert deal.amount == 5000.0
-        assert deal.stage == "appointmentscheduled"
-        assert deal.close_date == "2024-12-31"
-        assert deal.contact_email == "test@example.com"
-        assert deal.properties is None
+        for name, value in expected.items():
+            assert getattr(deal, name) == value
     
-    def test_deal_creation_minimal(self):
-        """Test Deal object creation with minimal data"""
+    def test_deal_is_immutable(self):
+        """Test that Deal objects are frozen and slotted"""
         deal = Deal(deal_name="Test Deal")
         
-        assert deal.deal_name == "Test Deal"
-        assert deal.amount is None
-        assert deal.stage is None
-        assert deal.close_date is None
-        assert deal.contact_email is None
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            deal.amount = 100.0
+        assert not hasattr(deal, "__dict__")
 
 
 class TestEmailMessage:
     """Test cases for EmailMessage dataclass"""
     
-    def test_email_message_creation(self):
+    @pytest.mark.parametrize("kwargs,expected", [
+        (
+            {"to": "recipient@example.com", "subject": "Test Subject", "body": "Test body",
+             "html_body": "<p>Test HTML body</p>", "cc": ["cc@example.com"], "bcc": ["bcc@example.com"]},
+            {"to": "recipient@example.com", "subject": "Test Subject", "body": "Test body",
+             "html_body": "<p>Test HTML body</p>", "cc": ["cc@example.com"], "bcc": ["bcc@example.com"]}
+        ),
+        (
+            {"to": "recipient@example.com", "subject": "Test Subject", "body": "Test body"},
+            {"to": "recipient@example.com", "subject": "Test Subject", "body": "Test body",
+             "html_body": None, "cc": None, "bcc": None}
+        ),
+    ], ids=["full", "minimal"])
+    def test_email_message_creation(self, kwargs, expected):
         """Test EmailMessage object creation"""
-        message = EmailMessage(
-            to="recipient@example.com",
-            subject="Test Subject",
-            body="Test body",
-            html_body="<p>Test HTML body</p>",
-            cc=["cc@example.com"],
-            bcc=["bcc@example.com"]
-        )
-        
-        assert message.to == "recipient@example.com"
-        assert message.subject == "Test Subject"
-        assert message.body == "Test body"
-        assert message.html_body == "<p>Test HTML body</p>"
-        assert message.cc == ["cc@example.com"]
-        assert message.bcc == ["bcc@example.com"]
-    
-    def test_email_message_creation_minimal(self):
-        """Test EmailMessage object creation with minimal data"""
-        message = EmailMessage(
-            to="recipient@example.com",
-            subject="Test Subject",
-            body="Test body"
-        )
+        message = EmailMessage(**kwargs)
         
-        assert message.to == "recipient@example.com"
-        assert message.subject == "Test Subject"
-        assert message.body == "Test body"
-        assert message.html_body is None
-        assert message.cc is None
-        assert message.bcc is None
+        for name, value in expected.items():
+            assert getattr(message, name) == value
 
 
 class TestHubSpotAgent:
     """Test cases for HubSpotAgent"""
     
-    @pytest.fixture
-    def mock_config(self):
-        """Create mock configuration for HubSpot agent"""
-        config_data = {
-            "hubspot": {
-                "api_key": "test-hubspot-key",
-                "base_url": "https://api.hubapi.com"
-            }
-        }
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(config_data, f)
-            config_path = f.name
-        
-        config_manager = ConfigManager(config_path)
-        
-        yield config_manager
-        
-        os.unlink(config_path)
-    
     def test_hubspot_agent_initialization(self, mock_config):
         """Test HubSpotAgent initialization"""
         agent = HubSpotAgent(mock_config)
         
-        assert agent.api_key == "test-hubspot-key"
+        assert agent.api_key == "pat-test-hubspot-key"
         assert agent.base_url == "https://api.hubapi.com"
         assert "Authorization" in agent.headers
         assert "Content-Type" in agent.headers
+        assert agent.session.headers["Authorization"] == "Bearer pat-test-hubspot-key"
     
     def test_hubspot_agent_missing_api_key(self, mock_config):
         """Test HubSpotAgent with missing API key"""
@@ -244,12 +332,49 @@ class TestHubSpotAgent:
         with pytest.raises(ValueError, match="HubSpot API key not configured"):
             HubSpotAgent(mock_config)
     
-    @patch('agents.hubspot_agent.requests.post')
+    def test_retry_policy(self, mock_config):
+        """Test that creates are only retried when rate limited"""
+        agent = HubSpotAgent(mock_config)
+        retry = agent.session.get_adapter("https://api.hubapi.com").max_retries
+        
+        assert retry.respect_retry_after_header is True
+        assert retry.is_retry("POST", 429) is True
+        assert retry.is_retry("POST", 503) is False
+        assert retry.is_retry("PATCH", 503) is True
+    
+    @pytest.mark.parametrize("statuses,expect_error", [
+        ([503, 201], False),
+        ([None, 201], True),
+    ], ids=["server_error", "read_error"])
+    def test_post_not_retried_after_sending(self, mock_config, statuses, expect_error):
+        """Test that a POST HubSpot may have processed is never sent twice"""
+        agent = HubSpotAgent(mock_config)
+        
+        with scripted_http_server(statuses) as (base_url, seen):
+            if expect_error:
+                with pytest.raises(requests.exceptions.ConnectionError):
+                    agent.session.post(base_url + "/crm/v3/objects/deals", data=b"{}")
+            else:
+                assert agent.session.post(base_url + "/crm/v3/objects/deals", data=b"{}").status_code == 503
+        
+        assert seen == ["POST"]
+    
+    def test_post_retried_when_rate_limited(self, mock_config):
+        """Test that a rate-limited POST is retried and an idempotent call retries on 503"""
+        agent = HubSpotAgent(mock_config)
+        
+        with scripted_http_server([429, 201, 503, 200]) as (base_url, seen):
+            assert agent.session.post(base_url + "/crm/v3/objects/deals", data=b"{}").status_code == 201
+            assert agent.session.patch(base_url + "/crm/v3/objects/deals/1", data=b"{}").status_code == 200
+        
+        assert seen == ["POST", "POST", "PATCH", "PATCH"]
+    
+    @patch('agents.hubspot_agent.requests.Session.post')
     def test_create_contact_success(self, mock_post, mock_config):
         """Test successful contact creation"""
         # Mock successful response
         mock_response = Mock()
-        mock_response.json.return_value = {"id": "contact123", "properties": {"email": "test@example.com"}}
+        mock_response.content = orjson.dumps({"id": "contact123", "properties": {"email": "test@example.com"}})
         mock_response.raise_for_status.return_value = None
         mock_post.return_value = mock_response
         
@@ -261,7 +386,7 @@ class TestHubSpotAgent:
         assert result["id"] == "contact123"
         mock_post.assert_called_once()
     
-    @patch('agents.hubspot_agent.requests.post')
+    @patch('agents.hubspot_agent.requests.Session.post')
     def test_create_contact_failure(self, mock_post, mock_config):
         """Test contact creation failure"""
         # Mock failure response
@@ -272,32 +397,221 @@ class TestHubSpotAgent:
         
         with pytest.raises(Exception, match="API Error"):
             agent.create_contact(contact)
+    
+    @patch('agents.hubspot_agent.requests.Session.post')
+    def test_create_contacts_batch_chunks_requests(self, mock_post, mock_config):
+        """Test that batch creation splits inputs into 100-item requests"""
+        def fake_post(url, data):
+            mock_response = Mock()
+            count = len(orjson.loads(data)["inputs"])
+            mock_response.content = orjson.dumps({"results": [{"id": "c"}] * count})
+            return mock_response
+        
+        mock_post.side_effect = fake_post
+        
+        agent = HubSpotAgent(mock_config)
+        contacts = [Contact(email=f"user{i}@example.com") for i in range(150)]
+        
+        results = agent.create_contacts_batch(contacts)
+        
+        assert len(results) == 150
+        assert mock_post.call_count == 2
+        first_url = mock_post.call_args_list[0].args[0]
+        assert first_url.endswith("/crm/v3/objects/contacts/batch/create")
+        assert len(orjson.loads(mock_post.call_args_list[0].kwargs["data"])["inputs"]) == 100
+        assert len(orjson.loads(mock_post.call_args_list[1].kwargs["data"])["inputs"]) == 50
+    
+    @patch('agents.hubspot_agent.requests.Session.put')
+    @patch('agents.hubspot_agent.requests.Session.post')
+    def test_associate_deal_uses_cached_contact_id(self, mock_post, mock_put, mock_config):
+        """Test that a freshly created contact is associated without a search"""
+        mock_response = Mock()
+        mock_response.status_code = 201
+        mock_response.content = orjson.dumps({"id": "contact123", "properties": {"email": "test@example.com"}})
+        mock_response.raise_for_status.return_value = None
+        mock_post.return_value = mock_response
+        
+        agent = HubSpotAgent(mock_config)
+        agent.create_contact(Contact(email="Test@Example.com"))
+        agent.associate_deal_with_contact("deal123", "test@example.com")
+        
+        # Only the create call; the association lookup hit the cache
+        mock_post.assert_called_once()
+        assert mock_put.call_args.args[0].endswith("/deals/deal123/associations/contacts/contact123/deal_to_contact")
+    
+    @patch('agents.hubspot_agent.requests.Session.put')
+    @patch('agents.hubspot_agent.requests.Session.post')
+    def test_create_deal_with_contact_id_associates_on_create(self, mock_post, mock_put, mock_config):
+        """Test that a deal with a known contact ID is associated in the create call"""
+        mock_response = Mock()
+        mock_response.content = orjson.dumps({"id": "deal123"})
+        mock_response.raise_for_status.return_value = None
+        mock_post.return_value = mock_response
+        
+        agent = HubSpotAgent(mock_config)
+        agent.create_deal(Deal(deal_name="Test Deal", contact_email="test@example.com",
+                               contact_id="contact123"))
+        
+        # One create call carrying the association; no search, no association PUT
+        mock_post.assert_called_once()
+        mock_put.assert_not_called()
+        payload = orjson.loads(mock_post.call_args.kwargs["data"])
+        assert payload["associations"] == [{
+            "to": {"id": "contact123"},
+            "types": [{"associationCategory": "HUBSPOT_DEFINED", "associationTypeId": 3}]
+        }]
+    
+    @patch('agents.hubspot_agent.requests.Session.post')
+    def test_resolve_contact_id_prefers_exact_email(self, mock_post, mock_config):
+        """Test that contact lookup requests only emails and picks the exact match"""
+        mock_response = Mock()
+        mock_response.content = orjson.dumps({"results": [
+            {"id": "other", "properties": {"email": "test@example.com.au"}},
+            {"id": "contact123", "properties": {"email": "Test@Example.com"}},
+        ]})
+        mock_post.return_value = mock_response
+        
+        agent = HubSpotAgent(mock_config)
+        
+        assert agent._resolve_contact_id("test@example.com") == "contact123"
+        assert orjson.loads(mock_post.call_args.kwargs["data"])["properties"] == ["email"]
+    
+    @patch('agents.hubspot_agent.requests.Session.post')
+    def test_resolve_contact_id_ignores_inexact_matches(self, mock_post, mock_config):
+        """Test that null emails are skipped and fuzzy hits are neither returned nor cached"""
+        mock_response = Mock()
+        mock_response.content = orjson.dumps({"results": [
+            {"id": "no-email", "properties": {"email": None}},
+            {"id": "other", "properties": {"email": "test@example.com.au"}},
+        ]})
+        mock_post.return_value = mock_response
+        
+        agent = HubSpotAgent(mock_config)
+        
+        assert agent._resolve_contact_id("test@example.com") is None
+        assert agent._cached_contact_id("test@example.com") is None
+    
+    @patch('agents.hubspot_agent.requests.Session.get')
+    def test_iter_deals_follows_paging_cursor(self, mock_get, mock_config):
+        """Test that deals are paged lazily using the after cursor"""
+        first_page = Mock()
+        first_page.content = orjson.dumps({
+            "results": [{"id": "1"}, {"id": "2"}],
+            "paging": {"next": {"after": "2"}}
+        })
+        last_page = Mock()
+        last_page.content = orjson.dumps({"results": [{"id": "3"}]})
+        mock_get.side_effect = [first_page, last_page]
+        
+        agent = HubSpotAgent(mock_config)
+        pages = list(agent.iter_deals(page_size=2))
+        
+        assert [[deal["id"] for deal in page] for page in pages] == [["1", "2"], ["3"]]
+        assert mock_get.call_args_list[0].kwargs["params"] == {"limit": 2}
+        assert mock_get.call_args_list[1].kwargs["params"] == {"limit": 2, "after": "2"}
+    
+    @patch('agents.hubspot_agent.requests.Session.put')
+    def test_associate_deal_skips_known_association(self, mock_put, mock_config):
+        """Test that an association already made is not PUT again"""
+        agent = HubSpotAgent(mock_config)
+        
+        agent.associate_deal_with_contact("deal123", contact_id="contact123")
+        agent.associate_deal_with_contact("deal123", contact_id="contact123")
+        
+        mock_put.assert_called_once()
+        assert mock_put.call_args.kwargs == {}
+    
+    def test_acreate_deal_associates_contact(self, mock_config):
+        """Test async deal creation followed by contact lookup and association"""
+        requests_seen = []
+        
+        def handler(request):
+            requests_seen.append((request.method, request.url.path))
+            if request.url.path.endswith("/contacts/search"):
+                return httpx.Response(200, json={"results": [
+                    {"id": "contact123", "properties": {"email": "test@example.com"}}
+                ]})
+            if request.method == "PUT":
+                return httpx.Response(200, json={})
+            return httpx.Response(201, json={"id": "deal123"})
+        
+        agent = HubSpotAgent(mock_config)
+        
+        async def run():
+            result = await agent.acreate_deal(Deal(deal_name="Test Deal", contact_email="test@example.com"))
+            await agent.aclose()
+            return result
+        
+        with patch_async_client(handler):
+            result = asyncio.run(run())
+        
+        assert result["id"] == "deal123"
+        assert requests_seen == [
+            ("POST", "/crm/v3/objects/deals"),
+            ("POST", "/crm/v3/objects/contacts/search"),
+            ("PUT", "/crm/v3/objects/deals/deal123/associations/contacts/contact123/deal_to_contact"),
+        ]
 
-
-class TestEmailAgent:
-    """Test cases for EmailAgent"""
     
-    @pytest.fixture
-    def mock_config(self):
-        """Create mock configuration for Email agent"""
-        config_data = {
-            "email": {
-                "smtp_server": "smtp.gmail.com",
-                "smtp_port": 587,
-                "username": "test@example.com",
-                "password": "test-password"
-            }
-        }
+    def test_async_client_per_event_loop(self, mock_config):
+        """Test that separate asyncio.run() calls each get a working client"""
+        agent = HubSpotAgent(mock_config)
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(config_data, f)
-            config_path = f.name
+        with patch_async_client(lambda request: httpx.Response(201, json={"id": "contact123"})) as clients:
+            for _ in range(2):
+                assert asyncio.run(agent.acreate_contact(Contact(email="test@example.com")))["id"] == "contact123"
+            asyncio.run(agent.aclose())
         
-        config_manager = ConfigManager(config_path)
+        assert len(clients) == 2
+    
+    def test_async_post_retried_when_rate_limited(self, mock_config):
+        """Test that the async client retries a 429, honoring Retry-After"""
+        agent = HubSpotAgent(mock_config)
+        responses = iter([
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(201, json={"id": "contact123"}),
+        ])
+        seen = []
         
-        yield config_manager
+        def handler(request):
+            seen.append(request.method)
+            return next(responses)
         
-        os.unlink(config_path)
+        with patch_async_client(handler):
+            result = asyncio.run(agent.acreate_contact(Contact(email="test@example.com")))
+        
+        assert result["id"] == "contact123"
+        assert seen == ["POST", "POST"]
+    
+    @pytest.mark.parametrize("method,expected_calls", [
+        ("POST", 1),
+        ("PATCH", 2),
+    ])
+    def test_async_server_error_retried_only_when_idempotent(self, mock_config, method, expected_calls):
+        """Test that the async client resends a 503 only for methods other than POST"""
+        agent = HubSpotAgent(mock_config)
+        responses = iter([httpx.Response(503, headers={"Retry-After": "0"}), httpx.Response(200)])
+        seen = []
+        
+        def handler(request):
+            seen.append(request.method)
+            return next(responses)
+        
+        async def send():
+            try:
+                return await agent._arequest(method, "/crm/v3/objects/contacts/contact123")
+            finally:
+                await agent.aclose()
+        
+        with patch_async_client(handler):
+            response = asyncio.run(send())
+        
+        assert response.status_code == (503 if method == "POST" else 200)
+        assert len(seen) == expected_calls
+
+
+class TestEmailAgent:
+    """Test cases for EmailAgent"""
     
     def test_email_agent_initialization(self, mock_config):
         """Test EmailAgent initialization"""
@@ -320,8 +634,7 @@ class TestEmailAgent:
     def test_send_email_success(self, mock_smtp, mock_config):
         """Test successful email sending"""
         # Mock SMTP
-        mock_server = Mock()
-        mock_smtp.return_value.__enter__.return_value = mock_server
+        mock_server = mock_smtp.return_value
         
         agent = EmailAgent(mock_config)
         message = EmailMessage(
@@ -335,7 +648,210 @@ class TestEmailAgent:
         assert result is True
         mock_server.starttls.assert_called_once()
         mock_server.login.assert_called_once_with("test@example.com", "test-password")
-        mock_server.send_message.assert_called_once()
+        mock_server.sendmail.assert_called_once()
+        from_addr, to_addrs, raw_message = mock_server.sendmail.call_args[0]
+        assert from_addr == "test@example.com"
+        assert to_addrs == ("recipient@example.com",)
+        assert b"Subject: Test Subject\r\n" in raw_message
+    
+    @patch('agents.email_agent.smtplib.SMTP')
+    def test_send_email_reuses_connection(self, mock_smtp, mock_config):
+        """Test that consecutive sends share one authenticated connection"""
+        mock_server = mock_smtp.return_value
+        mock_server.noop.return_value = (250, b"OK")
+        
+        agent = EmailAgent(mock_config)
+        message = EmailMessage(
+            to="recipient@example.com",
+            subject="Test Subject",
+            body="Test body"
+        )
+        
+        assert agent.send_email(message) is True
+        assert agent.send_email(EmailMessage(
+            to="recipient@example.com",
+            subject="Another Subject",
+            body="Test body"
+        )) is True
+        
+        mock_smtp.assert_called_once()
+        mock_server.login.assert_called_once()
+        assert mock_server.sendmail.call_count == 2
+        
+        agent.close()
+        mock_server.quit.assert_called_once()
+    
+    @patch('agents.email_agent.smtplib.SMTP')
+    def test_send_email_reconnects_stale_connection(self, mock_smtp, mock_config):
+        """Test that a connection failing NOOP is replaced"""
+        mock_server = mock_smtp.return_value
+        mock_server.noop.side_effect = smtplib.SMTPServerDisconnected("gone")
+        
+        agent = EmailAgent(mock_config)
+        message = EmailMessage(
+            to="recipient@example.com",
+            subject="Test Subject",
+            body="Test body"
+        )
+        
+        assert agent.send_email(message) is True
+        assert agent.send_email(EmailMessage(
+            to="recipient@example.com",
+            subject="Another Subject",
+            body="Test body"
+        )) is True
+        
+        assert mock_smtp.call_count == 2
+    
+    @patch('agents.email_agent.smtplib.SMTP')
+    def test_duplicate_email_sent_once(self, mock_smtp, mock_config):
+        """Test that an identical message within the dedup window is skipped"""
+        mock_server = mock_smtp.return_value
+        mock_server.noop.return_value = (250, b"OK")
+        
+        agent = EmailAgent(mock_config)
+        message = EmailMessage(
+            to="recipient@example.com",
+            subject="Test Subject",
+            body="Test body"
+        )
+        
+        assert agent.send_email(message) is True
+        assert agent.send_email(message) is True
+        
+        mock_server.sendmail.assert_called_once()
+    
+    @patch('agents.email_agent.smtplib.SMTP')
+    def test_failed_email_not_deduplicated(self, mock_smtp, mock_config):
+        """Test that a failed send can be retried"""
+        mock_server = mock_smtp.return_value
+        mock_server.noop.return_value = (250, b"OK")
+        mock_server.sendmail.side_effect = [smtplib.SMTPException("Test error"), {}]
+        
+        agent = EmailAgent(mock_config)
+        message = EmailMessage(
+            to="recipient@example.com",
+            subject="Test Subject",
+            body="Test body"
+        )
+        
+        assert agent.send_email(message) is False
+        assert agent.send_email(message) is True
+        assert mock_server.sendmail.call_count == 2
+    
+    def test_recipients_include_cc_and_bcc(self):
+        """Test envelope recipient ordering"""
+        message = EmailMessage(
+            to="recipient@example.com",
+            subject="Test Subject",
+            body="Test body",
+            cc=["cc@example.com"],
+            bcc=["bcc@example.com"]
+        )
+        
+        assert EmailAgent._recipients(message) == (
+            "recipient@example.com", "cc@example.com", "bcc@example.com"
+        )
+    
+    @patch('agents.email_agent.smtplib.SMTP')
+    def test_workflow_notification_fans_out_in_one_send(self, mock_smtp, mock_config):
+        """Test that stakeholders are Bcc'd on a single SMTP transaction"""
+        mock_server = mock_smtp.return_value
+        mock_server.noop.return_value = (250, b"OK")
+        
+        agent = EmailAgent(mock_config)
+        
+        assert agent.send_workflow_completion_notification(
+            "contact_creation",
+            {"email": "new@example.com"},
+            recipients=["a@example.com", "b@example.com", "test@example.com"]
+        ) is True
+        
+        mock_server.sendmail.assert_called_once()
+        _, to_addrs, raw_message = mock_server.sendmail.call_args[0]
+        assert to_addrs == ("test@example.com", "a@example.com", "b@example.com")
+        assert b"Bcc" not in raw_message
+    
+    @patch('agents.email_agent.smtplib.SMTP')
+    def test_notification_reports_smtp_failure(self, mock_smtp, mock_config):
+        """Test that notifications are sent inline by default, so failures are reported"""
+        mock_server = mock_smtp.return_value
+        mock_server.noop.return_value = (250, b"OK")
+        mock_server.sendmail.side_effect = smtplib.SMTPException("rejected")
+        
+        agent = EmailAgent(mock_config)
+        
+        assert agent.background_send is False
+        assert agent.send_contact_created_notification("new@example.com", "John Doe") is False
+    
+    @patch('agents.email_agent.smtplib.SMTP')
+    def test_notification_sent_in_background(self, mock_smtp, mock_config):
+        """Test that notifications are queued and delivered by a worker when enabled"""
+        mock_server = mock_smtp.return_value
+        mock_server.noop.return_value = (250, b"OK")
+        
+        mock_config.config["email"]["background_send"] = True
+        agent = EmailAgent(mock_config)
+        assert agent.background_send is True
+        
+        assert agent.send_contact_created_notification("new@example.com", "John Doe") is True
+        
+        # close() waits for pending background sends
+        agent.close()
+        mock_server.sendmail.assert_called_once()
+    
+    @patch('agents.email_agent.aiosmtplib.SMTP')
+    def test_send_many_async(self, mock_aio_smtp, mock_config):
+        """Test concurrent async sends over one shared connection"""
+        mock_server = mock_aio_smtp.return_value
+        mock_server.connect = AsyncMock()
+        mock_server.sendmail = AsyncMock()
+        mock_server.quit = AsyncMock()
+        mock_server.is_connected = True
+        
+        agent = EmailAgent(mock_config)
+        messages = [
+            EmailMessage(to=f"user{i}@example.com", subject="Test Subject", body="Test body")
+            for i in range(3)
+        ]
+        
+        async def run():
+            results = await agent.send_many(messages)
+            await agent.aclose()
+            return results
+        
+        results = asyncio.run(run())
+        
+        assert results == [True, True, True]
+        mock_aio_smtp.assert_called_once()
+        mock_server.connect.assert_awaited_once()
+        assert mock_server.sendmail.await_count == 3
+        mock_server.quit.assert_awaited_once()
+    
+    @patch('agents.email_agent.aiosmtplib.SMTP')
+    def test_send_email_async_across_event_loops(self, mock_aio_smtp, mock_config):
+        """Test that each asyncio.run() gets its own connection, and errors drop it"""
+        mock_server = mock_aio_smtp.return_value
+        mock_server.connect = AsyncMock()
+        mock_server.sendmail = AsyncMock(side_effect=[RuntimeError("Event loop is closed"), None, None, None])
+        mock_server.close = Mock()
+        mock_server.is_connected = True
+        
+        agent = EmailAgent(mock_config)
+        agent.dedup_window = 0
+        message = EmailMessage(to="user@example.com", subject="Test Subject", body="Test body")
+        
+        # The first send fails, so the second must reconnect rather than reuse it
+        assert asyncio.run(agent.send_email_async(message)) is False
+        mock_server.close.assert_called_once()
+        assert asyncio.run(agent.send_email_async(message)) is True
+        
+        async def send_twice():
+            return [await agent.send_email_async(message), await agent.send_email_async(message)]
+        
+        # A new loop opens a new connection, which is then reused within that loop
+        assert asyncio.run(send_twice()) == [True, True]
+        assert mock_aio_smtp.call_count == 3
     
     @patch('agents.email_agent.smtplib.SMTP')
     def test_send_email_failure(self, mock_smtp, mock_config):
@@ -355,5 +871,134 @@ class TestEmailAgent:
         assert result is False
 
 
+class TestSMTPConnectionPool:
+    """Test cases for SMTPConnectionPool"""
+    
+    @patch('agents.smtp_pool.smtplib.SMTP')
+    def test_connections_are_opened_lazily(self, mock_smtp):
+        """Test that no connection is opened until one is acquired"""
+        pool = SMTPConnectionPool("smtp.example.com", 587, "user", "pass", size=3)
+        
+        mock_smtp.assert_not_called()
+        
+        with pool.acquire() as server:
+            server.send_message("msg")
+        
+        mock_smtp.assert_called_once_with("smtp.example.com", 587)
+        server.login.assert_called_once_with("user", "pass")
+    
+    @patch('agents.smtp_pool.smtplib.SMTP')
+    def test_connection_recycled_after_message_cap(self, mock_smtp):
+        """Test that a connection is replaced once it reaches the message cap"""
+        mock_smtp.return_value.noop.return_value = (250, b"OK")
+        pool = SMTPConnectionPool("smtp.example.com", 587, "user", "pass",
+                                  size=1, max_messages_per_connection=2)
+        
+        for _ in range(3):
+            with pool.acquire() as server:
+                server.send_message("msg")
+        
+        assert mock_smtp.call_count == 2
+        mock_smtp.return_value.quit.assert_called_once()
+    
+    @patch('agents.smtp_pool.smtplib.SMTP')
+    def test_connection_discarded_on_error(self, mock_smtp):
+        """Test that a connection is not reused after a failed send"""
+        mock_smtp.return_value.noop.return_value = (250, b"OK")
+        pool = SMTPConnectionPool("smtp.example.com", 587, "user", "pass", size=1)
+        
+        with pytest.raises(smtplib.SMTPServerDisconnected):
+            with pool.acquire() as server:
+                raise smtplib.SMTPServerDisconnected("gone")
+        
+        with pool.acquire() as server:
+            server.send_message("msg")
+        
+        assert mock_smtp.call_count == 2
+
+
+class TestPreviewAgent:
+    """Test cases for PreviewAgent"""
+    
+    def test_confirmation_reprompts_until_valid(self):
+        """Test that confirmation reads through the injected input function"""
+        answers = iter(["maybe", "y"])
+        agent = PreviewAgent(input_func=lambda prompt: next(answers))
+        
+        assert asyncio.run(agent.aget_user_confirmation()) is True
+    
+    def test_edit_preview_returns_edited_copy(self):
+        """Test that editing leaves the original preview untouched"""
+        answers = iter(["new@example.com", "", "", "", ""])
+        agent = PreviewAgent(input_func=lambda prompt: next(answers))
+        preview = agent.create_contact_preview({"email": "old@example.com", "first_name": "John"}, "input")
+        
+        edited = agent.edit_preview(preview)
+        
+        assert edited.email == "new@example.com"
+        assert edited.first_name == "John"
+        assert preview.email == "old@example.com"
+        assert not hasattr(edited, "__dict__")
+    
+    def test_name_helpers(self):
+        """Test full name and fallback deal name construction"""
+        entities = {"first_name": "John", "company": "Acme"}
+        
+        assert full_name(entities) == "John"
+        assert full_name({"first_name": "John", "last_name": "Doe"}) == "John Doe"
+        assert default_deal_name(entities) == "Deal with John from Acme"
+    
+    @pytest.mark.parametrize("text,expected", [
+        ("$1,234.56", 1234.56),
+        ("5000", 5000.0),
+        ("1.2k", 1200.0),
+        ("USD 500", 500.0),
+        ("2M", 2_000_000.0),
+        ("not a number", None),
+        (None, None),
+    ])
+    def test_parse_amount(self, text, expected):
+        """Test money parsing across the formats users and Gemini produce"""
+        assert parse_amount(text) == expected
+    
+    def test_display_deal_preview(self, capsys):
+        """Test the formatted deal preview"""
+        agent = PreviewAgent()
+        preview = agent.create_deal_preview({"deal_name": "Test Deal", "amount": "5000"}, "input")
+        
+        agent.display_preview(preview)
+        
+        output = capsys.readouterr().out
+        assert "DEAL TO BE CREATED:" in output
+        assert "Deal Name:      Test Deal\n" in output
+        assert "Amount:         $5,000.00\n" in output
+        assert output.endswith("=" * 60 + "\n")
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket"""
+    
+    @patch('agents.rate_limiter.time.sleep')
+    def test_burst_within_capacity_does_not_wait(self, mock_sleep):
+        """Test that calls within the bucket's capacity proceed immediately"""
+        bucket = TokenBucket(rate=3, period=60.0)
+        
+        for _ in range(3):
+            bucket.acquire()
+        
+        mock_sleep.assert_not_called()
+    
+    @patch('agents.rate_limiter.time.sleep')
+    def test_waits_for_refill_when_empty(self, mock_sleep):
+        """Test that an empty bucket waits roughly one refill interval"""
+        bucket = TokenBucket(rate=2, period=60.0)
+        
+        bucket.acquire(2)
+        bucket.acquire()
+        
+        mock_sleep.assert_called_once()
+        assert mock_sleep.call_args[0][0] == pytest.approx(30.0, abs=0.5)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -3,86 +3,92 @@ Comprehensive tests for the AI Agent Orchestrator
 Tests the complete workflow functionality
 """
 
+import copy
 import pytest
 import json
-import tempfile
-import os
-from unittest.mock import Mock, patch, MagicMock
-from config.config_manager import ConfigManager
-from agents.orchestrator import AIAgentOrchestrator, WorkflowState
+import asyncio
+from unittest.mock import DEFAULT, AsyncMock, Mock, patch, MagicMock
+from google.api_core.exceptions import ServiceUnavailable
+from agents import orchestrator as orchestrator_module
+from agents.orchestrator import (
+    AIAgentOrchestrator, WorkflowState, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE
+)
 from agents.hubspot_agent import Contact, Deal
-from agents.email_agent import EmailMessage
+from agents.preview_agent import PreviewItem
 
 
-@pytest.fixture
-def mock_config():
-    """Create a mock configuration for testing"""
-    config_data = {
-        "openai": {
-            "api_key": "test-openai-key",
-            "model": "gpt-4",
-            "temperature": 0.7,
-            "max_tokens": 1000
-        },
-        "hubspot": {
-            "api_key": "test-hubspot-key",
-            "base_url": "https://api.hubapi.com"
-        },
-        "email": {
-            "smtp_server": "smtp.gmail.com",
-            "smtp_port": 587,
-            "username": "test@example.com",
-            "password": "test-password"
-        },
-        "logging": {
-            "level": "INFO",
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        }
-    }
-    
-    # Create temporary config file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        json.dump(config_data, f)
-        config_path = f.name
+# Canned Gemini responses; the contact one is the default unless a test overrides it
+CONTACT_ENTITIES = {"email": "test@example.com", "first_name": "John", "last_name": "Doe", "company": "TestCorp"}
+DEAL_ENTITIES = {"deal_name": "Test Deal", "amount": "5000", "contact_email": "john@example.com"}
+LLM_CREATE_CONTACT_TEXT = json.dumps({"intent": "create_contact", "entities": CONTACT_ENTITIES})
+LLM_CREATE_DEAL_TEXT = json.dumps({"intent": "create_deal", "entities": DEAL_ENTITIES})
+LLM_UNKNOWN_TEXT = json.dumps({"intent": "unknown", "entities": {}})
+DEFAULT_LLM_TEXT = LLM_CREATE_CONTACT_TEXT
+
+
+@pytest.fixture(scope="module")
+def mock_orchestrator(_session_config):
+    """Create a mock orchestrator shared by the tests in this module"""
+    # Setup mock LLM
+    mock_llm_instance = Mock()
+    mock_llm_instance.generate_content.return_value.text = DEFAULT_LLM_TEXT
+    mock_genai = MagicMock()
+    mock_genai.GenerativeModel.return_value = mock_llm_instance
     
-    config_manager = ConfigManager(config_path)
+    # Setup mock HubSpot agent
+    mock_hubspot_instance = Mock()
+    mock_hubspot_instance.create_contact.return_value = {"id": "contact123", "properties": {"email": "test@example.com"}}
+    mock_hubspot_instance.create_deal.return_value = {"id": "deal123", "properties": {"dealname": "Test Deal"}}
     
-    yield config_manager
+    # Setup mock Email agent
+    mock_email_instance = Mock()
+    mock_email_instance.send_contact_created_notification.return_value = True
+    mock_email_instance.send_deal_created_notification.return_value = True
     
-    # Cleanup
-    os.unlink(config_path)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(orchestrator_module, "genai", mock_genai)
+        mp.setattr(orchestrator_module, "HubSpotAgent", Mock(return_value=mock_hubspot_instance))
+        mp.setattr(orchestrator_module, "EmailAgent", Mock(return_value=mock_email_instance))
+        
+        orchestrator = AIAgentOrchestrator(copy.deepcopy(_session_config))
+        
+        yield orchestrator, mock_llm_instance, mock_hubspot_instance, mock_email_instance
 
 
 @pytest.fixture
-def mock_orchestrator(mock_config):
-    """Create a mock orchestrator for testing"""
-    with patch('agents.orchestrator.ChatOpenAI') as mock_llm, \
-         patch('agents.orchestrator.HubSpotAgent') as mock_hubspot, \
-         patch('agents.orchestrator.EmailAgent') as mock_email:
-        
-        # Setup mock LLM
-        mock_llm_instance = Mock()
-        mock_llm_instance.invoke.return_value.content = """
-        INTENT: create_contact
-        ENTITIES: email:test@example.com, first_name:John, last_name:Doe, company:TestCorp
-        """
-        mock_llm.return_value = mock_llm_instance
-        
-        # Setup mock HubSpot agent
-        mock_hubspot_instance = Mock()
-        mock_hubspot_instance.create_contact.return_value = {"id": "contact123", "properties": {"email": "test@example.com"}}
-        mock_hubspot_instance.create_deal.return_value = {"id": "deal123", "properties": {"dealname": "Test Deal"}}
-        mock_hubspot.return_value = mock_hubspot_instance
-        
-        # Setup mock Email agent
-        mock_email_instance = Mock()
-        mock_email_instance.send_contact_created_notification.return_value = True
-        mock_email_instance.send_deal_created_notification.return_value = True
-        mock_email.return_value = mock_email_instance
-        
-        orchestrator = AIAgentOrchestrator(mock_config)
-        
-        yield orchestrator, mock_llm_instance, mock_hubspot_instance, mock_email_instance
+def make_state():
+    """Build a WorkflowState with empty defaults for any fields not given"""
+    def _make(**overrides):
+        state = WorkflowState(
+            user_input="",
+            intent=None,
+            entities={},
+            contact_data=None,
+            deal_data=None,
+            hubspot_result=None,
+            email_result=None,
+            error=None,
+            workflow_completed=False
+        )
+        state.update(overrides)
+        return state
+    return _make
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_orchestrator(request):
+    """Restore the shared orchestrator's mocks, parse cache and Gemini quota after each test"""
+    yield
+    if "mock_orchestrator" not in request.fixturenames:
+        return
+    orchestrator, mock_llm, mock_hubspot, mock_email = request.getfixturevalue("mock_orchestrator")
+    for mock in (mock_llm, mock_hubspot, mock_email):
+        mock.reset_mock(side_effect=True)
+    mock_llm.generate_content.return_value.text = DEFAULT_LLM_TEXT
+    orchestrator._parse_cache.clear()
+    # Full buckets, so earlier tests' calls never make a later one wait for quota
+    orchestrator._request_bucket = orchestrator._make_bucket("gemini.requests_per_minute", LLM_REQUESTS_PER_MINUTE)
+    orchestrator._token_bucket = orchestrator._make_bucket("gemini.tokens_per_minute", LLM_TOKENS_PER_MINUTE)
 
 
 class TestAIAgentOrchestrator:
@@ -90,123 +96,142 @@ class TestAIAgentOrchestrator:
     
     def test_orchestrator_initialization(self, mock_config):
         """Test orchestrator initialization"""
-        with patch('agents.orchestrator.ChatOpenAI'), \
-             patch('agents.orchestrator.HubSpotAgent'), \
-             patch('agents.orchestrator.EmailAgent'):
-            
+        with patch.multiple(orchestrator_module, genai=DEFAULT, HubSpotAgent=DEFAULT, EmailAgent=DEFAULT):
             orchestrator = AIAgentOrchestrator(mock_config)
             assert orchestrator is not None
             assert orchestrator.config_manager == mock_config
     
-    def test_parse_input_create_contact(self, mock_orchestrator):
-        """Test parsing input for contact creation"""
+    @pytest.mark.parametrize("user_input,llm_text,intent,entities", [
+        ("Create a contact John Doe, john@example.com, at TestCorp",
+         LLM_CREATE_CONTACT_TEXT, "create_contact", CONTACT_ENTITIES),
+        ("Create a deal for $5000 with John from TestCorp",
+         LLM_CREATE_DEAL_TEXT, "create_deal", DEAL_ENTITIES),
+    ], ids=["create_contact", "create_deal"])
+    def test_parse_input(self, mock_orchestrator, make_state, user_input, llm_text, intent, entities):
+        """Test parsing input into an intent and its entities"""
         orchestrator, mock_llm, _, _ = mock_orchestrator
+        mock_llm.generate_content.return_value.text = llm_text
         
-        state = WorkflowState(
-            user_input="Create a contact John Doe, john@example.com, at TestCorp",
-            intent=None,
-            entities={},
-            contact_data=None,
-            deal_data=None,
-            hubspot_result=None,
-            email_result=None,
-            error=None,
-            workflow_completed=False
-        )
+        result_state = orchestrator._parse_input(make_state(user_input=user_input))
+        
+        assert result_state["intent"] == intent
+        for name, value in entities.items():
+            assert result_state["entities"][name] == value
+    
+    def test_parse_input_cached_for_repeated_input(self, mock_orchestrator):
+        """Test that a repeated request is parsed without calling Gemini again"""
+        orchestrator, mock_llm, _, _ = mock_orchestrator
+        
+        first = orchestrator._parse_input(WorkflowState(user_input="Create a contact John Doe, test@example.com"))
+        first["entities"]["email"] = "changed@example.com"
+        second = orchestrator._parse_input(WorkflowState(user_input="  Create a contact  John Doe, test@example.com "))
+        
+        mock_llm.generate_content.assert_called_once()
+        assert second["intent"] == "create_contact"
+        assert second["entities"]["email"] == "test@example.com"
+    
+    @patch('time.sleep')
+    def test_parse_input_retries_transient_llm_errors(self, mock_sleep, mock_orchestrator):
+        """Test that a 503 from Gemini is retried after a backoff"""
+        orchestrator, mock_llm, _, _ = mock_orchestrator
+        ok_response = mock_llm.generate_content.return_value
+        mock_llm.generate_content.side_effect = [ServiceUnavailable("overloaded"), ok_response]
         
-        result_state = orchestrator._parse_input(state)
+        result_state = orchestrator._parse_input(WorkflowState(user_input="Add John Doe from TestCorp"))
         
         assert result_state["intent"] == "create_contact"
-        assert result_state["entities"]["email"] == "test@example.com"
-        assert result_state["entities"]["first_name"] == "John"
-        assert result_state["entities"]["last_name"] == "Doe"
-        assert result_state["entities"]["company"] == "TestCorp"
+        assert mock_llm.generate_content.call_count == 2
+        mock_sleep.assert_called_once()
     
-    def test_parse_input_create_deal(self, mock_orchestrator):
-        """Test parsing input for deal creation"""
+    def test_parse_input_unknown_intent_not_cached(self, mock_orchestrator):
+        """Test that unknown intents are re-parsed on the next request"""
         orchestrator, mock_llm, _, _ = mock_orchestrator
+        mock_llm.generate_content.return_value.text = LLM_UNKNOWN_TEXT
         
-        # Mock LLM response for deal creation
-        mock_llm.invoke.return_value.content = """
-        INTENT: create_deal
-        ENTITIES: deal_name:Test Deal, amount:5000, contact_email:john@example.com
-        """
+        orchestrator._parse_input(WorkflowState(user_input="hello"))
+        orchestrator._parse_input(WorkflowState(user_input="hello"))
         
-        state = WorkflowState(
-            user_input="Create a deal for $5000 with John from TestCorp",
-            intent=None,
-            entities={},
-            contact_data=None,
-            deal_data=None,
-            hubspot_result=None,
-            email_result=None,
-            error=None,
-            workflow_completed=False
-        )
+        assert mock_llm.generate_content.call_count == 2
+    
+    def test_parse_input_structured_command_skips_llm(self, mock_orchestrator):
+        """Test that key=value commands are parsed without calling Gemini"""
+        orchestrator, mock_llm, _, _ = mock_orchestrator
         
-        result_state = orchestrator._parse_input(state)
+        result_state = orchestrator._parse_input(WorkflowState(
+            user_input="Create a deal deal_name=Acme Renewal, amount=$5,000, contact_email=jane@acme.com"
+        ))
         
+        mock_llm.generate_content.assert_not_called()
         assert result_state["intent"] == "create_deal"
-        assert result_state["entities"]["deal_name"] == "Test Deal"
-        assert result_state["entities"]["amount"] == "5000"
-        assert result_state["entities"]["contact_email"] == "john@example.com"
+        assert result_state["entities"] == {
+            "deal_name": "Acme Renewal",
+            "amount": "5000",
+            "contact_email": "jane@acme.com"
+        }
     
-    def test_route_workflow(self, mock_orchestrator):
+    @pytest.mark.parametrize("user_input", [
+        "Create a contact John Doe, john@example.com, at TestCorp",
+        "create contact first_name=John",
+        "create contact email=not-an-email",
+        "create contact email=john@example.com, favourite_colour=blue",
+    ])
+    def test_fast_parse_falls_back_to_llm(self, user_input):
+        """Test that free text and incomplete commands are left to Gemini"""
+        assert AIAgentOrchestrator._fast_parse(user_input) is None
+    
+    def test_route_workflow(self, mock_orchestrator, make_state):
         """Test workflow routing"""
         orchestrator, _, _, _ = mock_orchestrator
         
-        # Test contact creation route
-        state = WorkflowState(
-            user_input="",
-            intent="create_contact",
-            entities={},
-            contact_data=None,
-            deal_data=None,
-            hubspot_result=None,
-            email_result=None,
-            error=None,
-            workflow_completed=False
-        )
+        # Both create intents go through the preview first
+        state = make_state(intent="create_contact")
         
         route = orchestrator._route_workflow(state)
-        assert route == "create_contact"
+        assert route == "create_preview"
         
-        # Test deal creation route
         state["intent"] = "create_deal"
         route = orchestrator._route_workflow(state)
-        assert route == "create_deal"
+        assert route == "create_preview"
         
         # Test error route
         state["intent"] = "unknown"
         route = orchestrator._route_workflow(state)
         assert route == "error"
     
-    def test_create_contact(self, mock_orchestrator):
+    @pytest.mark.parametrize("intent,confirmed,expected", [
+        ("create_contact", True, "create_contact"),
+        ("create_deal", True, "create_deal"),
+        ("unknown", True, "handle_error"),
+        ("create_contact", False, "handle_error"),
+    ])
+    def test_route_after_preview(self, mock_orchestrator, intent, confirmed, expected):
+        """Test routing after the preview is confirmed or declined"""
+        orchestrator, _, _, _ = mock_orchestrator
+        
+        state = WorkflowState(intent=intent, user_confirmed=confirmed)
+        
+        assert orchestrator._route_after_preview(state) == expected
+    
+    def test_create_contact(self, mock_orchestrator, make_state):
         """Test contact creation workflow"""
         orchestrator, _, mock_hubspot, _ = mock_orchestrator
         
-        state = WorkflowState(
-            user_input="",
+        state = make_state(
             intent="create_contact",
-            entities={
-                "email": "test@example.com",
-                "first_name": "John",
-                "last_name": "Doe",
-                "company": "TestCorp"
-            },
-            contact_data=None,
-            deal_data=None,
-            hubspot_result=None,
-            email_result=None,
-            error=None,
-            workflow_completed=False
+            preview_item=PreviewItem(
+                type="contact",
+                original_input="",
+                email="test@example.com",
+                first_name="John",
+                last_name="Doe",
+                company="TestCorp"
+            )
         )
         
-        result_state = orchestrator._create_contact(state)
+        update = orchestrator._create_contact(state)
         
-        assert result_state["contact_data"] is not None
-        assert result_state["hubspot_result"] is not None
-        assert result_state["error"] is None
+        created = mock_hubspot.create_contact.return_value
+        assert update == {"contact_data": created, "hubspot_result": created}
         
         # Verify HubSpot agent was called correctly
         mock_hubspot.create_contact.assert_called_once()
@@ -217,55 +242,36 @@ class TestAIAgentOrchestrator:
         assert call_args.last_name == "Doe"
         assert call_args.company == "TestCorp"
     
-    def test_create_contact_missing_email(self, mock_orchestrator):
-        """Test contact creation with missing email"""
-        orchestrator, _, _, _ = mock_orchestrator
+    def test_create_contact_without_preview(self, mock_orchestrator, make_state):
+        """Test contact creation when no preview was built"""
+        orchestrator, _, mock_hubspot, _ = mock_orchestrator
         
-        state = WorkflowState(
-            user_input="",
-            intent="create_contact",
-            entities={
-                "first_name": "John",
-                "last_name": "Doe"
-            },
-            contact_data=None,
-            deal_data=None,
-            hubspot_result=None,
-            email_result=None,
-            error=None,
-            workflow_completed=False
-        )
+        state = make_state(intent="create_contact", entities={"first_name": "John", "last_name": "Doe"})
         
-        result_state = orchestrator._create_contact(state)
+        update = orchestrator._create_contact(state)
         
-        assert result_state["error"] == "Email is required to create a contact"
-        assert result_state["contact_data"] is None
+        assert update == {"error": "No preview item found for contact creation"}
+        mock_hubspot.create_contact.assert_not_called()
     
-    def test_create_deal(self, mock_orchestrator):
+    def test_create_deal(self, mock_orchestrator, make_state):
         """Test deal creation workflow"""
         orchestrator, _, mock_hubspot, _ = mock_orchestrator
         
-        state = WorkflowState(
-            user_input="",
+        state = make_state(
             intent="create_deal",
-            entities={
-                "deal_name": "Test Deal",
-                "amount": "5000",
-                "contact_email": "john@example.com"
-            },
-            contact_data=None,
-            deal_data=None,
-            hubspot_result=None,
-            email_result=None,
-            error=None,
-            workflow_completed=False
+            preview_item=PreviewItem(
+                type="deal",
+                original_input="",
+                deal_name="Test Deal",
+                amount=5000.0,
+                contact_email="john@example.com"
+            )
         )
         
-        result_state = orchestrator._create_deal(state)
+        update = orchestrator._create_deal(state)
         
-        assert result_state["deal_data"] is not None
-        assert result_state["hubspot_result"] is not None
-        assert result_state["error"] is None
+        created = mock_hubspot.create_deal.return_value
+        assert update == {"deal_data": created, "hubspot_result": created}
         
         # Verify HubSpot agent was called correctly
         mock_hubspot.create_deal.assert_called_once()
@@ -275,35 +281,22 @@ class TestAIAgentOrchestrator:
         assert call_args.amount == 5000.0
         assert call_args.contact_email == "john@example.com"
     
-    def test_create_deal_missing_name(self, mock_orchestrator):
-        """Test deal creation with missing name"""
-        orchestrator, _, _, _ = mock_orchestrator
+    def test_create_deal_without_preview(self, mock_orchestrator, make_state):
+        """Test deal creation when no preview was built"""
+        orchestrator, _, mock_hubspot, _ = mock_orchestrator
         
-        state = WorkflowState(
-            user_input="",
-            intent="create_deal",
-            entities={
-                "amount": "5000"
-            },
-            contact_data=None,
-            deal_data=None,
-            hubspot_result=None,
-            email_result=None,
-            error=None,
-            workflow_completed=False
-        )
+        state = make_state(intent="create_deal", entities={"amount": "5000"})
         
-        result_state = orchestrator._create_deal(state)
+        update = orchestrator._create_deal(state)
         
-        assert result_state["error"] == "Deal name is required"
-        assert result_state["deal_data"] is None
+        assert update == {"error": "No preview item found for deal creation"}
+        mock_hubspot.create_deal.assert_not_called()
     
-    def test_send_notification_contact(self, mock_orchestrator):
+    def test_send_notification_contact(self, mock_orchestrator, make_state):
         """Test sending notification for contact creation"""
         orchestrator, _, _, mock_email = mock_orchestrator
         
-        state = WorkflowState(
-            user_input="",
+        state = make_state(
             intent="create_contact",
             entities={
                 "email": "test@example.com",
@@ -311,11 +304,7 @@ class TestAIAgentOrchestrator:
                 "last_name": "Doe"
             },
             contact_data={"id": "contact123"},
-            deal_data=None,
-            hubspot_result={"id": "contact123"},
-            email_result=None,
-            error=None,
-            workflow_completed=False
+            hubspot_result={"id": "contact123"}
         )
         
         result_state = orchestrator._send_notification(state)
@@ -328,24 +317,19 @@ class TestAIAgentOrchestrator:
             "test@example.com", "John Doe"
         )
     
-    def test_send_notification_deal(self, mock_orchestrator):
+    def test_send_notification_deal(self, mock_orchestrator, make_state):
         """Test sending notification for deal creation"""
         orchestrator, _, _, mock_email = mock_orchestrator
         
-        state = WorkflowState(
-            user_input="",
+        state = make_state(
             intent="create_deal",
             entities={
                 "deal_name": "Test Deal",
                 "amount": "5000",
                 "contact_email": "john@example.com"
             },
-            contact_data=None,
             deal_data={"id": "deal123"},
-            hubspot_result={"id": "deal123"},
-            email_result=None,
-            error=None,
-            workflow_completed=False
+            hubspot_result={"id": "deal123"}
         )
         
         result_state = orchestrator._send_notification(state)
@@ -358,21 +342,11 @@ class TestAIAgentOrchestrator:
             "Test Deal", 5000.0, "john@example.com"
         )
     
-    def test_handle_error(self, mock_orchestrator):
+    def test_handle_error(self, mock_orchestrator, make_state):
         """Test error handling"""
         orchestrator, _, _, mock_email = mock_orchestrator
         
-        state = WorkflowState(
-            user_input="test input",
-            intent="unknown",
-            entities={},
-            contact_data=None,
-            deal_data=None,
-            hubspot_result=None,
-            email_result=None,
-            error="Test error",
-            workflow_completed=False
-        )
+        state = make_state(user_input="test input", intent="unknown", error="Test error")
         
         result_state = orchestrator._handle_error(state)
         
@@ -383,9 +357,11 @@ class TestAIAgentOrchestrator:
             "Test error", "User input: test input"
         )
     
-    def test_process_request_success(self, mock_orchestrator):
+    def test_process_request_success(self, mock_orchestrator, monkeypatch):
         """Test successful request processing"""
         orchestrator, _, _, _ = mock_orchestrator
+        monkeypatch.setattr(orchestrator.preview_agent, "display_preview", Mock())
+        monkeypatch.setattr(orchestrator.preview_agent, "get_user_confirmation", Mock(return_value=True))
         
         result = orchestrator.process_request("Create a contact John Doe, john@example.com, at TestCorp")
         
@@ -394,18 +370,72 @@ class TestAIAgentOrchestrator:
         assert result.data is not None
         assert result.error is None
     
-    def test_process_request_failure(self, mock_orchestrator):
+    def test_process_request_failure(self, mock_orchestrator, monkeypatch):
         """Test failed request processing"""
-        orchestrator, mock_llm, _, _ = mock_orchestrator
+        orchestrator, mock_llm, _, mock_email = mock_orchestrator
+        monkeypatch.setattr(orchestrator.preview_agent, "display_preview", Mock())
+        monkeypatch.setattr(orchestrator.preview_agent, "get_user_confirmation", Mock(return_value=True))
         
         # Mock LLM to raise an exception
-        mock_llm.invoke.side_effect = Exception("LLM error")
+        mock_llm.generate_content.side_effect = Exception("LLM error")
         
         result = orchestrator.process_request("Create a contact John Doe, john@example.com, at TestCorp")
         
         assert result.success is False
-        assert "Workflow execution failed" in result.message
-        assert result.error is not None
+        assert result.message.startswith("Workflow failed")
+        assert "LLM error" in result.error
+        orchestrator.preview_agent.display_preview.assert_not_called()
+        mock_email.send_error_notification.assert_called_once()
+    
+    def test_aprocess_request_awaits_llm_and_hubspot(self, mock_orchestrator, monkeypatch):
+        """Test the async workflow path end to end"""
+        orchestrator, mock_llm, mock_hubspot, mock_email = mock_orchestrator
+        mock_llm.generate_content_async = AsyncMock(return_value=mock_llm.generate_content.return_value)
+        mock_hubspot.acreate_contact = AsyncMock(return_value={"id": "contact123"})
+        mock_email.asend_contact_created_notification = AsyncMock(return_value=True)
+        monkeypatch.setattr(orchestrator.preview_agent, "display_preview", Mock())
+        monkeypatch.setattr(orchestrator.preview_agent, "get_user_confirmation", Mock(return_value=True))
+        
+        result = asyncio.run(orchestrator.aprocess_request("Create a contact John Doe, test@example.com"))
+        
+        assert result.success is True
+        assert result.data["hubspot_result"] == {"id": "contact123"}
+        mock_llm.generate_content_async.assert_awaited_once()
+        mock_llm.generate_content.assert_not_called()
+        mock_hubspot.create_contact.assert_not_called()
+        mock_email.asend_contact_created_notification.assert_awaited_once_with("test@example.com", "John Doe")
+        assert result.data["email_sent"] is True
+    
+    def test_acall_llm_across_event_loops(self, mock_orchestrator):
+        """Test that the Gemini concurrency cap works in each new asyncio.run()"""
+        orchestrator, mock_llm, _, _ = mock_orchestrator
+        prompts = [str(i) for i in range(orchestrator._llm_max_concurrency + 1)]
+        
+        async def generate(prompt):
+            await asyncio.sleep(0)
+            return prompt
+        
+        mock_llm.generate_content_async = AsyncMock(side_effect=generate)
+        
+        async def call_all():
+            # One call more than the cap, so the last one waits on the semaphore
+            return await asyncio.gather(*(orchestrator._acall_llm(prompt) for prompt in prompts))
+        
+        assert asyncio.run(call_all()) == prompts
+        assert asyncio.run(call_all()) == prompts
+    
+    def test_process_requests_batch_parses_each_input_once(self, mock_orchestrator, monkeypatch):
+        """Test that batched requests are parsed up front and keep their order"""
+        orchestrator, mock_llm, mock_hubspot, _ = mock_orchestrator
+        monkeypatch.setattr(orchestrator.preview_agent, "display_preview", Mock())
+        monkeypatch.setattr(orchestrator.preview_agent, "get_user_confirmation", Mock(return_value=True))
+        
+        inputs = ["Create a contact John Doe, test@example.com"] * 3
+        results = orchestrator.process_requests_batch(inputs)
+        
+        assert [result.success for result in results] == [True, True, True]
+        mock_llm.generate_content.assert_called_once()
+        assert mock_hubspot.create_contact.call_count == 3
     
     def test_get_available_actions(self, mock_orchestrator):
         """Test getting available actions"""
@@ -417,6 +447,19 @@ class TestAIAgentOrchestrator:
         assert len(actions) > 0
         assert "Create a new contact" in actions[0]
         assert "Create a new deal" in actions[1]
+    
+    def test_clients_created_on_first_use(self, mock_config):
+        """Test that listing actions doesn't set up any clients"""
+        with patch.multiple(orchestrator_module, genai=DEFAULT, HubSpotAgent=DEFAULT, EmailAgent=DEFAULT) as mocks:
+            orchestrator = AIAgentOrchestrator(mock_config)
+            orchestrator.get_available_actions()
+            
+            mocks['genai'].GenerativeModel.assert_not_called()
+            mocks['HubSpotAgent'].assert_not_called()
+            mocks['EmailAgent'].assert_not_called()
+            
+            assert orchestrator.hubspot_agent is orchestrator.hubspot_agent
+            mocks['HubSpotAgent'].assert_called_once_with(mock_config)
 
 
 class TestWorkflowState: